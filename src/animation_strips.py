@@ -0,0 +1,135 @@
+"""
+Запечені стрічки кадрів для періодичних анімацій
+
+Періодичний ефект (пульсація, веселка, коливання) рендериться один раз
+на кожну фазу, а під час гри кадр обирається за поточним часом - малювання
+зводиться до одного blit. Пам'ять усіх стрічок обмежена, тож при її
+вичерпанні найдавніше використані стрічки відкидаються.
+"""
+import math
+from collections import OrderedDict
+from display_format import convert_surface, register_source
+from game_config import ANIMATION_STRIP_FPS, ANIMATION_STRIP_MAX_FRAMES, ANIMATION_STRIP_MEMORY_MB
+
+
+def surface_bytes(surface):
+    """Розмір пікселів поверхні в байтах"""
+    return surface.get_height() * surface.get_pitch()
+
+
+class AnimationStrip:
+    """Кадри однієї періодичної анімації, рівномірно розкладені по періоду"""
+    
+    def __init__(self, frames, period):
+        """
+        Ініціалізація стрічки
+        
+        Args:
+            frames: Список поверхонь (однакові кадри можуть бути одним об'єктом)
+            period: Період анімації в секундах
+        """
+        self.frames = frames
+        self.period = period
+        self.nbytes = sum(surface_bytes(frame) for frame in {id(f): f for f in frames}.values())
+    
+    def frame_at(self, time):
+        """Повертає кадр для заданого часу"""
+        count = len(self.frames)
+        return self.frames[int(time / self.period * count) % count]
+
+
+class StripCache:
+    """LRU кеш стрічок з обмеженням за пам'яттю"""
+    
+    def __init__(self, max_bytes=ANIMATION_STRIP_MEMORY_MB * 1024 * 1024,
+                 fps=ANIMATION_STRIP_FPS, max_frames=ANIMATION_STRIP_MAX_FRAMES):
+        """
+        Ініціалізація кешу
+        
+        Args:
+            max_bytes: Ліміт пам'яті всіх стрічок
+            fps: Бажана кількість кадрів на секунду періоду
+            max_frames: Максимум кадрів в одній стрічці
+        """
+        self.max_bytes = max_bytes
+        self.fps = fps
+        self.max_frames = max_frames
+        self.nbytes = 0
+        self._strips = OrderedDict()
+    
+    def get(self, key, period, render_frame):
+        """
+        Повертає стрічку (запікає при першому запиті)
+        
+        Кількість кадрів визначається періодом, але зменшується, якщо
+        стрічка не вміщується в ліміт пам'яті.
+        
+        Args:
+            key: Ключ стрічки (усе, від чого залежить вигляд)
+            period: Період анімації в секундах
+            render_frame: Функція phase -> pygame.Surface, phase у [0, 1)
+        
+        Returns:
+            AnimationStrip: Стрічка кадрів
+        """
+        strip = self._strips.get(key)
+        if strip is not None:
+            self._strips.move_to_end(key)
+            return strip
+        
+        first = render_frame(0.0)
+        count = max(1, min(self.max_frames, math.ceil(period * self.fps),
+                           self.max_bytes // max(1, surface_bytes(first))))
+        frames = [first] + [render_frame(i / count) for i in range(1, count)]
+        # Кадри - у формат дисплея (однакові кадри лишаються одним об'єктом)
+        converted = {}
+        for frame in frames:
+            if id(frame) not in converted:
+                converted[id(frame)] = convert_surface(frame)
+        strip = AnimationStrip([converted[id(frame)] for frame in frames], period)
+        
+        self._strips[key] = strip
+        self.nbytes += strip.nbytes
+        while self.nbytes > self.max_bytes and len(self._strips) > 1:
+            _, evicted = self._strips.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+        return strip
+    
+    def iter_surfaces(self):
+        """Пари ((ключ, номер кадру), кадр) усіх стрічок"""
+        for key, strip in list(self._strips.items()):
+            for index, frame in enumerate(strip.frames):
+                yield (key, index), frame
+    
+    def clear(self):
+        """Відкидає всі стрічки"""
+        self._strips.clear()
+        self.nbytes = 0
+    
+    def __len__(self):
+        return len(self._strips)
+
+
+# Спільний кеш для всієї гри
+_strip_cache = StripCache()
+register_source('strips', _strip_cache.iter_surfaces, _strip_cache.clear)
+
+
+def get_strip(key, period, render_frame):
+    """
+    Повертає стрічку зі спільного кешу
+    
+    Args:
+        key: Ключ стрічки
+        period: Період анімації в секундах
+        render_frame: Функція phase -> pygame.Surface
+    
+    Returns:
+        AnimationStrip: Стрічка кадрів
+    """
+    return _strip_cache.get(key, period, render_frame)
+
+
+def get_strip_cache():
+    """Повертає спільний кеш стрічок (для статистики та очищення)"""
+    return _strip_cache
@@ -2,9 +2,16 @@
 Система бонусів для гри Арканоїд
 """
 import pygame
+import math
 import random
 import time
+import itertools
 from enum import Enum
+from text_cache import render_text, get_digit_atlas
+from viewport import IDENTITY
+from animation_strips import get_strip
+from display_format import create_surface, make_static
+from game_config import BONUS_POOL_SIZE
 
 
 class BonusType(Enum):
@@ -21,43 +28,73 @@ BONUS_CONFIG = {
     BonusType.EXPAND_PADDLE: {
         'color': (57, 255, 20),      # Neon Green
         'icon': '▬',
+        'name': 'ШИРША ПЛАТФОРМА',
         'duration': 15.0,
         'weight': 25
     },
     BonusType.SHRINK_PADDLE: {
         'color': (255, 100, 0),      # Neon Orange
         'icon': '▭',
+        'name': 'ВУЖЧА ПЛАТФОРМА',
         'duration': 10.0,
         'weight': 15
     },
     BonusType.EXTRA_LIFE: {
         'color': (255, 20, 147),     # Neon Pink
         'icon': '♥',
+        'name': '+1 ЖИТТЯ',
         'duration': 0,
         'weight': 10
     },
     BonusType.FIRE_BALL: {
         'color': (255, 0, 0),        # Neon Red
         'icon': '🔥',
+        'name': "ВОГНЯНИЙ М'ЯЧ",
         'duration': 10.0,
         'weight': 25
     },
     BonusType.MULTI_BALL: {
         'color': (255, 255, 0),      # Neon Yellow
         'icon': '●●',
+        'name': 'МУЛЬТИБОЛ',
         'duration': 0,
         'weight': 25
     }
 }
 
+# Типи для зваженого вибору та накопичені ваги (рахуються один раз)
+BONUS_TYPES = list(BonusType)
+BONUS_CUM_WEIGHTS = list(itertools.accumulate(BONUS_CONFIG[bt]['weight'] for bt in BONUS_TYPES))
+
+
+# Розмір капсули та параметри її коливання (зсув sin(t * 3) * 2 по горизонталі)
+BONUS_WIDTH = 40
+BONUS_HEIGHT = 20
+WOBBLE_AMPLITUDE = 2
+WOBBLE_FREQUENCY = 3
+
 
 class Bonus:
-    """Падаючий бонус"""
+    """Падаючий бонус (об'єкти повторно використовуються пулом BonusManager)"""
     
     def __init__(self, x, y, bonus_type):
         """
         Ініціалізація бонусу
         
+        Args:
+            x, y: Початкова позиція
+            bonus_type: Тип бонусу (BonusType)
+        """
+        self.width = BONUS_WIDTH
+        self.height = BONUS_HEIGHT
+        self.speed = 3  # Швидкість падіння
+        self.rect = pygame.Rect(0, 0, self.width, self.height)
+        self.reset(x, y, bonus_type)
+    
+    def reset(self, x, y, bonus_type):
+        """
+        Готує бонус до нового падіння (новий або взятий з пулу)
+        
         Args:
             x, y: Початкова позиція
             bonus_type: Тип бонусу (BonusType)
@@ -65,10 +102,7 @@ class Bonus:
         self.x = x
         self.y = y
         self.bonus_type = bonus_type
-        self.width = 40
-        self.height = 20
-        self.speed = 3  # Швидкість падіння
-        self.rect = pygame.Rect(x - self.width // 2, y, self.width, self.height)
+        self.rect.topleft = (x - self.width // 2, y)
         
         # Візуальні параметри
         self.config = BONUS_CONFIG[bonus_type]
@@ -95,40 +129,69 @@ class Bonus:
         # Перевіряємо чи не вийшов за межі
         return self.y < 700  # Трохи нижче екрану для плавності
     
-    def draw(self, surface, current_time):
+    def draw(self, surface, current_time, viewport=IDENTITY):
         """
-        Малює бонус на поверхні
+        Малює бонус на поверхні (кадр запеченої стрічки коливання)
         
         Args:
             surface: Поверхня для малювання
             current_time: Поточний час для анімації
-        """
-        import math
-        
-        # Легке коливання (wobble)
-        wobble = math.sin(current_time * 3 + self.wobble_offset) * 2
-        draw_x = self.rect.x + wobble
-        
-        # Малюємо фон бонусу з градієнтом
-        bonus_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        
-        # Основний колір
-        pygame.draw.rect(bonus_surface, (*self.color, 200), 
-                        bonus_surface.get_rect(), border_radius=5)
-        
-        # Світла обводка
-        lighter_color = tuple(min(255, c + 50) for c in self.color)
-        pygame.draw.rect(bonus_surface, lighter_color, 
-                        bonus_surface.get_rect(), 2, border_radius=5)
-        
-        surface.blit(bonus_surface, (int(draw_x), self.rect.y))
+            viewport: Трансформація логічних координат у пікселі surface
         
-        # Малюємо іконку
-        font = pygame.font.Font(None, 24)
-        icon_text = font.render(self.icon, True, (255, 255, 255))
-        icon_rect = icon_text.get_rect(center=(int(draw_x) + self.width // 2, 
-                                               self.rect.centery))
-        surface.blit(icon_text, icon_rect)
+        Returns:
+            pygame.Rect: Область, яку зайняв бонус
+        """
+        strip, origin = get_capsule_strip(self.bonus_type, viewport)
+        # Фаза зсунута на wobble_offset, щоб бонуси не коливались синхронно
+        frame = strip.frame_at(current_time + self.wobble_offset / WOBBLE_FREQUENCY)
+        x, y = viewport.to_screen_point(self.rect.x, self.rect.y)
+        return surface.blit(frame, (x - origin[0], y - origin[1]))
+
+
+def get_capsule_strip(bonus_type, viewport=IDENTITY):
+    """
+    Повертає стрічку коливання капсули бонусу
+    
+    Капсула рендериться лише для кожного цілого зсуву коливання, а кадри
+    з однаковим зсувом посилаються на ту саму поверхню.
+    
+    Args:
+        bonus_type: Тип бонусу (BonusType)
+        viewport: Трансформація (задає масштаб)
+    
+    Returns:
+        tuple: (AnimationStrip, зміщення лівого верхнього кута капсули в кадрі)
+    """
+    config = BONUS_CONFIG[bonus_type]
+    color = config['color']
+    body = viewport.to_screen_rect((0, 0, BONUS_WIDTH, BONUS_HEIGHT))
+    radius = viewport.scale_length(5)
+    icon = render_text(config['icon'], viewport.scale_length(24), (255, 255, 255))
+    icon_rect = icon.get_rect(center=body.center)
+    
+    # Кадр вміщує капсулу в крайніх положеннях коливання та іконку
+    amplitude = round(WOBBLE_AMPLITUDE * viewport.scale)
+    bounds = body.union(icon_rect).inflate(amplitude * 2, 0)
+    origin = (-bounds.x, -bounds.y)
+    lighter_color = tuple(min(255, c + 50) for c in color)
+    rendered = {}
+    
+    def render_frame(phase):
+        # Як і раніше, зсув округлюється вниз у логічних пікселях
+        shift = round(math.floor(math.sin(phase * 2 * math.pi) * WOBBLE_AMPLITUDE) * viewport.scale)
+        frame = rendered.get(shift)
+        if frame is None:
+            frame = create_surface(bounds.size, alpha=True)
+            capsule = body.move(origin[0] + shift, origin[1])
+            pygame.draw.rect(frame, (*color, 200), capsule, border_radius=radius)
+            pygame.draw.rect(frame, lighter_color, capsule, viewport.scale_length(2), border_radius=radius)
+            frame.blit(icon, icon_rect.move(origin[0] + shift, origin[1]))
+            rendered[shift] = make_static(frame)
+        return frame
+    
+    strip = get_strip(('bonus_capsule', bonus_type, viewport.scale), 2 * math.pi / WOBBLE_FREQUENCY,
+                      render_frame)
+    return strip, origin
 
 
 class ActiveEffect:
@@ -160,49 +223,74 @@ class ActiveEffect:
             return False
         return self.get_remaining_time() <= 0
     
-    def draw_indicator(self, surface, x, y):
+    def draw_indicator(self, surface, x, y, viewport=IDENTITY):
         """
         Малює індикатор ефекту
         
         Args:
             surface: Поверхня для малювання
-            x, y: Позиція індикатора
+            x, y: Позиція індикатора (логічні координати)
+            viewport: Трансформація логічних координат у пікселі surface
+        
+        Returns:
+            pygame.Rect: Область індикатора
         """
         width = 120
         height = 30
+        radius = viewport.scale_length(5)
+        font_size = viewport.scale_length(20)
         
         # Фон індикатора
-        bg_surface = pygame.Surface((width, height), pygame.SRCALPHA)
-        pygame.draw.rect(bg_surface, (40, 40, 80, 200), bg_surface.get_rect(), border_radius=5)
-        pygame.draw.rect(bg_surface, self.config['color'], bg_surface.get_rect(), 2, border_radius=5)
-        surface.blit(bg_surface, (x, y))
+        bg_rect = viewport.to_screen_rect((x, y, width, height))
+        bg_surface = create_surface(bg_rect.size, alpha=True)
+        pygame.draw.rect(bg_surface, (40, 40, 80, 200), bg_surface.get_rect(), border_radius=radius)
+        pygame.draw.rect(bg_surface, self.config['color'], bg_surface.get_rect(),
+                         viewport.scale_length(2), border_radius=radius)
+        surface.blit(bg_surface, bg_rect)
         
         # Іконка
-        font = pygame.font.Font(None, 20)
-        icon = font.render(self.config['icon'], True, self.config['color'])
-        surface.blit(icon, (x + 5, y + 5))
+        icon = render_text(self.config['icon'], font_size, self.config['color'])
+        surface.blit(icon, viewport.to_screen_point(x + 5, y + 5))
         
         # Прогрес-бар (якщо тимчасовий)
         if self.duration > 0:
             remaining = self.get_remaining_time()
             progress = remaining / self.duration
             bar_width = int((width - 35) * progress)
-            bar_rect = pygame.Rect(x + 30, y + 10, bar_width, 10)
-            pygame.draw.rect(surface, self.config['color'], bar_rect, border_radius=3)
+            bar_rect = viewport.to_screen_rect((x + 30, y + 10, bar_width, 10))
+            pygame.draw.rect(surface, self.config['color'], bar_rect,
+                             border_radius=viewport.scale_length(3))
             
             # Час що залишився
-            time_text = font.render(f"{int(remaining)}s", True, (255, 255, 255))
-            surface.blit(time_text, (x + 30, y + 5))
+            get_digit_atlas(font_size, (255, 255, 255)).draw(
+                surface, f"{int(remaining)}s", viewport.to_screen_point(x + 30, y + 5))
+        return bg_rect
 
 
 class BonusManager:
-    """Менеджер системи бонусів"""
+    """
+    Менеджер системи бонусів
+    
+    Бонуси, що впали за екран або прибрані clear(), повертаються у пул
+    вільних об'єктів і беруться з нього для нових падінь. Зібрані бонуси
+    віддаються грі й у пул не потрапляють, тож посилання на них лишаються
+    дійсними. Оновлення та збирання ущільнюють список падаючих бонусів на
+    місці за один прохід, тож дощ бонусів від каскаду вибухів не створює
+    нових об'єктів.
+    """
     
-    def __init__(self):
-        """Ініціалізація менеджера"""
+    def __init__(self, pool_size=BONUS_POOL_SIZE):
+        """
+        Ініціалізація менеджера
+        
+        Args:
+            pool_size: Максимум вільних бонусів у пулі
+        """
         self.bonuses = []
         self.active_effects = []
         self.drop_chance = 0.20  # 20% шанс випадання
+        self.pool_size = pool_size
+        self._free = []
     
     def create_random_bonus(self, x, y):
         """
@@ -218,9 +306,12 @@ class BonusManager:
             return None
         
         # Зважений вибір типу бонусу
-        weights = [BONUS_CONFIG[bt]['weight'] for bt in BonusType]
-        bonus_type = random.choices(list(BonusType), weights=weights)[0]
+        bonus_type = random.choices(BONUS_TYPES, cum_weights=BONUS_CUM_WEIGHTS)[0]
         
+        if self._free:
+            bonus = self._free.pop()
+            bonus.reset(x, y, bonus_type)
+            return bonus
         return Bonus(x, y, bonus_type)
     
     def add_bonus(self, bonus):
@@ -235,11 +326,20 @@ class BonusManager:
         Args:
             dt: Час з попереднього кадру
         """
-        # Оновлюємо бонуси
-        self.bonuses = [b for b in self.bonuses if b.update(dt)]
+        # Оновлюємо бонуси (ті, що впали за екран, - у пул)
+        bonuses = self.bonuses
+        kept = 0
+        for bonus in bonuses:
+            if bonus.update(dt):
+                bonuses[kept] = bonus
+                kept += 1
+            else:
+                self._release(bonus)
+        del bonuses[kept:]
         
         # Оновлюємо ефекти (видаляємо закінчені)
-        self.active_effects = [e for e in self.active_effects if not e.is_expired()]
+        if any(e.is_expired() for e in self.active_effects):
+            self.active_effects = [e for e in self.active_effects if not e.is_expired()]
     
     def check_collection(self, paddle_rect):
         """
@@ -249,20 +349,25 @@ class BonusManager:
             paddle_rect: Rect платформи
             
         Returns:
-            list: Список зібраних бонусів
+            list: Новий список зібраних бонусів
         """
         collected = []
-        remaining = []
-        
-        for bonus in self.bonuses:
+        bonuses = self.bonuses
+        kept = 0
+        for bonus in bonuses:
             if bonus.rect.colliderect(paddle_rect):
                 collected.append(bonus)
             else:
-                remaining.append(bonus)
-        
-        self.bonuses = remaining
+                bonuses[kept] = bonus
+                kept += 1
+        del bonuses[kept:]
         return collected
     
+    def _release(self, bonus):
+        """Повертає бонус у пул вільних"""
+        if len(self._free) < self.pool_size:
+            self._free.append(bonus)
+    
     def apply_bonus(self, bonus):
         """
         Застосовує ефект бонусу
@@ -299,26 +404,39 @@ class BonusManager:
         """Перевіряє чи активний певний ефект"""
         return any(e.effect_type == effect_type for e in self.active_effects)
     
-    def draw_bonuses(self, surface, current_time):
-        """Малює всі падаючі бонуси"""
-        for bonus in self.bonuses:
-            bonus.draw(surface, current_time)
+    def draw_bonuses(self, surface, current_time, viewport=IDENTITY):
+        """Малює всі падаючі бонуси та повертає їхні області"""
+        return [bonus.draw(surface, current_time, viewport) for bonus in self.bonuses]
     
-    def draw_effects_ui(self, surface, x, y):
+    def draw_effects_ui(self, surface, x, y, viewport=IDENTITY):
         """
         Малює UI індикатори активних ефектів
         
         Args:
             surface: Поверхня для малювання
-            x, y: Початкова позиція
+            x, y: Початкова позиція (логічні координати)
+            viewport: Трансформація логічних координат у пікселі surface
+        
+        Returns:
+            list: Області індикаторів
         """
+        rects = []
         offset_y = 0
         for effect in self.active_effects:
-            effect.draw_indicator(surface, x, y + offset_y)
+            rects.append(effect.draw_indicator(surface, x, y + offset_y, viewport))
             offset_y += 35
+        return rects
+    
+    @staticmethod
+    def bake_capsules(viewport=IDENTITY):
+        """Запікає стрічки капсул усіх типів заздалегідь (при завантаженні рівня)"""
+        for bonus_type in BonusType:
+            get_capsule_strip(bonus_type, viewport)
     
     def clear(self):
         """Очищає всі бонуси та ефекти"""
+        for bonus in self.bonuses:
+            self._release(bonus)
         self.bonuses.clear()
         self.active_effects.clear()
     
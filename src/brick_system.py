@@ -5,7 +5,13 @@
 import pygame
 import random
 import math
+from collections import OrderedDict
 from enum import Enum
+from text_cache import render_text, get_font
+from animation_strips import get_strip
+from viewport import Viewport, IDENTITY
+from display_format import create_surface, register_cache
+from game_config import BRICK_SPRITE_CACHE_SIZE
 
 
 class BrickType(Enum):
@@ -75,6 +81,81 @@ BRICK_COLORS = {
 }
 
 
+# Статичні частини цеглинок (градієнт, рамка, метал, тріщини) у кожному масштабі
+_body_sprites = OrderedDict()
+register_cache('bricks', _body_sprites)
+
+# Періоди анімованих ефектів (секунди)
+EXPLOSIVE_PULSE_PERIOD = 2 * math.pi / 8
+BONUS_RAINBOW_PERIOD = 3.6
+
+
+def rainbow_color(hue):
+    """Спрощений HSV до RGB для повної насиченості та яскравості"""
+    c = 1.0
+    x = 1 - abs((hue / 60) % 2 - 1)
+    if hue < 60:
+        r, g, b = c, x, 0
+    elif hue < 120:
+        r, g, b = x, c, 0
+    elif hue < 180:
+        r, g, b = 0, c, x
+    elif hue < 240:
+        r, g, b = 0, x, c
+    elif hue < 300:
+        r, g, b = x, 0, c
+    else:
+        r, g, b = c, 0, x
+    return (int(r * 255), int(g * 255), int(b * 255))
+
+
+def _render_overlay(size, border_color, border_width, glyph):
+    """
+    Рендерить прозорий кадр ефекту: обводка цеглинки та символ по центру
+    
+    Args:
+        size: Розмір цеглинки
+        border_color: Колір обводки
+        border_width: Товщина обводки
+        glyph: Поверхня з символом
+    
+    Returns:
+        pygame.Surface: Кадр (не менший за цеглинку, центр збігається з її центром)
+    """
+    frame = create_surface((max(size[0], glyph.get_width()), max(size[1], glyph.get_height())),
+                           alpha=True)
+    rect = pygame.Rect((0, 0), size)
+    rect.center = frame.get_rect().center
+    pygame.draw.rect(frame, border_color, rect, border_width)
+    # Під символом кадр прозорий - MAX копіює гліф разом з альфою без затемнення країв
+    frame.blit(glyph, glyph.get_rect(center=rect.center), special_flags=pygame.BLEND_RGBA_MAX)
+    return frame
+
+
+def _get_explosive_strip(size, viewport):
+    """Стрічка пульсуючої обводки вибухової цеглинки"""
+    border = viewport.scale_length(3)
+    glyph = render_text("💥", viewport.scale_length(20), (255, 255, 255))
+    
+    def render_frame(phase):
+        pulse = math.sin(phase * 2 * math.pi) * 0.3 + 0.7
+        return _render_overlay(size, (255, int(50 * pulse), 0), border, glyph)
+    
+    return get_strip(('explosive', size, viewport.scale), EXPLOSIVE_PULSE_PERIOD, render_frame)
+
+
+def _get_bonus_strip(size, viewport):
+    """Стрічка веселкової обводки бонусної цеглинки"""
+    border = viewport.scale_length(3)
+    font = get_font(viewport.scale_length(18))
+    
+    def render_frame(phase):
+        color = rainbow_color(phase * 360)
+        return _render_overlay(size, color, border, font.render("★", True, color))
+    
+    return get_strip(('bonus', size, viewport.scale), BONUS_RAINBOW_PERIOD, render_frame)
+
+
 class Brick:
     """Клас цеглинки з HP та типом"""
     
@@ -108,6 +189,9 @@ class Brick:
         self.shake_offset = 0
         self.shake_time = 0
         
+        # Вигляд змінився з останнього малювання (для брудних прямокутників)
+        self.changed = True
+        
     def _get_color(self):
         """Повертає колір цеглинки залежно від типу"""
         if self.brick_type == BrickType.NORMAL:
@@ -135,6 +219,7 @@ class Brick:
         if not self.can_destroy:
             # Незнищенна - тільки ефект
             self.shake_time = 0.2
+            self.changed = True
             return {
                 'destroyed': False,
                 'points': 0,
@@ -145,6 +230,7 @@ class Brick:
         
         self.hp -= 1
         self.shake_time = 0.1
+        self.changed = True
         
         # Оновлюємо колір для пошкоджених міцних цеглинок
         if self.brick_type == BrickType.DURABLE and self.hp > 0:
@@ -179,127 +265,163 @@ class Brick:
         else:
             self.shake_offset = 0
     
-    def draw(self, surface, current_time=0):
-        """Малює цеглинку"""
+    def draw(self, surface, current_time=0, viewport=IDENTITY, gradient=True):
+        """
+        Малює цеглинку
+        
+        Args:
+            surface: Поверхня для малювання
+            current_time: Поточний час для анімацій
+            viewport: Трансформація логічних координат у пікселі surface
+            gradient: False - суцільна заливка замість градієнта (низька якість)
+        
+        Returns:
+            pygame.Rect або None: Область, якщо вигляд цеглинки змінився
+        """
+        changed = self.changed or self.shake_time > 0
+        self.changed = False
         if not self.visible:
-            return
-            
-        draw_rect = self.rect.copy()
-        draw_rect.x += int(self.shake_offset)
+            # Зникла цеглинка ще один раз повідомляє свою область
+            return viewport.to_screen_rect(self.rect) if changed else None
+        
+        draw_rect = viewport.to_screen_rect(self.rect.move(int(self.shake_offset), 0))
+        
+        # Статична частина - з кешу спрайтів цільового розміру
+        surface.blit(self._get_body_sprite(draw_rect.size, viewport.scale, gradient), draw_rect)
+        
+        # Анімовані ефекти для різних типів
+        effect_rect = None
+        if self.brick_type == BrickType.EXPLOSIVE:
+            effect_rect = self._draw_explosive_effect(surface, draw_rect, current_time, viewport)
+        elif self.brick_type == BrickType.BONUS:
+            effect_rect = self._draw_bonus_effect(surface, draw_rect, current_time, viewport)
+        
+        if changed or effect_rect:
+            # Тремтіння зсуває цеглинку, тож захоплюємо і сусідні пікселі
+            dirty = draw_rect.inflate(viewport.scale_length(4) * 2, 0)
+            return dirty.union(effect_rect) if effect_rect else dirty
+        return None
+    
+    def _get_body_sprite(self, size, scale, gradient=True):
+        """Повертає спрайт статичної частини цеглинки (з LRU кешу)"""
+        key = (self.brick_type, self.color, self.hp, self.max_hp, size, gradient)
+        sprite = _body_sprites.get(key)
+        if sprite is not None:
+            _body_sprites.move_to_end(key)
+            return sprite
+        
+        sprite = create_surface(size)
+        self.draw_static(sprite, sprite.get_rect(), Viewport(scale), gradient)
+        
+        _body_sprites[key] = sprite
+        if len(_body_sprites) > BRICK_SPRITE_CACHE_SIZE:
+            _body_sprites.popitem(last=False)
+        return sprite
+    
+    def draw_static(self, surface, rect, viewport=IDENTITY, gradient=True):
+        """
+        Малює статичну частину цеглинки: градієнт, рамку, метал або тріщини
         
+        Args:
+            surface: Поверхня для малювання
+            rect: Область цеглинки на surface
+            viewport: Трансформація (задає товщину ліній)
+            gradient: False - суцільна заливка замість градієнта
+        """
         # Основний колір з градієнтом
-        self._draw_with_gradient(surface, draw_rect)
+        self._draw_with_gradient(surface, rect, viewport, gradient)
         
-        # Спеціальні ефекти для різних типів
+        # Статичні ефекти для різних типів
         if self.brick_type == BrickType.UNBREAKABLE:
-            self._draw_metal_effect(surface, draw_rect)
-        elif self.brick_type == BrickType.EXPLOSIVE:
-            self._draw_explosive_effect(surface, draw_rect, current_time)
-        elif self.brick_type == BrickType.BONUS:
-            self._draw_bonus_effect(surface, draw_rect, current_time)
+            self._draw_metal_effect(surface, rect, viewport)
         elif self.brick_type == BrickType.DURABLE and self.hp < self.max_hp:
-            self._draw_cracks(surface, draw_rect)
+            self._draw_cracks(surface, rect, viewport)
     
-    def _draw_with_gradient(self, surface, rect):
-        """Малює цеглинку з градієнтом"""
+    def _draw_with_gradient(self, surface, rect, viewport=IDENTITY, gradient=True):
+        """Малює цеглинку з градієнтом (або суцільним кольором)"""
         # Градієнт зверху вниз
         color_top = tuple(min(255, int(c * 1.3)) for c in self.color)
         color_bottom = tuple(int(c * 0.7) for c in self.color)
         
-        for y in range(rect.height):
-            ratio = y / rect.height
-            r = int(color_top[0] * (1 - ratio) + color_bottom[0] * ratio)
-            g = int(color_top[1] * (1 - ratio) + color_bottom[1] * ratio)
-            b = int(color_top[2] * (1 - ratio) + color_bottom[2] * ratio)
-            pygame.draw.line(surface, (r, g, b), 
-                           (rect.left, rect.top + y), 
-                           (rect.right, rect.top + y))
+        if gradient:
+            for y in range(rect.height):
+                ratio = y / rect.height
+                r = int(color_top[0] * (1 - ratio) + color_bottom[0] * ratio)
+                g = int(color_top[1] * (1 - ratio) + color_bottom[1] * ratio)
+                b = int(color_top[2] * (1 - ratio) + color_bottom[2] * ratio)
+                pygame.draw.line(surface, (r, g, b), 
+                               (rect.left, rect.top + y), 
+                               (rect.right, rect.top + y))
+        else:
+            surface.fill(self.color, rect)
         
         # 3D ефект
         highlight = tuple(min(255, int(c * 1.5)) for c in self.color)
         shadow = tuple(int(c * 0.5) for c in self.color)
-        pygame.draw.line(surface, highlight, rect.topleft, rect.topright, 2)
-        pygame.draw.line(surface, highlight, rect.topleft, rect.bottomleft, 2)
-        pygame.draw.line(surface, shadow, rect.bottomleft, rect.bottomright, 2)
-        pygame.draw.line(surface, shadow, rect.topright, rect.bottomright, 2)
+        edge = viewport.scale_length(2)
+        pygame.draw.line(surface, highlight, rect.topleft, rect.topright, edge)
+        pygame.draw.line(surface, highlight, rect.topleft, rect.bottomleft, edge)
+        pygame.draw.line(surface, shadow, rect.bottomleft, rect.bottomright, edge)
+        pygame.draw.line(surface, shadow, rect.topright, rect.bottomright, edge)
     
-    def _draw_metal_effect(self, surface, rect):
+    def _draw_metal_effect(self, surface, rect, viewport=IDENTITY):
         """Малює металевий ефект"""
         # Горизонтальні смуги
         stripe_color = (100, 100, 120)
         for i in range(3):
             y = rect.top + (i + 1) * rect.height // 4
-            pygame.draw.line(surface, stripe_color, (rect.left + 2, y), (rect.right - 2, y), 1)
+            inset = viewport.scale_length(2)
+            pygame.draw.line(surface, stripe_color, (rect.left + inset, y), (rect.right - inset, y),
+                             viewport.scale_length(1))
         
         # Болти по кутах
         bolt_color = (60, 60, 80)
-        bolt_radius = 3
-        offsets = [(5, 5), (rect.width - 5, 5), (5, rect.height - 5), (rect.width - 5, rect.height - 5)]
+        bolt_radius = viewport.scale_length(3)
+        margin = viewport.scale_length(5)
+        offsets = [(margin, margin), (rect.width - margin, margin),
+                   (margin, rect.height - margin), (rect.width - margin, rect.height - margin)]
         for ox, oy in offsets:
             pygame.draw.circle(surface, bolt_color, (rect.left + ox, rect.top + oy), bolt_radius)
     
-    def _draw_explosive_effect(self, surface, rect, current_time):
-        """Малює ефект вибухової цеглинки"""
-        # Пульсуюча обводка
-        pulse = math.sin(current_time * 8) * 0.3 + 0.7
-        glow_color = (255, int(50 * pulse), 0)
-        pygame.draw.rect(surface, glow_color, rect, 3)
-        
-        # Символ вибуху
-        font = pygame.font.Font(None, 20)
-        text = font.render("💥", True, (255, 255, 255))
-        text_rect = text.get_rect(center=rect.center)
-        surface.blit(text, text_rect)
+    def bake_effects(self, viewport=IDENTITY):
+        """Запікає стрічку анімованого ефекту заздалегідь (при завантаженні рівня)"""
+        rect = viewport.to_screen_rect(self.rect)
+        if self.brick_type == BrickType.EXPLOSIVE:
+            _get_explosive_strip(rect.size, viewport)
+        elif self.brick_type == BrickType.BONUS:
+            _get_bonus_strip(rect.size, viewport)
     
-    def _draw_bonus_effect(self, surface, rect, current_time):
-        """Малює ефект бонусної цеглинки"""
-        # Веселкова обводка
-        hue = (current_time * 100) % 360
-        # Спрощений HSV до RGB
-        c = 1.0
-        x = 1 - abs((hue / 60) % 2 - 1)
-        if hue < 60:
-            r, g, b = c, x, 0
-        elif hue < 120:
-            r, g, b = x, c, 0
-        elif hue < 180:
-            r, g, b = 0, c, x
-        elif hue < 240:
-            r, g, b = 0, x, c
-        elif hue < 300:
-            r, g, b = x, 0, c
-        else:
-            r, g, b = c, 0, x
-        
-        rainbow_color = (int(r * 255), int(g * 255), int(b * 255))
-        pygame.draw.rect(surface, rainbow_color, rect, 3)
-        
-        # Зірочка
-        font = pygame.font.Font(None, 18)
-        text = font.render("★", True, rainbow_color)
-        text_rect = text.get_rect(center=rect.center)
-        surface.blit(text, text_rect)
+    def _draw_explosive_effect(self, surface, rect, current_time, viewport=IDENTITY):
+        """Малює ефект вибухової цеглинки (кадр запеченої стрічки)"""
+        frame = _get_explosive_strip(rect.size, viewport).frame_at(current_time)
+        return surface.blit(frame, frame.get_rect(center=rect.center))
+    
+    def _draw_bonus_effect(self, surface, rect, current_time, viewport=IDENTITY):
+        """Малює ефект бонусної цеглинки (кадр запеченої стрічки)"""
+        frame = _get_bonus_strip(rect.size, viewport).frame_at(current_time)
+        return surface.blit(frame, frame.get_rect(center=rect.center))
     
-    def _draw_cracks(self, surface, rect):
+    def _draw_cracks(self, surface, rect, viewport=IDENTITY):
         """Малює тріщини на пошкодженій цеглинці"""
         crack_color = (50, 50, 50)
         damage = 1 - (self.hp / self.max_hp)
+        px = viewport.scale_length
         
         # Більше тріщин при більшому пошкодженні
         if damage >= 0.5:
             # Велика тріщина
             points = [
-                (rect.left + 5, rect.top + 5),
+                (rect.left + px(5), rect.top + px(5)),
                 (rect.centerx, rect.centery),
-                (rect.right - 5, rect.bottom - 5)
+                (rect.right - px(5), rect.bottom - px(5))
             ]
-            pygame.draw.lines(surface, crack_color, False, points, 2)
+            pygame.draw.lines(surface, crack_color, False, points, px(2))
             
         if damage >= 0.3:
             # Маленька тріщина
             pygame.draw.line(surface, crack_color, 
-                           (rect.right - 10, rect.top + 3),
-                           (rect.centerx + 5, rect.centery - 3), 2)
+                           (rect.right - px(10), rect.top + px(3)),
+                           (rect.centerx + px(5), rect.centery - px(3)), px(2))
 
 
 class LevelManager:
@@ -0,0 +1,112 @@
+"""
+Брудні прямокутники: області кадру, що змінилися з попереднього виводу
+"""
+import pygame
+from game_config import DIRTY_RECT_MAX_COVERAGE, DIRTY_RECT_MAX_COUNT
+
+
+def merge_rects(rects, bounds):
+    """
+    Обрізає прямокутники межами екрану та об'єднує ті, що перетинаються
+    
+    Args:
+        rects: Послідовність прямокутників
+        bounds: pygame.Rect екрану
+    
+    Returns:
+        list: Прямокутники, що попарно не перетинаються
+    """
+    merged = []
+    for rect in rects:
+        rect = bounds.clip(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            continue
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class DirtyRegions:
+    """
+    Збирає області, які шари змінили за кадр
+    
+    Кожен шар під час малювання повідомляє, де він малював. Область
+    кадру, яку треба вивести, - це області поточного кадру разом з
+    областями попереднього (там об'єкти були і тепер мають бути стерті).
+    Якщо змінилася велика частина екрану або кадр позначено повністю
+    брудним, end_frame() повертає None і виводиться весь кадр. Якщо ж
+    за кадр і попередній кадр нічого не змінилось, end_frame() позначає
+    кадр як idle - його можна не виводити зовсім.
+    """
+    
+    def __init__(self, size, max_coverage=DIRTY_RECT_MAX_COVERAGE, max_count=DIRTY_RECT_MAX_COUNT):
+        """
+        Ініціалізація
+        
+        Args:
+            size: Розмір кадру (ширина, висота)
+            max_coverage: Частка площі кадру, з якої вигідніше вивести весь кадр
+            max_count: Максимальна кількість прямокутників до об'єднання
+        """
+        self.bounds = pygame.Rect((0, 0), size)
+        self.max_coverage = max_coverage
+        self.max_count = max_count
+        self.current = []
+        self.previous = []
+        self.full = True
+        self.coverage = 1.0
+        self.idle = False
+        self._invalidated = True
+    
+    def add(self, rect):
+        """Позначає область як змінену (None ігнорується)"""
+        if rect:
+            self.current.append(pygame.Rect(rect))
+    
+    def add_all(self, rects):
+        """Позначає кілька областей як змінені"""
+        if rects:
+            self.current.extend(pygame.Rect(rect) for rect in rects if rect)
+    
+    def invalidate(self):
+        """Наступний кадр виводиться повністю"""
+        self.full = True
+        self._invalidated = True
+    
+    def end_frame(self, allow_partial=True):
+        """
+        Завершує кадр і повертає області для виводу
+        
+        Args:
+            allow_partial: False, якщо кадр виводиться повністю незалежно від
+                змін (тремтіння, повноекранний режим); тоді й наступний кадр
+                буде повним, бо вміст вікна не відповідає логічному кадру
+        
+        Returns:
+            list або None: Прямокутники для display.update() (None - весь кадр)
+        """
+        rects = self.previous + self.current
+        self.previous = self.current
+        self.current = []
+        self.idle = not rects and not self._invalidated
+        self._invalidated = False
+        
+        if not allow_partial:
+            self.full = True
+            self.coverage = 1.0
+            return None
+        
+        if self.full or len(rects) > self.max_count:
+            self.full = False
+            self.coverage = 1.0
+            return None
+        
+        merged = merge_rects(rects, self.bounds)
+        area = sum(rect.width * rect.height for rect in merged)
+        self.coverage = area / (self.bounds.width * self.bounds.height)
+        if self.coverage > self.max_coverage:
+            return None
+        return merged
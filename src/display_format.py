@@ -0,0 +1,216 @@
+"""
+Поверхні у форматі дисплея: фабрика, RLE для статичних спрайтів і перевірка формату
+"""
+import pygame
+from game_config import DISPLAY_FORMAT_AUDIT
+
+
+class DisplayFormat:
+    """
+    Формат, у якому blit на кадр не конвертує пікселі
+    
+    Шаблони - поверхні 1x1 після convert()/convert_alpha() - оновлюються
+    при кожній зміні режиму дисплея, і нові поверхні створюються за ними
+    одразу в потрібному форматі. Кеші спрайтів реєструються тут: словники
+    поверхонь при зміні формату конвертуються на місці, а складніші сховища
+    (стрічки, текст, панелі, буфери кадру) відкидаються і створюються знову.
+    Поки дисплея немає (до set_mode або у текстурному виводі), поверхні
+    мають типовий формат pygame і вважаються рідними.
+    """
+    
+    def __init__(self, audit=DISPLAY_FORMAT_AUDIT):
+        """
+        Ініціалізація формату
+        
+        Args:
+            audit: True - повідомляти про поверхні кешів не у форматі дисплея
+        """
+        self.audit_enabled = audit
+        self._opaque = None
+        self._alpha = None
+        self._caches = {}
+        self._sources = {}
+        self._reported = set()
+    
+    def refresh(self):
+        """
+        Оновлює шаблони після зміни режиму дисплея і приводить кеші до формату
+        
+        Returns:
+            bool: True, якщо формат змінився (сховища з reset відкинуто)
+        """
+        previous = (self._format(False), self._format(True))
+        if pygame.display.get_surface() is None:
+            self._opaque = self._alpha = None
+        else:
+            self._opaque = pygame.Surface((1, 1)).convert()
+            self._alpha = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+        
+        for cache in self._caches.values():
+            for key, surface in list(cache.items()):
+                if surface is not None and not self.is_native(surface):
+                    cache[key] = self.convert(surface)
+        
+        changed = previous != (self._format(False), self._format(True))
+        if changed:
+            for _, reset in self._sources.values():
+                if reset is not None:
+                    reset()
+        return changed
+    
+    def _format(self, alpha):
+        """Бітність і маски поточного формату (без дисплея - типового формату pygame)"""
+        template = self._alpha if alpha else self._opaque
+        if template is None:
+            template = pygame.Surface((1, 1), pygame.SRCALPHA if alpha else 0)
+        return template.get_bitsize(), template.get_masks()
+    
+    def create(self, size, alpha=False):
+        """
+        Створює поверхню у форматі дисплея
+        
+        Args:
+            size: Розмір (ширина, висота)
+            alpha: True - з попіксельною прозорістю
+        
+        Returns:
+            pygame.Surface: Нова поверхня
+        """
+        flags = pygame.SRCALPHA if alpha else 0
+        template = self._alpha if alpha else self._opaque
+        if template is None:
+            return pygame.Surface(size, flags)
+        return pygame.Surface(size, flags, template)
+    
+    def convert(self, surface, alpha=None):
+        """
+        Повертає поверхню у форматі дисплея (ту саму, якщо вона вже рідна)
+        
+        Args:
+            surface: Поверхня будь-якого формату
+            alpha: Чи потрібна прозорість (None - як у surface)
+        
+        Returns:
+            pygame.Surface: Поверхня у форматі дисплея
+        """
+        if alpha is None:
+            alpha = has_pixel_alpha(surface)
+        if self._opaque is None or self.is_native(surface, alpha):
+            return surface
+        converted = surface.convert_alpha() if alpha else surface.convert()
+        if surface.get_flags() & pygame.RLEACCEL:
+            make_static(converted, surface.get_colorkey())
+        return converted
+    
+    def is_native(self, surface, alpha=None):
+        """Чи збігається формат поверхні з форматом дисплея"""
+        if alpha is None:
+            alpha = has_pixel_alpha(surface)
+        template = self._alpha if alpha else self._opaque
+        return (template is None or (surface.get_bitsize() == template.get_bitsize()
+                                     and surface.get_masks() == template.get_masks()))
+    
+    def register_cache(self, name, cache):
+        """
+        Реєструє кеш спрайтів для конвертації та перевірки
+        
+        Args:
+            name: Назва кешу (для повідомлень)
+            cache: Словник ключ -> поверхня (None допускається)
+        """
+        self._caches[name] = cache
+    
+    def register_source(self, name, surfaces, reset=None):
+        """
+        Реєструє сховище поверхонь, яке після зміни формату відкидається
+        
+        Args:
+            name: Назва сховища (для повідомлень)
+            surfaces: Функція без аргументів -> пари (ключ, поверхня) для audit()
+            reset: Функція без аргументів, що відкидає поверхні, щоб вони
+                створились знову в новому форматі (None - лише перевірка)
+        """
+        self._sources[name] = (surfaces, reset)
+    
+    def audit(self):
+        """
+        Повідомляє про поверхні кешів не у форматі дисплея (кожну - один раз)
+        
+        Returns:
+            list: Нові знахідки (назва кешу, ключ)
+        """
+        if not self.audit_enabled:
+            return []
+        stores = [(name, list(cache.items())) for name, cache in self._caches.items()]
+        stores += [(name, list(surfaces())) for name, (surfaces, _) in self._sources.items()]
+        found = []
+        for name, items in stores:
+            for key, surface in items:
+                if surface is None or self.is_native(surface) or (name, key) in self._reported:
+                    continue
+                self._reported.add((name, key))
+                found.append((name, key))
+                print(f"Поверхня не у форматі дисплея: {name} {key} "
+                      f"({surface.get_bitsize()} біт, маски {surface.get_masks()})")
+        return found
+
+
+def has_pixel_alpha(surface):
+    """
+    Чи має поверхня попіксельну прозорість
+    
+    Прапорець SRCALPHA для цього не годиться: pygame ставить його й після
+    set_alpha() на непрозорій поверхні.
+    """
+    return surface.get_masks()[3] != 0
+
+
+def make_static(surface, colorkey=None):
+    """
+    Вмикає RLE-прискорення для спрайта, що більше не змінюється
+    
+    Прозорі ділянки кодуються серіями і при blit пропускаються. Лише для
+    звичайних blit: змішування зі special_flags та surfarray розпаковують
+    поверхню щоразу.
+    
+    Args:
+        surface: Готовий спрайт
+        colorkey: Колірний ключ (None - попіксельна прозорість поверхні)
+    
+    Returns:
+        pygame.Surface: Той самий спрайт
+    """
+    if colorkey is not None:
+        surface.set_colorkey(colorkey, pygame.RLEACCEL)
+    elif surface.get_flags() & pygame.SRCALPHA:
+        surface.set_alpha(255, pygame.RLEACCEL)
+    return surface
+
+
+# Спільний екземпляр для всієї гри
+_display_format = DisplayFormat()
+
+
+def create_surface(size, alpha=False):
+    """Створює поверхню у форматі дисплея (див. DisplayFormat.create)"""
+    return _display_format.create(size, alpha)
+
+
+def convert_surface(surface, alpha=None):
+    """Повертає поверхню у форматі дисплея (див. DisplayFormat.convert)"""
+    return _display_format.convert(surface, alpha)
+
+
+def register_cache(name, cache):
+    """Реєструє кеш спрайтів (див. DisplayFormat.register_cache)"""
+    _display_format.register_cache(name, cache)
+
+
+def register_source(name, surfaces, reset=None):
+    """Реєструє сховище поверхонь (див. DisplayFormat.register_source)"""
+    _display_format.register_source(name, surfaces, reset)
+
+
+def get_display_format():
+    """Повертає спільний формат (для refresh() після зміни дисплея та audit())"""
+    return _display_format
@@ -0,0 +1,188 @@
+"""
+Процедурні ефект-примітиви: кільця ударних хвиль
+
+Кожен примітив описується кількома параметрами і малюється з кешованого
+спрайта, тож одна ударна хвиля коштує один blit замість десятків частинок.
+Анімація квантується на EFFECT_ANIMATION_STEPS кроків, тому для кожного
+набору параметрів кеш містить не більше цієї кількості спрайтів.
+"""
+import pygame
+from collections import OrderedDict
+from viewport import IDENTITY
+from display_format import create_surface, make_static, register_cache
+from game_config import EFFECT_MAX_PRIMITIVES, EFFECT_SPRITE_CACHE_SIZE, EFFECT_ANIMATION_STEPS
+
+
+RING = "ring"
+
+
+class EffectPrimitive:
+    """Окремий примітив з параметрами анімації"""
+    
+    def __init__(self, kind, x, y, color, start_radius, end_radius, lifetime, width=0):
+        """
+        Ініціалізація примітива
+        
+        Args:
+            kind: Тип примітива (RING)
+            x, y: Центр
+            color: Колір (R, G, B)
+            start_radius: Радіус на початку життя
+            end_radius: Радіус в кінці життя
+            lifetime: Час життя в секундах
+            width: Товщина лінії (для кілець)
+        """
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.color = tuple(color)
+        self.start_radius = start_radius
+        self.end_radius = end_radius
+        self.lifetime = lifetime
+        self.width = width
+        self.elapsed = 0.0
+    
+    @property
+    def step(self):
+        """Поточний крок анімації (0 - EFFECT_ANIMATION_STEPS-1)"""
+        return min(EFFECT_ANIMATION_STEPS - 1, int(self.elapsed / self.lifetime * EFFECT_ANIMATION_STEPS))
+
+
+class EffectLayer:
+    """Шар ефект-примітивів з кешем спрайтів"""
+    
+    def __init__(self, max_primitives=EFFECT_MAX_PRIMITIVES, cache_size=EFFECT_SPRITE_CACHE_SIZE):
+        """
+        Ініціалізація шару
+        
+        Args:
+            max_primitives: Максимальна кількість одночасних примітивів
+            cache_size: Максимальна кількість спрайтів у LRU кеші
+        """
+        self.max_primitives = max_primitives
+        self.cache_size = cache_size
+        self.primitives = []
+        self.sprites = OrderedDict()
+        register_cache('effects', self.sprites)
+        self.dropped = 0
+    
+    def _add(self, primitive):
+        """Додає примітив (або відкидає, якщо шар заповнений)"""
+        if len(self.primitives) >= self.max_primitives:
+            self.dropped += 1
+            return None
+        self.primitives.append(primitive)
+        return primitive
+    
+    def add_ring(self, x, y, color, max_radius=72, lifetime=0.3, width=2):
+        """
+        Додає кільце, що розширюється та згасає
+        
+        Args:
+            x, y: Центр
+            color: Колір кільця
+            max_radius: Радіус в кінці життя
+            lifetime: Час життя
+            width: Товщина кільця
+        """
+        return self._add(EffectPrimitive(RING, x, y, color, 0, max_radius, lifetime, width))
+    
+    def update(self, dt):
+        """
+        Оновлює примітиви та прибирає завершені
+        
+        Args:
+            dt: Час з попереднього кадру
+        """
+        for primitive in self.primitives:
+            primitive.elapsed += dt
+        self.primitives = [p for p in self.primitives if p.elapsed < p.lifetime]
+    
+    def draw(self, surface, viewport=IDENTITY):
+        """
+        Малює всі примітиви одним викликом blits()
+        
+        Args:
+            surface: Поверхня для малювання
+            viewport: Трансформація логічних координат у пікселі surface
+        
+        Returns:
+            list: Прямокутники намальованих примітивів
+        """
+        blit_sequence = self.prepare(viewport)
+        return surface.blits(blit_sequence) if blit_sequence else []
+    
+    def prepare(self, viewport=IDENTITY):
+        """
+        Підбирає спрайти та позиції примітивів, не торкаючись кадру
+        
+        Args:
+            viewport: Трансформація логічних координат у пікселі кадру
+        
+        Returns:
+            list: Послідовність (спрайт, позиція) для blits()
+        """
+        blit_sequence = []
+        for primitive in self.primitives:
+            sprite = self._get_sprite(primitive, viewport.scale)
+            if sprite is None:
+                continue
+            half = sprite.get_width() // 2
+            x, y = viewport.to_screen_point(primitive.x, primitive.y)
+            blit_sequence.append((sprite, (x - half, y - half)))
+        return blit_sequence
+    
+    def _get_sprite(self, primitive, scale=1.0):
+        """Повертає спрайт кроку анімації з LRU кешу (рендерить при першому запиті)"""
+        key = (primitive.kind, primitive.start_radius, primitive.end_radius,
+               primitive.color, primitive.width, primitive.step, scale)
+        if key in self.sprites:
+            self.sprites.move_to_end(key)
+            return self.sprites[key]
+        
+        sprite = self._render_step(primitive, scale)
+        if sprite is not None:
+            make_static(sprite)
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.cache_size:
+            self.sprites.popitem(last=False)
+        return sprite
+    
+    @staticmethod
+    def _render_step(primitive, scale=1.0):
+        """Рендерить спрайт для середини поточного кроку анімації (у заданому масштабі)"""
+        progress = (primitive.step + 0.5) / EFFECT_ANIMATION_STEPS
+        radius = int((primitive.start_radius + (primitive.end_radius - primitive.start_radius) * progress) * scale)
+        alpha = int(255 * (1.0 - progress))
+        if radius <= 0 or alpha <= 0:
+            return None
+        return render_ring(radius, primitive.color, alpha, max(1, round(primitive.width * scale)))
+    
+    def clear(self):
+        """Прибирає всі примітиви"""
+        self.primitives.clear()
+    
+    def __len__(self):
+        return len(self.primitives)
+
+
+def render_ring(radius, color, alpha, width, supersample=2):
+    """
+    Рендерить згладжене кільце (малюється збільшеним і зменшується smoothscale)
+    
+    Args:
+        radius: Радіус кільця
+        color: Колір (R, G, B)
+        alpha: Прозорість
+        width: Товщина лінії
+        supersample: Коефіцієнт надвибірки
+    
+    Returns:
+        pygame.Surface: Квадратний спрайт з кільцем по центру
+    """
+    size = (radius + width + 1) * 2
+    big = create_surface((size * supersample, size * supersample), alpha=True)
+    center = size * supersample // 2
+    pygame.draw.circle(big, (*color, alpha), (center, center),
+                       radius * supersample, width * supersample)
+    return pygame.transform.smoothscale(big, (size, size))
@@ -6,6 +6,7 @@ from game_config import (
     WHITE, NEON_THEME
 )
 from graphics_effects import draw_3d_paddle, draw_glowing_ball
+from viewport import IDENTITY
 
 class Paddle:
     def __init__(self, x, y, width=PADDLE_WIDTH, height=PADDLE_HEIGHT, speed=PADDLE_SPEED, color=None):
@@ -21,8 +22,10 @@ class Paddle:
         if dx > 0 and self.rect.right < boundary_width:
             self.rect.move_ip(dx, 0)
             
-    def draw(self, surface):
-        draw_3d_paddle(surface, self.rect, self.color)
+    def draw(self, surface, viewport=IDENTITY):
+        rect = viewport.to_screen_rect(self.rect)
+        draw_3d_paddle(surface, rect, self.color, edge=viewport.scale_length(2))
+        return rect
         
     def set_width(self, width):
         center = self.rect.centerx
@@ -94,8 +97,10 @@ class Ball:
         self.rect.x += self.vx
         self.rect.y += self.vy
 
-    def draw(self, surface):
-        draw_glowing_ball(surface, self.rect, self.color)
+    def draw(self, surface, viewport=IDENTITY, glow=True):
+        glow_radius = viewport.scale_length(5) if glow else 0
+        return draw_glowing_ball(surface, viewport.to_screen_rect(self.rect), self.color,
+                                 glow_radius=glow_radius)
 
     def bounce_x(self):
         self.vx = -self.vx
@@ -0,0 +1,82 @@
+"""
+Знімок ігрового кадру під станами-оверлеями (пауза, перехід, кінець гри)
+"""
+import pygame
+from display_format import create_surface, register_source
+from game_config import BLACK
+
+
+class FrozenFrame:
+    """
+    Ігровий кадр, знятий один раз при вході в стан-оверлей
+    
+    Поки стан активний, гра не змінюється, тож замість перемальовування
+    цеглинок, м'ячів і частинок щокадру знімок копіюється одним blit.
+    Постобробка застосовується до знімка один раз при знятті, а затемнення
+    запікається в нього з кешованого шару.
+    """
+    
+    def __init__(self, post_process=None):
+        """
+        Ініціалізація знімка
+        
+        Args:
+            post_process: Функція surface -> None, що застосовує постобробку
+                до щойно знятого кадру (None - без постобробки)
+        """
+        self.post_process = post_process
+        self._frame = None
+        self._key = None
+        self._dim = None
+        register_source('frozen_frame', self.iter_surfaces, self.release)
+    
+    def draw(self, surface, render, dim_alpha=0):
+        """
+        Виводить знімок (знімає його, якщо знімка ще немає)
+        
+        Args:
+            surface: Поверхня для малювання
+            render: Функція surface -> None, що малює гру
+            dim_alpha: Прозорість затемнення (0 - без затемнення)
+        
+        Returns:
+            pygame.Rect або None: Область знімка, якщо його щойно знято
+        """
+        size = surface.get_size()
+        captured = None
+        if self._frame is None or self._key != (size, dim_alpha):
+            if self._frame is None or self._frame.get_size() != size:
+                self._frame = create_surface(size)
+            self._frame.fill(BLACK)
+            render(self._frame)
+            if self.post_process is not None:
+                self.post_process(self._frame)
+            if dim_alpha:
+                self._frame.blit(self._get_dim(size, dim_alpha), (0, 0))
+            self._key = (size, dim_alpha)
+            captured = self._frame.get_rect()
+        
+        surface.blit(self._frame, (0, 0))
+        return captured
+    
+    def invalidate(self):
+        """Наступний виклик draw() зніме кадр заново"""
+        self._key = None
+    
+    def release(self):
+        """Відкидає знімок і шар затемнення (наступний draw() зніме кадр заново)"""
+        self._frame = None
+        self._dim = None
+        self._key = None
+    
+    def iter_surfaces(self):
+        """Пари (назва, поверхня) знімка та шару затемнення"""
+        return [('frame', self._frame), ('dim', self._dim)]
+    
+    def _get_dim(self, size, alpha):
+        """Повертає кешований шар затемнення"""
+        if self._dim is None or self._dim.get_size() != size or self._dim.get_alpha() != alpha:
+            self._dim = create_surface(size)
+            self._dim.fill(BLACK)
+            self._dim.set_alpha(alpha)
+        return self._dim
@@ -8,6 +8,30 @@ from pathlib import Path
 WINDOW_WIDTH = 900
 WINDOW_HEIGHT = 600
 
+# Масштабування у повноекранному режимі:
+# 'nearest' - на весь екран, 'integer' - цілий масштаб (чіткі пікселі),
+# 'smooth' - згладжене, 'sdl' - масштабує SDL (прапорець pygame.SCALED)
+PRESENTATION_SCALE_MODE = 'nearest'
+
+# Бекенд виводу: 'software' - масштабування поверхонь на CPU,
+# 'texture' - рендерер SDL (pygame._sdl2.video): спрайти стають текстурами,
+# кадр масштабує відеокарта або, якщо її немає, програмний рендерер SDL
+RENDER_BACKEND = 'software'
+TEXTURE_CACHE_SIZE = 2048  # Максимум текстур спрайтів у кеші рендерера
+
+# Малювати ігровий процес одразу в нативній роздільності повноекранного
+# режиму (без масштабування всього кадру); меню лишаються масштабованими
+RENDER_NATIVE_RESOLUTION = False
+
+# Повідомляти в консоль про спрайти кешів, що не у форматі дисплея
+# (кожен blit такої поверхні конвертує пікселі)
+DISPLAY_FORMAT_AUDIT = False
+
+# Вивід лише змінених областей у віконному режимі (display.update(rects))
+DIRTY_RECTS_ENABLED = True
+DIRTY_RECT_MAX_COVERAGE = 0.4  # Частка площі, з якої виводиться весь кадр (flip)
+DIRTY_RECT_MAX_COUNT = 512     # Більше прямокутників - теж повний кадр
+
 # Файли ресурсів
 # Використовуємо pathlib для коректних шляхів відносно цього файлу
 # game_config.py знаходиться в src/, тому піднімаємось на рівень вище
@@ -18,6 +42,7 @@ DATA_DIR = BASE_DIR / 'data'
 MUSIC_FILE = str(ASSETS_DIR / 'music' / 'chiptune-ending-212716.mp3')
 HEART_IMAGE_FILE = str(ASSETS_DIR / 'images' / 'heart.png')
 HIGH_SCORES_FILE = str(DATA_DIR / 'high_scores.json')
+QUALITY_FILE = str(DATA_DIR / 'quality.json')  # Пресет якості для кожної машини
 
 # Настройки звуку
 MUSIC_VOLUME = 0.5
@@ -87,6 +112,22 @@ MENU_FONT_SIZE = 36
 SMALL_FONT_SIZE = 28
 HEART_SIZE = 35
 HEART_PADDING = 8
+TEXT_CACHE_SIZE = 256  # Максимум відрендерених рядків у LRU кеші
+BRICK_SPRITE_CACHE_SIZE = 128  # Спрайти статичних частин цеглинок (тип, колір, HP, розмір)
+ANIMATION_STRIP_FPS = 30        # Кадрів на секунду періоду запечених анімацій
+ANIMATION_STRIP_MAX_FRAMES = 64 # Максимум кадрів в одній стрічці
+ANIMATION_STRIP_MEMORY_MB = 16  # Ліміт пам'яті всіх запечених стрічок
+PALETTE_BRICK_LAYER = False     # 8-бітний шар цеглинок з анімацією через палітру
+PALETTE_RAMP_SHADES = 16        # Відтінків градієнта на один колір цеглинок у палітрі
+PALETTE_NEON_PULSE = 0.15       # Амплітуда пульсації яскравості неонових рядів (0 - вимкнено)
+PALETTE_NEON_PERIOD = 2.0       # Період пульсації неонових рядів (секунди)
+HUD_COUNTDOWN_RATE = 10         # Оновлень таймерів бонусів у HUD за секунду
+OVERLAY_DIM_ALPHA = 180         # Затемнення знімка гри під паузою (0-255)
+FLOATING_TEXT_CAPACITY = 512    # Ємність пулу спливаючих текстів (найстаріші витісняються)
+FLOATING_TEXT_LIFETIME = 1.5    # Час життя спливаючого тексту (секунди)
+FLOATING_TEXT_RISE = 60         # На скільки пікселів текст піднімається за життя
+FLOATING_TEXT_ALPHA_STEPS = 16  # Кроки прозорості спливаючого тексту
+FLOATING_TEXT_SPRITE_CACHE = 64 # Різних (текст, колір, розмір) у кеші спрайтів
 
 # Параметри стін
 WALL_THICKNESS = 3
@@ -97,18 +138,109 @@ ENABLE_BALL_TRAIL = True
 ENABLE_BRICK_GRADIENTS = True
 ENABLE_GLOWING_BALL = True
 ENABLE_ANIMATED_BACKGROUND = True
+ENABLE_POST_PROCESSING = True
+ENABLE_DYNAMIC_LIGHTING = True
+
+# Пресети якості (від найнижчого до найвищого). Прапорці ENABLE_* вище -
+# верхня межа: вимкнений прапорець вимикає ефект у всіх пресетах.
+# particle_budget - частка PARTICLE_BUDGET
+QUALITY_PRESETS = {
+    'low': {
+        'particles': False, 'ball_trail': False, 'brick_gradients': False,
+        'glowing_ball': False, 'animated_background': False, 'particle_budget': 0.0,
+        'post_processing': False, 'lighting': False,
+    },
+    'medium': {
+        'particles': True, 'ball_trail': True, 'brick_gradients': True,
+        'glowing_ball': False, 'animated_background': False, 'particle_budget': 0.4,
+        'post_processing': False, 'lighting': False,
+    },
+    'high': {
+        'particles': True, 'ball_trail': True, 'brick_gradients': True,
+        'glowing_ball': True, 'animated_background': True, 'particle_budget': 1.0,
+        'post_processing': True, 'lighting': True,
+    },
+}
+QUALITY_PRESET_ORDER = ('low', 'medium', 'high')
+DEFAULT_QUALITY_PRESET = 'high'
+
+# Адаптивний регулятор якості
+TARGET_FPS = 60
+QUALITY_ADAPTIVE = True
+QUALITY_SAMPLE_FRAMES = 60          # Кадрів в одному вікні вимірювання
+QUALITY_DOWNGRADE_RATIO = 0.9       # Навантаження (частка бюджету кадру), вище якого якість знижується
+QUALITY_UPGRADE_RATIO = 0.5         # Навантаження, нижче якого якість можна підвищити
+QUALITY_DOWNGRADE_WINDOWS = 2       # Важких вікон поспіль для зниження
+QUALITY_UPGRADE_WINDOWS = 10        # Легких вікон поспіль для підвищення
+QUALITY_CALIBRATION_FRAMES = 20     # Кадрів на пресет при стартовому калібруванні
+QUALITY_CALIBRATION_HEADROOM = 0.5  # Частка бюджету кадру, яку може зайняти малювання
+
+# Динамічна роздільність ігрового поля (HUD завжди в повній роздільності).
+# Під навантаженням спершу знижується роздільність, і лише на мінімумі - пресет якості
+DYNAMIC_RESOLUTION = True
+RENDER_SCALE_MIN = 0.5              # Мінімальна частка WINDOW_WIDTH x WINDOW_HEIGHT
+RENDER_SCALE_STEP = 0.125           # Крок зміни масштабу
+RENDER_SCALE_SAMPLE_FRAMES = 30     # Кадрів в одному вікні вимірювання
+RENDER_SCALE_UPGRADE_WINDOWS = 4    # Легких вікон поспіль для підвищення роздільності
+RENDER_SCALE_SMOOTH = False         # Білінійне збільшення (чіткіше, але дорожче)
+
+# Постобробка кадру (віньєтка, світіння, хроматична аберація) - у порядку
+# пріоритету, поки вміщується в бюджет. Поки світіння активне, м'ячі та
+# серця малюються без власних шарів світіння
+POSTFX_BUDGET_MS = 3.0              # Бюджет постобробки на кадр (мс)
+POSTFX_COST_SMOOTHING = 0.1         # Згладжування виміряної вартості ефекту
+POSTFX_RETRY_FRAMES = 60            # Пауза перед повторною спробою ефекту, що не вмістився
+POSTFX_MAX_RETRY_FRAMES = 1920      # Найдовша пауза (подвоюється після кожної невдачі)
+BLOOM_DOWNSAMPLE = 4                # Світіння рахується в 1/4 роздільності
+BLOOM_BLUR_FACTOR = 4               # Додаткове зменшення для розмиття
+BLOOM_THRESHOLD = 150               # Поріг яскравості каналу для світіння (0-255)
+BLOOM_INTENSITY = 0.8               # Множник світіння
+VIGNETTE_STRENGTH = 0.45            # Затемнення кутів кадру (0-1)
+CHROMATIC_ABERRATION_OFFSET = 2     # Зсув червоного/синього каналів (пікселі)
+
+# Динамічне освітлення: м'ячі та вибухи освітлюють цеглинки і фон
+LIGHT_MAP_DOWNSAMPLE = 4            # Карта світла в 1/4 роздільності поля
+LIGHT_MAP_SMOOTH = False            # Білінійне збільшення карти (м'якше, але втричі дорожче)
+LIGHT_AMBIENT = 180                 # Освітленість поля без джерел (0-255)
+LIGHT_MAX_ACTIVE = 12               # Максимум джерел світла за кадр (найяскравіші)
+LIGHT_INTENSITY_STEPS = 8           # Кроки яскравості в кеші спрайтів світла
+LIGHT_SPRITE_CACHE_SIZE = 128       # Спрайтів світла в кеші
+LIGHT_BALL_RADIUS = 130             # Радіус світла м'яча
+LIGHT_FIRE_BALL_RADIUS = 190        # Радіус світла вогняного м'яча
+LIGHT_FIRE_BALL_COLOR = (255, 140, 60)
+LIGHT_BURST_RADIUS = 110            # Радіус спалаху від знищеної цеглинки
+LIGHT_BURST_LIFETIME = 0.35         # Тривалість згасання спалаху (секунди)
 
 # Параметри частинок
 EXPLOSION_PARTICLES = 25
 EXPLOSION_SPEED_RANGE = (2, 8)
 PARTICLE_LIFETIME = 0.6
+PARTICLE_CAPACITY = 10000  # Ємність масивів системи частинок
+PARTICLE_COLOR_BITS = 3    # Біт на канал у кошиках кольору атласу спрайтів
+PARTICLE_ALPHA_STEPS = 16  # Кроки прозорості в атласі спрайтів
+PARTICLE_BUDGET = 4000     # Бюджет живих частинок (обмежує час кадру)
+PARTICLE_LOD_THRESHOLD = 0.6  # Частка ліміту емітера, з якої спалахи зменшуються
+
+# Пріоритети емітерів: частка бюджету, яку може заповнити кожен тип
+PARTICLE_EMITTER_SHARES = {
+    'sparkle': 1.0,    # Збір бонусу - найважливіший відгук
+    'explosion': 0.9,
+    'trail': 0.5,
+}
+
+# Ефект-примітиви (кільця ударних хвиль)
+EFFECT_MAX_PRIMITIVES = 256
+EFFECT_SPRITE_CACHE_SIZE = 512
+EFFECT_ANIMATION_STEPS = 24  # Кроки анімації, для яких кешуються спрайти
 
 # Параметри трейлу м'яча
 BALL_TRAIL_LENGTH = 7
 BALL_TRAIL_ENABLED = True
+TRAIL_MAX_BALLS = 64  # Максимум м'ячів зі слідом (розмір кільцевих буферів)
 
 # Параметри фону
 BACKGROUND_STARS = 100
+BACKGROUND_STAR_LAYERS = 3  # Шари паралаксу (розмір та швидкість зірки = номер шару)
 STAR_SPEED_MULTIPLIER = 1.0
 
 # Фізика
@@ -119,6 +251,7 @@ MAX_HORIZONTAL_BOUNCE_SPEED = 10
 # Система бонусів
 BONUS_DROP_CHANCE = 0.20  # 20% шанс випадання
 BONUS_FALL_SPEED = 3
+BONUS_POOL_SIZE = 64      # Скільки вільних об'єктів бонусів тримати для повторного використання
 ENABLE_BONUSES = True
 
 # Ефекти бонусів
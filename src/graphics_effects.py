@@ -4,6 +4,15 @@
 import pygame
 import math
 import random
+import numpy as np
+from viewport import IDENTITY
+from display_format import create_surface, make_static, register_cache
+from animation_strips import get_strip
+from game_config import BACKGROUND_STARS, BACKGROUND_STAR_LAYERS, STAR_SPEED_MULTIPLIER
+
+
+# Період пульсації тексту (синусоїда sin(t * 5))
+PULSING_TEXT_PERIOD = 2 * math.pi / 5
 
 
 def draw_gradient_rect(surface, rect, color_top, color_bottom):
@@ -103,48 +112,68 @@ def draw_brick_with_gradient(surface, rect, color):
     pygame.draw.line(surface, shadow_color, rect.topright, rect.bottomright, 2)
 
 
-def draw_glowing_ball(surface, rect, color, glow_radius=5):
-    """
-    Малює м'яч зі свіченням
-    
-    Args:
-        surface: Поверхня для малювання
-        rect: pygame.Rect об'єкт
-        color: Базовий колір м'яча
-        glow_radius: Радіус свічення
-    """
-    center_x = rect.centerx
-    center_y = rect.centery
-    radius = rect.width // 2
+# Спрайти м'ячів: (радіус, колір, радіус свічення) -> поверхня
+_ball_sprites = {}
+register_cache('balls', _ball_sprites)
+
+
+def _render_glowing_ball(radius, color, glow_radius):
+    """Рендерить спрайт м'яча зі свіченням (центр - посередині спрайта)"""
+    size = (radius + glow_radius) * 2
+    center = radius + glow_radius
+    sprite = create_surface((size, size), alpha=True)
     
-    # Малюємо свічення (кілька шарів з прозорістю)
+    # Свічення (кілька шарів з прозорістю)
     for i in range(glow_radius, 0, -1):
         alpha = int(50 * (1 - i / glow_radius))
-        glow_surface = pygame.Surface((radius * 2 + i * 2, radius * 2 + i * 2), pygame.SRCALPHA)
-        color_with_alpha = (*color, alpha)
-        pygame.draw.circle(glow_surface, color_with_alpha, 
-                          (radius + i, radius + i), radius + i)
-        surface.blit(glow_surface, (center_x - radius - i, center_y - radius - i))
+        glow_surface = create_surface((radius * 2 + i * 2, radius * 2 + i * 2), alpha=True)
+        pygame.draw.circle(glow_surface, (*color, alpha), (radius + i, radius + i), radius + i)
+        sprite.blit(glow_surface, (center - radius - i, center - radius - i))
     
-    # Малюємо основний м'яч з градієнтом
+    # Основний м'яч з радіальним градієнтом (світліше в центрі)
     for r in range(radius, 0, -1):
-        # Радіальний градієнт (світліше в центрі)
         ratio = r / radius
         gradient_color = tuple(int(c * ratio + 255 * (1 - ratio) * 0.3) for c in color)
-        pygame.draw.circle(surface, gradient_color, (center_x, center_y), r)
+        pygame.draw.circle(sprite, gradient_color, (center, center), r)
     
     # Блік (highlight)
-    highlight_x = center_x - radius // 3
-    highlight_y = center_y - radius // 3
+    highlight_x = center - radius // 3
+    highlight_y = center - radius // 3
     highlight_radius = radius // 3
     for r in range(highlight_radius, 0, -1):
         alpha = int(100 * (1 - r / highlight_radius))
-        highlight_surface = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA)
+        highlight_surface = create_surface((r * 2, r * 2), alpha=True)
         pygame.draw.circle(highlight_surface, (255, 255, 255, alpha), (r, r), r)
-        surface.blit(highlight_surface, (highlight_x - r, highlight_y - r))
+        sprite.blit(highlight_surface, (highlight_x - r, highlight_y - r))
+    return sprite
+
+
+def draw_glowing_ball(surface, rect, color, glow_radius=5):
+    """
+    Малює м'яч зі свіченням
+    
+    Спрайт рендериться один раз для кожного розміру, тож при малюванні
+    в нативній роздільності він будується вже в цільовому масштабі.
+    
+    Args:
+        surface: Поверхня для малювання
+        rect: pygame.Rect об'єкт (у пікселях surface)
+        color: Базовий колір м'яча
+        glow_radius: Радіус свічення
+    
+    Returns:
+        pygame.Rect: Область, яку зайняв м'яч зі свіченням
+    """
+    radius = rect.width // 2
+    key = (radius, tuple(color), glow_radius)
+    sprite = _ball_sprites.get(key)
+    if sprite is None:
+        sprite = make_static(_render_glowing_ball(radius, key[1], glow_radius))
+        _ball_sprites[key] = sprite
+    return surface.blit(sprite, (rect.centerx - radius - glow_radius, rect.centery - radius - glow_radius))
 
 
-def draw_3d_paddle(surface, rect, base_color=(200, 200, 200)):
+def draw_3d_paddle(surface, rect, base_color=(200, 200, 200), edge=2):
     """
     Малює платформу з 3D ефектом
     
@@ -152,6 +181,7 @@ def draw_3d_paddle(surface, rect, base_color=(200, 200, 200)):
         surface: Поверхня для малювання
         rect: pygame.Rect об'єкт
         base_color: Базовий колір платформи
+        edge: Товщина світлих/темних країв
     """
     # Градієнт зверху вниз
     color_top = lighten_color(base_color, 1.3)
@@ -160,21 +190,21 @@ def draw_3d_paddle(surface, rect, base_color=(200, 200, 200)):
     draw_gradient_rect(surface, rect, color_top, color_bottom)
     
     # Верхня світла смужка
-    highlight_rect = pygame.Rect(rect.left, rect.top, rect.width, 2)
+    highlight_rect = pygame.Rect(rect.left, rect.top, rect.width, edge)
     pygame.draw.rect(surface, lighten_color(base_color, 1.5), highlight_rect)
     
     # Нижня темна смужка
-    shadow_rect = pygame.Rect(rect.left, rect.bottom - 2, rect.width, 2)
+    shadow_rect = pygame.Rect(rect.left, rect.bottom - edge, rect.width, edge)
     pygame.draw.rect(surface, darken_color(base_color, 0.5), shadow_rect)
     
     # Бокові краї
     pygame.draw.line(surface, lighten_color(base_color, 1.4), 
-                    rect.topleft, rect.bottomleft, 2)
+                    rect.topleft, rect.bottomleft, edge)
     pygame.draw.line(surface, darken_color(base_color, 0.6), 
-                    rect.topright, rect.bottomright, 2)
+                    rect.topright, rect.bottomright, edge)
 
 
-def draw_neon_heart(surface, x, y, size, color):
+def draw_neon_heart(surface, x, y, size, color, glow=True):
     """
     Малює неонове серце
     
@@ -183,6 +213,10 @@ def draw_neon_heart(surface, x, y, size, color):
         x, y: Координати центру
         size: Розмір серця
         color: Колір серця
+        glow: False - без шарів світіння (його дає постобробка)
+    
+    Returns:
+        pygame.Rect: Область, яку зайняло серце зі світінням
     """
     # Точки серця (відносно центру 0,0)
     points = [
@@ -198,9 +232,9 @@ def draw_neon_heart(surface, x, y, size, color):
     shifted_points = [(p[0] + x, p[1] + y) for p in points]
     
     # Світіння (кілька шарів)
-    for i in range(3, 0, -1):
+    for i in range(3 if glow else 0, 0, -1):
         alpha = int(100 / i)
-        glow_surface = pygame.Surface((size * 4, size * 4), pygame.SRCALPHA)
+        glow_surface = create_surface((size * 4, size * 4), alpha=True)
         glow_points = [(p[0] - x + size * 2, p[1] - y + size * 2) for p in shifted_points]
         pygame.draw.polygon(glow_surface, (*color, alpha), glow_points, width=i*2)
         surface.blit(glow_surface, (x - size * 2, y - size * 2))
@@ -208,42 +242,76 @@ def draw_neon_heart(surface, x, y, size, color):
     # Основний контур
     pygame.draw.polygon(surface, color, shifted_points)
     pygame.draw.polygon(surface, (255, 255, 255), shifted_points, 2)
+    return pygame.Rect(x - size * 2, y - size * 2, size * 4, size * 4)
 
 
 class AnimatedBackground:
-    """Анімований фон з зірками"""
+    """
+    Анімований фон з зірками
+
+    Градієнт рендериться один раз, а зірки зберігаються у масивах NumPy
+    (по шарах паралаксу), тож оновлення та мерехтіння векторизовані,
+    а пікселі записуються через surfarray.
+    """
     
-    def __init__(self, width, height, num_stars=100):
+    def __init__(self, width, height, num_stars=BACKGROUND_STARS, num_layers=BACKGROUND_STAR_LAYERS):
         """
         Ініціалізація анімованого фону
         
         Args:
             width, height: Розміри екрану
             num_stars: Кількість зірок
+            num_layers: Кількість шарів паралаксу
         """
         self.width = width
         self.height = height
-        self.stars = []
+        self.num_layers = num_layers
         
-        # Створюємо зірки на різних шарах (parallax)
-        for _ in range(num_stars):
-            x = random.randint(0, width)
-            y = random.randint(0, height)
-            size = random.randint(1, 3)
-            speed = size * 0.1  # Більші зірки рухаються швидше
-            brightness = random.randint(150, 255)
-            twinkle_speed = random.uniform(0.5, 2.0)
-            twinkle_offset = random.uniform(0, math.pi * 2)
-            
-            self.stars.append({
-                'x': x,
-                'y': y,
-                'size': size,
-                'speed': speed,
-                'brightness': brightness,
-                'twinkle_speed': twinkle_speed,
-                'twinkle_offset': twinkle_offset
-            })
+        # Градієнтний фон (рендериться лише раз для кожного розміру)
+        self.gradients = {}
+        register_cache('background', self.gradients)
+        
+        # Зірки на різних шарах (далекі - дрібніші та повільніші)
+        self.rng = np.random.default_rng()
+        self.layer = self.rng.integers(0, num_layers, num_stars)
+        self.x = self.rng.uniform(0, width, num_stars)
+        self.y = self.rng.uniform(0, height, num_stars)
+        self.speed = (self.layer + 1) * 0.1 * STAR_SPEED_MULTIPLIER
+        self.brightness = self.rng.integers(150, 256, num_stars).astype(np.float32)
+        self.twinkle_speed = self.rng.uniform(0.5, 2.0, num_stars)
+        self.twinkle_offset = self.rng.uniform(0, math.pi * 2, num_stars)
+        
+        # Шаблони пікселів (диск) для кожного шару, по масштабах
+        self.stencils = {}
+        self.layer_indices = [np.flatnonzero(self.layer == layer) for layer in range(num_layers)]
+    
+    def _get_gradient(self, size):
+        """Повертає градієнт заданого розміру (рендериться при першому запиті)"""
+        gradient = self.gradients.get(size)
+        if gradient is None:
+            gradient = create_surface(size)
+            draw_gradient_rect(gradient, gradient.get_rect(), (10, 10, 30), (0, 0, 10))
+            self.gradients[size] = gradient
+        return gradient
+    
+    def _get_stencils(self, scale):
+        """Повертає шаблони зірок для кожного шару при заданому масштабі"""
+        stencils = self.stencils.get(scale)
+        if stencils is None:
+            stencils = [self._make_stencil((layer + 1) * scale) for layer in range(self.num_layers)]
+            self.stencils[scale] = stencils
+        return stencils
+    
+    @staticmethod
+    def _make_stencil(radius):
+        """Повертає зміщення пікселів диска заданого радіуса (до 1.5 - одна точка)"""
+        if radius < 1.5:
+            return np.zeros((1, 2), dtype=np.int32)
+        size = int(round(radius))
+        span = np.arange(-size, size + 1)
+        dx, dy = np.meshgrid(span, span, indexing='ij')
+        inside = dx * dx + dy * dy <= size * size
+        return np.stack((dx[inside], dy[inside]), axis=1).astype(np.int32)
     
     def update(self, dt):
         """
@@ -252,47 +320,59 @@ class AnimatedBackground:
         Args:
             dt: Час з попереднього кадру
         """
-        for star in self.stars:
-            star['y'] += star['speed'] * dt * 60
-            
-            # Якщо зірка виходить за межі, повертаємо її нагору
-            if star['y'] > self.height:
-                star['y'] = 0
-                star['x'] = random.randint(0, self.width)
-    
-    def draw(self, surface, time):
+        self.y += self.speed * dt * 60
+        
+        # Зірки, що вийшли за межі, повертаємо нагору
+        wrapped = self.y > self.height
+        count = np.count_nonzero(wrapped)
+        if count:
+            self.y[wrapped] = 0
+            self.x[wrapped] = self.rng.uniform(0, self.width, count)
+    
+    def draw(self, surface, time, viewport=IDENTITY, stars=True):
         """
         Малює фон з зірками
         
         Args:
             surface: Поверхня для малювання
             time: Поточний час (для мерехтіння)
+            viewport: Трансформація логічних координат у пікселі surface
+            stars: False - лише статичний градієнт (низька якість)
+        
+        Returns:
+            list: Прямокутники зірок (градієнт статичний, тож змінюються лише вони)
         """
-        # Градієнтний фон
-        color_top = (10, 10, 30)
-        color_bottom = (0, 0, 10)
+        area = viewport.to_screen_rect((0, 0, self.width, self.height))
+        surface.blit(self._get_gradient(area.size), area)
+        if not stars:
+            return []
         
-        for y in range(self.height):
-            ratio = y / self.height
-            r = int(color_top[0] * (1 - ratio) + color_bottom[0] * ratio)
-            g = int(color_top[1] * (1 - ratio) + color_bottom[1] * ratio)
-            b = int(color_top[2] * (1 - ratio) + color_bottom[2] * ratio)
-            pygame.draw.line(surface, (r, g, b), (0, y), (self.width, y))
+        # Ефект мерехтіння для всіх зірок одразу
+        twinkle = np.sin(time * self.twinkle_speed + self.twinkle_offset) * 0.3 + 0.7
+        brightness = (self.brightness * twinkle).astype(np.uint8)
+        xs = (viewport.offset_x + self.x * viewport.scale).astype(np.int32)
+        ys = (viewport.offset_y + self.y * viewport.scale).astype(np.int32)
         
-        # Малюємо зірки з мерехтінням
-        for star in self.stars:
-            # Ефект мерехтіння
-            twinkle = math.sin(time * star['twinkle_speed'] + star['twinkle_offset']) * 0.3 + 0.7
-            brightness = int(star['brightness'] * twinkle)
-            color = (brightness, brightness, brightness)
-            
-            x, y = int(star['x']), int(star['y'])
-            size = star['size']
-            
-            if size > 1:
-                pygame.draw.circle(surface, color, (x, y), size)
-            else:
-                surface.set_at((x, y), color)
+        # Пікселі пишемо напряму, тож межі (і clip) перевіряємо самі
+        bounds = area.clip(surface.get_clip())
+        rects = []
+        pixels = pygame.surfarray.pixels3d(surface)
+        try:
+            for stencil, indices in zip(self._get_stencils(viewport.scale), self.layer_indices):
+                extent = int(np.abs(stencil).max())
+                side = extent * 2 + 1
+                rects.extend(pygame.Rect(x - extent, y - extent, side, side)
+                             for x, y in zip(xs[indices].tolist(), ys[indices].tolist()))
+                
+                px = xs[indices, None] + stencil[None, :, 0]
+                py = ys[indices, None] + stencil[None, :, 1]
+                visible = ((px >= bounds.left) & (px < bounds.right) &
+                           (py >= bounds.top) & (py < bounds.bottom))
+                colors = np.broadcast_to(brightness[indices, None], px.shape)[visible]
+                pixels[px[visible], py[visible]] = colors[:, None]
+        finally:
+            del pixels
+        return rects
 
 
 def draw_shadow(surface, rect, offset=(2, 2), alpha=100):
@@ -306,14 +386,14 @@ def draw_shadow(surface, rect, offset=(2, 2), alpha=100):
         alpha: Прозорість тіні
     """
     shadow_rect = rect.move(offset)
-    shadow_surface = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
+    shadow_surface = create_surface((rect.width, rect.height), alpha=True)
     pygame.draw.rect(shadow_surface, (0, 0, 0, alpha), shadow_surface.get_rect())
     surface.blit(shadow_surface, shadow_rect.topleft)
 
 
 def draw_pulsing_text(surface, text, font, center_pos, color, time_val, scale_range=(1.0, 1.1)):
     """
-    Малює текст, що пульсує
+    Малює текст, що пульсує (кадр запеченої стрічки)
     
     Args:
         surface: Поверхня для малювання
@@ -323,30 +403,32 @@ def draw_pulsing_text(surface, text, font, center_pos, color, time_val, scale_ra
         color: Колір тексту
         time_val: Поточний час для анімації
         scale_range: Діапазон масштабування (min, max)
+    
+    Returns:
+        pygame.Rect: Область, яку зайняв текст разом зі світінням
     """
+    key = ('pulsing_text', text, font, tuple(color), tuple(scale_range))
+    strip = get_strip(key, PULSING_TEXT_PERIOD,
+                      lambda phase: _render_pulsing_text(text, font, color, phase, scale_range))
+    frame = strip.frame_at(time_val)
+    return surface.blit(frame, frame.get_rect(center=center_pos))
+
+
+def _render_pulsing_text(text, font, color, phase, scale_range):
+    """Рендерить один кадр пульсуючого тексту: світіння і текст на одній поверхні"""
     # Обчислюємо масштаб (синусоїда)
-    scale = scale_range[0] + (scale_range[1] - scale_range[0]) * (math.sin(time_val * 5) * 0.5 + 0.5)
+    scale = scale_range[0] + (scale_range[1] - scale_range[0]) * (math.sin(phase * 2 * math.pi) * 0.5 + 0.5)
     
-    # Рендеримо текст
+    # Рендеримо та масштабуємо текст
     text_surf = font.render(text, True, color)
-    
-    # Масштабуємо
     width = int(text_surf.get_width() * scale)
     height = int(text_surf.get_height() * scale)
     scaled_surf = pygame.transform.scale(text_surf, (width, height))
     
-    # Центруємо
-    rect = scaled_surf.get_rect(center=center_pos)
-    
-    # Малюємо тінь/світіння
+    # Світіння - трохи більший силует тексту, залитий кольором
     glow_surf = pygame.transform.scale(text_surf, (width + 4, height + 4))
-    glow_surf.set_alpha(100)
-    glow_rect = glow_surf.get_rect(center=center_pos)
-    
-    # Заливаємо світіння кольором
     glow_mask = pygame.mask.from_surface(glow_surf)
-    glow_colored = glow_mask.to_surface(setcolor=color, unsetcolor=(0,0,0,0))
-    glow_colored.set_alpha(100)
+    frame = glow_mask.to_surface(setcolor=(*color, 100), unsetcolor=(0, 0, 0, 0))
     
-    surface.blit(glow_colored, glow_rect)
-    surface.blit(scaled_surf, rect)
+    frame.blit(scaled_surf, scaled_surf.get_rect(center=frame.get_rect().center))
+    return frame
@@ -0,0 +1,110 @@
+"""
+Кешований шар HUD: панелі, що перемальовуються лише при зміні свого стану
+"""
+from viewport import Viewport, IDENTITY
+from display_format import register_source
+
+
+class HudPanel:
+    """Відрендерена панель HUD разом зі станом, з якого її намальовано"""
+    
+    def __init__(self, key, surface, pos):
+        """
+        Ініціалізація панелі
+        
+        Args:
+            key: Стан, з якого намальовано панель
+            surface: Поверхня панелі (None - панель порожня)
+            pos: Позиція панелі без зміщення viewport
+        """
+        self.key = key
+        self.surface = surface
+        self.pos = pos
+        self.rect = None
+
+
+class HudLayer:
+    """
+    Набір кешованих панелей HUD
+    
+    Кожна панель має ключ - усе, від чого залежить її вигляд (рахунок,
+    життя, залишок часу, квантований до HUD_COUNTDOWN_RATE тощо). Поки
+    ключ не змінився, панель лише копіюється на кадр одним blit.
+    """
+    
+    def __init__(self):
+        """Ініціалізація шару"""
+        self._panels = {}
+        self.redraws = 0
+        register_source('hud', self.iter_surfaces, self.invalidate)
+    
+    def draw_panel(self, surface, name, key, render, viewport=IDENTITY):
+        """
+        Виводить панель, перемальовуючи її лише при зміні ключа
+        
+        Args:
+            surface: Поверхня для малювання
+            name: Назва панелі
+            key: Стан панелі (порівнюється з попереднім)
+            render: Функція viewport -> (поверхня або None, позиція); отримує
+                трансформацію без зміщення
+            viewport: Трансформація логічних координат у пікселі surface
+        
+        Returns:
+            list: Області, що змінилися (стара та нова), або порожній список
+        """
+        return self.blit_panel(surface, self.update_panel(name, key, render, viewport), viewport)
+    
+    def update_panel(self, name, key, render, viewport=IDENTITY):
+        """
+        Перемальовує панель, якщо змінився її ключ (кадр не змінюється)
+        
+        Args:
+            name: Назва панелі
+            key: Стан панелі (порівнюється з попереднім)
+            render: Функція viewport -> (поверхня або None, позиція)
+            viewport: Трансформація логічних координат у пікселі кадру
+        
+        Returns:
+            tuple: (панель, чи змінилась, попередня область) для blit_panel()
+        """
+        key = (key, viewport.scale)
+        panel = self._panels.get(name)
+        changed = panel is None or panel.key != key
+        old_rect = panel.rect if panel is not None else None
+        if changed:
+            panel = HudPanel(key, *render(Viewport(viewport.scale)))
+            self._panels[name] = panel
+            self.redraws += 1
+        return panel, changed, old_rect
+    
+    @staticmethod
+    def blit_panel(surface, update, viewport=IDENTITY):
+        """
+        Копіює панель на кадр
+        
+        Args:
+            surface: Поверхня для малювання
+            update: Результат update_panel()
+            viewport: Трансформація логічних координат у пікселі surface
+        
+        Returns:
+            list: Області, що змінилися (стара та нова), або порожній список
+        """
+        panel, changed, old_rect = update
+        if panel.surface is None:
+            panel.rect = None
+        else:
+            panel.rect = surface.blit(panel.surface, (panel.pos[0] + viewport.offset_x,
+                                                      panel.pos[1] + viewport.offset_y))
+        if not changed:
+            return []
+        return [rect for rect in (old_rect, panel.rect) if rect]
+    
+    def invalidate(self):
+        """Усі панелі будуть перемальовані на наступному кадрі"""
+        self._panels.clear()
+    
+    def iter_surfaces(self):
+        """Пари (назва, поверхня) відрендерених панелей"""
+        return [(name, panel.surface) for name, panel in list(self._panels.items())]
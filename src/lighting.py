@@ -0,0 +1,194 @@
+"""
+Динамічне освітлення ігрового поля картою світла низької роздільності
+"""
+import numpy as np
+import pygame
+from collections import OrderedDict
+from dirty_rects import merge_rects
+from viewport import IDENTITY
+from display_format import create_surface, register_cache
+from game_config import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, LIGHT_MAP_DOWNSAMPLE, LIGHT_MAP_SMOOTH, LIGHT_AMBIENT, LIGHT_MAX_ACTIVE,
+    LIGHT_INTENSITY_STEPS, LIGHT_SPRITE_CACHE_SIZE, LIGHT_BURST_RADIUS, LIGHT_BURST_LIFETIME
+)
+
+
+def render_light(radius, color, intensity):
+    """
+    Рендерить спрайт джерела світла для адитивного накладання
+    
+    Args:
+        radius: Радіус у пікселях карти світла
+        color: Колір світла (R, G, B)
+        intensity: Яскравість у центрі (0-1)
+    
+    Returns:
+        pygame.Surface: Непрозорий спрайт, чорний на краях
+    """
+    size = radius * 2
+    offsets = np.arange(size) - radius + 0.5
+    distance = np.sqrt(offsets[:, None] ** 2 + offsets[None, :] ** 2)
+    falloff = np.clip(1.0 - distance / radius, 0.0, 1.0) ** 2 * intensity
+    
+    sprite = create_surface((size, size))
+    pygame.surfarray.blit_array(sprite, (falloff[:, :, None] * color).astype(np.uint8))
+    return sprite
+
+
+class LightBurst:
+    """Короткий спалах світла (вибух, знищена цеглинка)"""
+    
+    def __init__(self, x, y, color, radius, lifetime):
+        self.x = x
+        self.y = y
+        self.color = color
+        self.radius = radius
+        self.lifetime = lifetime
+        self.elapsed = 0.0
+    
+    @property
+    def intensity(self):
+        """Яскравість, що згасає за час життя"""
+        return max(0.0, 1.0 - self.elapsed / self.lifetime)
+
+
+class LightMap:
+    """
+    Карта світла, що множиться на сцену (BLEND_MULT)
+    
+    Карта має 1/LIGHT_MAP_DOWNSAMPLE роздільності поля: вона заливається
+    рівнем LIGHT_AMBIENT, а кожне джерело додає кешований спрайт спадання
+    (BLEND_ADD). Збільшуються й множаться на сцену лише освітлені області;
+    решта поля множиться на сталий рівень одним blit. Тож вартість росте з
+    кількістю джерел, а не з кількістю пікселів екрану. Джерел одночасно -
+    не більше LIGHT_MAX_ACTIVE, найяскравіші мають пріоритет.
+    """
+    
+    def __init__(self, downsample=LIGHT_MAP_DOWNSAMPLE, ambient=LIGHT_AMBIENT, max_lights=LIGHT_MAX_ACTIVE,
+                 smooth=LIGHT_MAP_SMOOTH):
+        """
+        Ініціалізація карти
+        
+        Args:
+            downsample: У скільки разів карта менша за поле
+            ambient: Рівень освітлення без джерел (0-255)
+            max_lights: Максимум джерел, що враховуються за кадр
+            smooth: True - білінійне збільшення карти (smoothscale)
+        """
+        self.downsample = downsample
+        self.smooth = smooth
+        self.ambient = ambient
+        self.max_lights = max_lights
+        self.enabled = True
+        self.bursts = []
+        self._sprites = OrderedDict()
+        register_cache('lights', self._sprites)
+        self._size = None
+    
+    def add_burst(self, x, y, color, radius=LIGHT_BURST_RADIUS, lifetime=LIGHT_BURST_LIFETIME):
+        """
+        Додає спалах світла
+        
+        Args:
+            x, y: Центр спалаху (логічні координати)
+            color: Колір світла
+            radius: Радіус освітлення
+            lifetime: Тривалість згасання (секунди)
+        """
+        if self.enabled:
+            self.bursts.append(LightBurst(x, y, color, radius, lifetime))
+    
+    def update(self, dt):
+        """Старіння спалахів"""
+        if not self.bursts:
+            return
+        for burst in self.bursts:
+            burst.elapsed += dt
+        self.bursts = [burst for burst in self.bursts if burst.elapsed < burst.lifetime]
+    
+    def clear(self):
+        """Прибирає всі спалахи"""
+        self.bursts.clear()
+    
+    def apply(self, surface, lights, viewport=IDENTITY):
+        """
+        Освітлює вже намальовану сцену
+        
+        Args:
+            surface: Поверхня зі сценою
+            lights: Постійні джерела [(x, y, колір, радіус, яскравість)]
+            viewport: Трансформація логічних координат у пікселі surface
+        
+        Returns:
+            list: Освітлені області (змінюються разом із джерелами)
+        """
+        area = viewport.to_screen_rect((0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)).clip(surface.get_rect())
+        if area.width <= 0 or area.height <= 0:
+            return []
+        self._allocate(area.size, surface)
+        ds = self.downsample
+        
+        # Карта: рівень без джерел плюс спрайти джерел
+        light_map = self._map
+        light_map.fill((self.ambient,) * 3)
+        small_rects = []
+        for x, y, color, radius, intensity in self._select_lights(lights):
+            sx, sy = viewport.to_screen_point(x, y)
+            radius = max(1, round(radius * viewport.scale / ds))
+            sprite = self._get_sprite(radius, color, intensity)
+            small_rects.append(light_map.blit(sprite, ((sx - area.x) // ds - radius, (sy - area.y) // ds - radius),
+                                              special_flags=pygame.BLEND_ADD))
+        
+        # Освітлені області: карта збільшується й множиться на сцену в запасній поверхні
+        local_area = pygame.Rect((0, 0), area.size)
+        scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+        lit = []
+        for small in merge_rects(small_rects, light_map.get_rect()):
+            full = pygame.Rect(small.x * ds, small.y * ds, small.width * ds, small.height * ds)
+            scale(light_map.subsurface(small), full.size, self._scratch.subsurface(full))
+            visible = full.clip(local_area)
+            self._scratch.blit(surface, visible, visible.move(area.topleft), special_flags=pygame.BLEND_MULT)
+            lit.append(visible)
+        
+        # Решта поля - сталий рівень, потім освітлені області поверх
+        surface.blit(self._ambient_surface, area, special_flags=pygame.BLEND_MULT)
+        rects = []
+        for visible in lit:
+            rects.append(surface.blit(self._scratch, visible.move(area.topleft), visible))
+        return rects
+    
+    def _select_lights(self, lights):
+        """Постійні джерела та спалахи, обмежені max_lights (найяскравіші)"""
+        candidates = list(lights) + [(burst.x, burst.y, burst.color, burst.radius, burst.intensity)
+                                     for burst in self.bursts]
+        if len(candidates) > self.max_lights:
+            candidates.sort(key=lambda light: light[3] * light[4], reverse=True)
+            del candidates[self.max_lights:]
+        return candidates
+    
+    def _get_sprite(self, radius, color, intensity):
+        """Повертає спрайт джерела з LRU кешу (яскравість квантується до LIGHT_INTENSITY_STEPS)"""
+        level = max(1, round(intensity * LIGHT_INTENSITY_STEPS))
+        key = (radius, tuple(color), level)
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            return sprite
+        
+        sprite = render_light(radius, key[1], level / LIGHT_INTENSITY_STEPS)
+        self._sprites[key] = sprite
+        if len(self._sprites) > LIGHT_SPRITE_CACHE_SIZE:
+            self._sprites.popitem(last=False)
+        return sprite
+    
+    def _allocate(self, size, template):
+        """Виділяє карту та допоміжні поверхні під розмір поля"""
+        if size == self._size:
+            return
+        self._size = size
+        ds = self.downsample
+        small_size = (-(-size[0] // ds), -(-size[1] // ds))
+        self._map = pygame.Surface(small_size, 0, template)
+        self._scratch = pygame.Surface((small_size[0] * ds, small_size[1] * ds), 0, template)
+        self._ambient_surface = pygame.Surface(size, 0, template)
+        self._ambient_surface.fill((self.ambient,) * 3)
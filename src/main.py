@@ -8,12 +8,25 @@ import sys
 import math
 import time
 from high_scores import HighScoreManager
-from particle_system import ParticleSystem, TrailEffect, ScreenShake
+from particle_system import ParticleSystem, TrailSystem, ScreenShake
 from graphics_effects import AnimatedBackground, draw_neon_heart
-from bonus_system import BonusManager
+from text_cache import render_text, get_digit_atlas
+from bonus_system import BonusManager, BonusType
+from notification_system import NotificationManager
 from sound_manager import SoundManager
 from brick_system import LevelManager
+from palette_bricks import PaletteBrickLayer
 from entities import Paddle, Ball
+from presentation import Presenter, ScaledLayer
+from texture_renderer import TexturePresenter
+from hud_layer import HudLayer
+from frozen_frame import FrozenFrame
+from post_processing import PostProcessor, Bloom
+from lighting import LightMap
+from display_format import create_surface, get_display_format, register_source
+from dirty_rects import DirtyRegions
+from quality import QualityGovernor, ResolutionScaler, load_machine_preset, save_machine_preset
+from viewport import Viewport, IDENTITY
 from states import (
     StateManager, MainMenuState, HighScoresState, PauseState,
     LevelTransitionState, GameOverState, PlayingState
@@ -28,9 +41,13 @@ from game_config import (
     INITIAL_LIVES, SCORE_PER_BRICK,
     FONT_SIZE, LARGE_FONT_SIZE,
     WALL_THICKNESS,
-    MUSIC_FILE, HIGH_SCORES_FILE,
+    MUSIC_FILE, HIGH_SCORES_FILE, QUALITY_FILE,
     MUSIC_VOLUME,
-    NEON_THEME, BASE_BALL_SPEED, MAX_BALL_SPEED, SPEED_INCREASE_PER_LEVEL
+    NEON_THEME, BASE_BALL_SPEED, MAX_BALL_SPEED, SPEED_INCREASE_PER_LEVEL,
+    RENDER_NATIVE_RESOLUTION, RENDER_BACKEND, DIRTY_RECTS_ENABLED,
+    PARTICLE_BUDGET, TARGET_FPS, QUALITY_PRESET_ORDER, QUALITY_ADAPTIVE, QUALITY_CALIBRATION_FRAMES,
+    DYNAMIC_RESOLUTION, PALETTE_BRICK_LAYER, HUD_COUNTDOWN_RATE,
+    LIGHT_BALL_RADIUS, LIGHT_FIRE_BALL_RADIUS, LIGHT_FIRE_BALL_COLOR, DISPLAY_FORMAT_AUDIT
 )
 
 WIDTH, HEIGHT = WINDOW_WIDTH, WINDOW_HEIGHT
@@ -58,17 +75,37 @@ class GameContext:
         # Вікно та режим
         self.is_fullscreen = True
         self.windowed_size = (WIDTH, HEIGHT)
-        self.win = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        pygame.display.set_caption("Арканоїд - Візуальна версія")
+        if RENDER_BACKEND == 'texture':
+            self.presenter = TexturePresenter(self.windowed_size)
+        elif RENDER_BACKEND == 'software':
+            self.presenter = Presenter(self.windowed_size)
+        else:
+            raise ValueError(f"Unknown render backend '{RENDER_BACKEND}'")
+        self.win = self.presenter.set_display_mode(self.is_fullscreen)
+        self.presenter.set_caption("Арканоїд - Візуальна версія")
+        get_display_format().refresh()
+        
+        # Канва спрайтів текстурного виводу на поточний кадр (None - спрайти малюються в кадр)
+        self.sprite_canvas = None
         
         # Менеджери
         self.high_score_manager = HighScoreManager(HIGH_SCORES_FILE)
         self.sound_manager = SoundManager()
         self.particle_system = ParticleSystem()
         self.screen_shake = ScreenShake()
-        self.ball_trail = TrailEffect(max_length=7)
-        self.background = AnimatedBackground(WIDTH, HEIGHT, num_stars=100)
+        self.ball_trail = TrailSystem()
+        self.background = AnimatedBackground(WIDTH, HEIGHT)
         self.bonus_manager = BonusManager()
+        self.notifications = NotificationManager()
+        self.quality_governor = QualityGovernor(adaptive=QUALITY_ADAPTIVE)
+        self.quality = self.quality_governor.settings
+        self.resolution_scaler = ResolutionScaler(adaptive=DYNAMIC_RESOLUTION)
+        self.playfield_layer = ScaledLayer()
+        self.brick_layer = PaletteBrickLayer() if PALETTE_BRICK_LAYER else None
+        self.hud = HudLayer()
+        self.post_processor = PostProcessor()
+        self.frozen_frame = FrozenFrame(self.post_processor.apply)
+        self.light_map = LightMap()
         
         # Параметри цеглинок
         total_bricks_width = (BRICK_COLS * BRICK_WIDTH) + ((BRICK_COLS - 1) * BRICK_PADDING if BRICK_COLS > 1 else 0)
@@ -106,8 +143,10 @@ class GameContext:
         self.start_time = time.time()
         self.current_time = 0
         
-        # Поверхня гри
-        self.game_surface = pygame.Surface((WIDTH, HEIGHT))
+        # Поверхня гри та змінені за кадр області
+        self.game_surface = create_surface((WIDTH, HEIGHT))
+        self.dirty_regions = DirtyRegions((WIDTH, HEIGHT))
+        register_source('frame', lambda: [('game', self.game_surface)], self._reset_frame)
         
         # Контроль виконання
         self.running = True
@@ -130,32 +169,124 @@ class GameContext:
     
     def toggle_fullscreen(self):
         """Перемикає повноекранний режим"""
-        if self.is_fullscreen:
-            self.win = pygame.display.set_mode(self.windowed_size)
-            self.is_fullscreen = False
-        else:
-            self.win = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-            self.is_fullscreen = True
-        pygame.display.set_caption("Арканоїд - Візуальна версія")
+        self.is_fullscreen = not self.is_fullscreen
+        self.win = self.presenter.set_display_mode(self.is_fullscreen)
+        # Новий режим може мати інший формат - кеші та буфери кадру приводяться до нього
+        get_display_format().refresh()
+        self.dirty_regions.invalidate()
+        self.presenter.set_caption("Арканоїд - Візуальна версія")
+    
+    def _reset_frame(self):
+        """Створює ігрову поверхню заново (у новому форматі дисплея)"""
+        self.game_surface = create_surface((WIDTH, HEIGHT))
     
     def get_display_transform(self):
-        """Повертає параметри трансформації для масштабування"""
-        if not self.is_fullscreen:
-            return 1.0, 0, 0
-        
-        screen_width, screen_height = self.win.get_size()
-        game_width, game_height = WIDTH, HEIGHT
-        
-        scale_x = screen_width / game_width
-        scale_y = screen_height / game_height
-        scale = min(scale_x, scale_y)
-        
-        scaled_width = game_width * scale
-        scaled_height = game_height * scale
-        offset_x = (screen_width - scaled_width) // 2
-        offset_y = (screen_height - scaled_height) // 2
+        """Повертає параметри трансформації для масштабування (кешовані)"""
+        return self.presenter.get_transform(self.win)
+    
+    def use_native_rendering(self, state):
+        """
+        Чи малювати кадр прямо у вікно в нативній роздільності
+        
+        Args:
+            state: Поточний стан гри
+        
+        Returns:
+            bool: True, якщо режим увімкнено, вікно повноекранне і стан це підтримує
+        """
+        return (RENDER_NATIVE_RESOLUTION and self.is_fullscreen and state.supports_native
+                and self.presenter.supports_native(self.win))
+    
+    def use_dirty_rects(self, state, shake_offset):
+        """
+        Чи можна вивести лише змінені області кадру
+        
+        Args:
+            state: Поточний стан гри
+            shake_offset: Зміщення тремтіння екрану
+        
+        Returns:
+            bool: True у віконному режимі без масштабу, тремтіння і для станів,
+                що повідомляють свої змінені області
+        """
+        return (DIRTY_RECTS_ENABLED and not self.is_fullscreen and state.supports_dirty_rects
+                and shake_offset == (0, 0) and self.resolution_scaler.at_max
+                and self.presenter.is_identity(self.win))
+    
+    def record_frame_time(self, work_ms):
+        """
+        Передає час роботи кадру регуляторам продуктивності
+        
+        Спершу змінюється роздільність ігрового поля; пресет якості
+        регулюється лише тоді, коли роздільність уже на межі.
+        
+        Args:
+            work_ms: Час оновлення та малювання кадру в мілісекундах
+        """
+        scaler = self.resolution_scaler
+        if scaler.record_frame(work_ms):
+            return
+        if (scaler.at_min or scaler.at_max) and self.quality_governor.record_frame(work_ms):
+            self.apply_quality(self.quality_governor.settings)
+    
+    def apply_quality(self, settings):
+        """
+        Застосовує налаштування якості до систем ефектів
+        
+        Args:
+            settings: QualitySettings
+        """
+        self.quality = settings
+        # Текстурний вивід накладає спрайти вже після кадру - постобробка їх не побачила б
+        self.post_processor.enabled = settings.post_processing and RENDER_BACKEND != 'texture'
+        self.light_map.enabled = settings.lighting
+        if not settings.lighting:
+            self.light_map.clear()
+        self.particle_system.configure(settings.particles, int(PARTICLE_BUDGET * settings.particle_budget))
+        if not settings.ball_trail:
+            self.ball_trail.clear()
+        self.dirty_regions.invalidate()
+    
+    def setup_quality(self):
+        """Вмикає збережений для цієї машини пресет або калібрує якість"""
+        preset = load_machine_preset(QUALITY_FILE)
+        if preset is None:
+            preset = self.calibrate_quality()
+            save_machine_preset(QUALITY_FILE, preset)
+        self.apply_quality(self.quality_governor.set_preset(preset))
+    
+    def calibrate_quality(self, frames=QUALITY_CALIBRATION_FRAMES):
+        """
+        Вимірює час малювання ігрової сцени для кожного пресету
+        
+        Кадри малюються у вікно без flip, тож калібрування непомітне.
+        
+        Args:
+            frames: Кількість кадрів на пресет
+        
+        Returns:
+            str: Найвищий пресет, що вміщується в бюджет кадру
+        """
+        self.initialize_game_data()
+        costs = {}
+        for preset in reversed(QUALITY_PRESET_ORDER):
+            self.apply_quality(self.quality_governor.set_preset(preset))
+            # Типове навантаження: кілька вибухів одночасно
+            for i in range(3):
+                self.particle_system.create_explosion(WIDTH * (i + 1) // 4, HEIGHT // 3, RED)
+            
+            start = time.perf_counter()
+            for _ in range(frames):
+                self.game_surface.fill(BLACK)
+                self.draw_game(self.game_surface)
+                self.post_processor.apply(self.game_surface)
+                self.presenter.present(self.win, self.game_surface)
+            costs[preset] = (time.perf_counter() - start) * 1000 / frames
         
-        return scale, offset_x, offset_y
+        self.particle_system.clear()
+        self.particle_system.reset_stats()
+        self.light_map.clear()
+        return self.quality_governor.choose_calibrated(costs)
     
     def initialize_game_data(self):
         """Ініціалізує дані для нової гри"""
@@ -180,7 +311,14 @@ class GameContext:
         
         self.bricks = self.level_manager.create_level(level_num)
         self.ball_trail.clear()
+        self.light_map.clear()
         self.bonus_manager.clear()
+        self.notifications.clear()
+        
+        # Анімовані ефекти запікаються тут, а не на першому кадрі рівня
+        for brick in self.bricks:
+            brick.bake_effects()
+        self.bonus_manager.bake_capsules()
     
     def reset_ball(self):
         """Скидає м'яч на початкову позицію"""
@@ -214,37 +352,137 @@ class GameContext:
             new_ball.set_velocity(new_vx, new_vy)
             self.balls.append(new_ball)
     
-    def render_ui(self, surface, font):
-        """Відрисовує UI"""
-        score_text = font.render(f"Рахунок: {self.score}", True, WHITE)
-        surface.blit(score_text, (10, 10))
+    def draw_game(self, surface, viewport=IDENTITY):
+        """
+        Малює ігрове поле та HUD
+        
+        Args:
+            surface: Поверхня для малювання
+            viewport: Трансформація логічних координат у пікселі surface
+        """
+        self.draw_playfield(surface, viewport)
+        self.render_ui(surface, viewport)
+    
+    def prepare_ui(self, viewport=IDENTITY):
+        """
+        Перемальовує панелі UI, стан яких змінився (кадр не змінюється)
         
-        level_text = font.render(f"Рівень: {self.level}", True, WHITE)
-        surface.blit(level_text, (10, 50))
+        Панель перемальовується лише тоді, коли змінився її стан; таймери
+        бонусів квантуються до HUD_COUNTDOWN_RATE оновлень на секунду.
         
-        # Відображення життів
-        if self.lives > 5:
-            draw_neon_heart(surface, WIDTH - 100, 30, 15, NEON_THEME['BUTTON_HOVER'])
-            lives_text = font.render(f"x {self.lives}", True, WHITE)
-            surface.blit(lives_text, (WIDTH - 70, 15))
-        else:
-            for i in range(self.lives):
-                heart_x = WIDTH - 40 - i * 40
-                draw_neon_heart(surface, heart_x, 30, 15, NEON_THEME['BUTTON_HOVER'])
+        Args:
+            viewport: Трансформація логічних координат у пікселі кадру
+        
+        Returns:
+            list: Оновлення панелей для HudLayer.blit_panel()
+        """
+        hud = self.hud
         
         # Індикатори бонусів
-        self.bonus_manager.draw_effects_ui(surface, WIDTH - 140, 60)
+        effects_key = tuple((effect.effect_type, int(effect.get_remaining_time() * HUD_COUNTDOWN_RATE))
+                            for effect in self.bonus_manager.active_effects)
         
         # Індикатор швидкості
         speed_percent = (self.current_speed_magnitude - BASE_BALL_SPEED) / (MAX_BALL_SPEED - BASE_BALL_SPEED)
         speed_percent = max(0.0, min(speed_percent, 1.0))
         
+        return [
+            hud.update_panel('score', self.score,
+                             lambda local: self._render_counter("Рахунок: ", self.score, (10, 10), local), viewport),
+            hud.update_panel('level', self.level,
+                             lambda local: self._render_counter("Рівень: ", self.level, (10, 50), local), viewport),
+            hud.update_panel('lives', (self.lives, self.post_processor.is_active(Bloom)),
+                             self._render_lives, viewport),
+            hud.update_panel('effects', effects_key, self._render_effects, viewport),
+            hud.update_panel('speed', speed_percent,
+                             lambda local: self._render_speed(speed_percent, local), viewport),
+        ]
+    
+    def render_ui(self, surface, viewport=IDENTITY):
+        """
+        Відрисовує UI з кешованих панелей
+        
+        Спершу перемальовуються змінені панелі (prepare_ui), потім усі
+        копіюються на кадр.
+        
+        Args:
+            surface: Поверхня для малювання
+            viewport: Трансформація логічних координат у пікселі surface
+        """
+        surface, viewport = self.get_sprite_target(surface, viewport)
+        for update in self.prepare_ui(viewport):
+            self.dirty_regions.add_all(self.hud.blit_panel(surface, update, viewport))
+    
+    @staticmethod
+    def _render_counter(label_text, value, pos, viewport):
+        """Панель з підписом та числом (наприклад, рахунок)"""
+        font_size = viewport.scale_length(FONT_SIZE)
+        label = render_text(label_text, font_size, WHITE)
+        digits = get_digit_atlas(font_size, WHITE)
+        text = str(value)
+        
+        panel = create_surface((label.get_width() + digits.get_width(text),
+                                max(label.get_height(), digits.height)), alpha=True)
+        panel.blit(label, (0, 0))
+        digits.draw(panel, text, (label.get_width(), 0))
+        return panel, viewport.to_screen_point(*pos)
+    
+    def _render_lives(self, viewport):
+        """Панель життів: неонові серця або серце з лічильником"""
+        heart_size = viewport.scale_length(15)
+        if self.lives > 5:
+            hearts = [WIDTH - 100]
+        else:
+            hearts = [WIDTH - 40 - i * 40 for i in range(self.lives)]
+        if not hearts:
+            return None, (0, 0)
+        
+        # Область панелі - світіння всіх сердець (і лічильник праворуч)
+        centers = [viewport.to_screen_point(heart_x, 30) for heart_x in hearts]
+        area = pygame.Rect(centers[-1][0] - heart_size * 2, centers[0][1] - heart_size * 2,
+                           centers[0][0] - centers[-1][0] + heart_size * 4, heart_size * 4)
+        if self.lives > 5:
+            area.width = viewport.to_screen_point(WIDTH, 0)[0] - area.x
+        
+        # Поки працює світіння постобробки, власне світіння сердець не потрібне
+        glow = not self.post_processor.is_active(Bloom)
+        panel = create_surface(area.size, alpha=True)
+        for x, y in centers:
+            draw_neon_heart(panel, x - area.x, y - area.y, heart_size, NEON_THEME['BUTTON_HOVER'], glow)
+        if self.lives > 5:
+            digits = get_digit_atlas(viewport.scale_length(FONT_SIZE), WHITE)
+            x, y = viewport.to_screen_point(WIDTH - 70, 15)
+            digits.draw(panel, f"x {self.lives}", (x - area.x, y - area.y))
+        return panel, area.topleft
+    
+    def _render_effects(self, viewport):
+        """Панель індикаторів активних бонусів"""
+        count = len(self.bonus_manager.active_effects)
+        if not count:
+            return None, (0, 0)
+        area = viewport.to_screen_rect((WIDTH - 140, 60, 120, count * 35))
+        panel = create_surface(area.size, alpha=True)
+        self.bonus_manager.draw_effects_ui(panel, WIDTH - 140, 60,
+                                           Viewport(viewport.scale, -area.x, -area.y))
+        return panel, area.topleft
+    
+    @staticmethod
+    def _render_speed(speed_percent, viewport):
+        """Панель індикатора швидкості м'яча"""
         bar_width = 100
         bar_height = 10
         bar_x = WIDTH - 120
         bar_y = HEIGHT - 20
         
-        pygame.draw.rect(surface, (50, 50, 50), (bar_x, bar_y, bar_width, bar_height))
+        speed_label = render_text("SPEED", viewport.scale_length(20), WHITE)
+        label_pos = viewport.to_screen_point(bar_x - 45, bar_y)
+        bar_rect = viewport.to_screen_rect((bar_x, bar_y, bar_width, bar_height))
+        area = bar_rect.union(speed_label.get_rect(topleft=label_pos))
+        
+        panel = create_surface(area.size, alpha=True)
+        local = Viewport(viewport.scale, -area.x, -area.y)
+        bar_rect.move_ip(-area.x, -area.y)
+        pygame.draw.rect(panel, (50, 50, 50), bar_rect)
         
         red_comp = int(255 * speed_percent)
         green_comp = int(255 * (1 - speed_percent))
@@ -252,39 +490,119 @@ class GameContext:
         
         fill_width = int(bar_width * speed_percent)
         if fill_width > 0:
-            pygame.draw.rect(surface, fill_color, (bar_x, bar_y, fill_width, bar_height))
+            pygame.draw.rect(panel, fill_color, local.to_screen_rect((bar_x, bar_y, fill_width, bar_height)))
         
-        pygame.draw.rect(surface, WHITE, (bar_x, bar_y, bar_width, bar_height), 1)
+        pygame.draw.rect(panel, WHITE, bar_rect, viewport.scale_length(1))
+        panel.blit(speed_label, (label_pos[0] - area.x, label_pos[1] - area.y))
+        return panel, area.topleft
+    
+    def draw_playfield(self, surface, viewport=IDENTITY):
+        """
+        Малює ігрове поле у внутрішній роздільності регулятора
+        
+        При масштабі менше 1.0 поле малюється у зменшену поверхню, яка
+        потім збільшується в область поля на surface. Ігрові координати
+        лишаються логічними - змінюється лише трансформація.
+        
+        Args:
+            surface: Поверхня для малювання
+            viewport: Трансформація логічних координат у пікселі surface
+        """
+        render_scale = self.resolution_scaler.scale
+        if render_scale >= 1.0:
+            self.draw_game_background(surface, viewport)
+            return
         
-        speed_label = pygame.font.Font(None, 20).render("SPEED", True, WHITE)
-        surface.blit(speed_label, (bar_x - 45, bar_y))
+        area = viewport.to_screen_rect((0, 0, WIDTH, HEIGHT))
+        size = (max(1, round(area.width * render_scale)), max(1, round(area.height * render_scale)))
+        internal = self.playfield_layer.get_surface(size, surface)
+        self.draw_game_background(internal, Viewport(size[0] / WIDTH))
+        self.playfield_layer.present(surface, area)
+    
+    def get_sprite_target(self, surface, viewport):
+        """
+        Куди малювати спрайтові шари: у канву текстурного виводу, якщо вона є
+        
+        Args:
+            surface: Поверхня кадру
+            viewport: Трансформація логічних координат у пікселі surface
+        
+        Returns:
+            tuple: (поверхня або канва, її трансформація)
+        """
+        canvas = self.sprite_canvas
+        if canvas is None:
+            return surface, viewport
+        return canvas, canvas.viewport
+    
+    def get_lights(self):
+        """
+        Постійні джерела світла - м'ячі
+        
+        Returns:
+            list: Джерела (x, y, колір, радіус, яскравість) для LightMap
+        """
+        if self.bonus_manager.has_active_effect(BonusType.FIRE_BALL):
+            color, radius = LIGHT_FIRE_BALL_COLOR, LIGHT_FIRE_BALL_RADIUS
+        else:
+            color, radius = None, LIGHT_BALL_RADIUS
+        return [(ball.rect.centerx, ball.rect.centery, color or ball.color, radius, 1.0)
+                for ball in self.balls]
     
-    def draw_game_background(self, surface):
-        """Малює фон гри з цеглинками та об'єктами"""
-        self.background.draw(surface, self.current_time)
+    def draw_game_background(self, surface, viewport=IDENTITY):
+        """
+        Малює фон гри з цеглинками та об'єктами
+        
+        Кожен шар повідомляє змінені області у self.dirty_regions.
+        
+        Args:
+            surface: Поверхня для малювання
+            viewport: Трансформація логічних координат у пікселі surface
+        """
+        dirty = self.dirty_regions
+        quality = self.quality
+        sprites, sprite_viewport = self.get_sprite_target(surface, viewport)
+        dirty.add_all(self.background.draw(surface, self.current_time, viewport,
+                                           stars=quality.animated_background))
         
         # Стіни
-        pygame.draw.rect(surface, WHITE, (0, 0, WALL_THICKNESS, HEIGHT))
-        pygame.draw.rect(surface, WHITE, (WIDTH - WALL_THICKNESS, 0, WALL_THICKNESS, HEIGHT))
-        pygame.draw.rect(surface, WHITE, (0, 0, WIDTH, WALL_THICKNESS))
+        for wall in ((0, 0, WALL_THICKNESS, HEIGHT),
+                     (WIDTH - WALL_THICKNESS, 0, WALL_THICKNESS, HEIGHT),
+                     (0, 0, WIDTH, WALL_THICKNESS)):
+            pygame.draw.rect(surface, WHITE, viewport.to_screen_rect(wall))
         
         # Цеглинки
-        for brick in self.bricks:
-            brick.update(self.clock.get_time() / 1000.0)
-            brick.draw(surface, self.current_time)
+        if self.brick_layer is not None:
+            dirty.add_all(self.brick_layer.draw(surface, self.bricks, self.current_time, viewport,
+                                                gradient=quality.brick_gradients))
+        else:
+            for brick in self.bricks:
+                dirty.add(brick.draw(surface, self.current_time, viewport, gradient=quality.brick_gradients))
+        
+        # Світло м'ячів і вибухів падає на фон та цеглинки
+        if quality.lighting:
+            dirty.add_all(self.light_map.apply(surface, self.get_lights(), viewport))
         
         # Трейл, платформа, м'ячі
-        self.ball_trail.draw(surface, RED, BALL_RADIUS)
-        self.paddle.draw(surface)
+        if quality.ball_trail:
+            dirty.add_all(self.ball_trail.draw(surface, RED, BALL_RADIUS, viewport))
+        dirty.add(self.paddle.draw(surface, viewport))
         
+        # Далі - лише спрайти з кешів (у текстурному виводі - копії текстур)
+        # Світіння м'ячів дає постобробка, якщо вона активна
+        glow = quality.glowing_ball and not self.post_processor.is_active(Bloom)
         for ball in self.balls:
-            ball.draw(surface)
+            dirty.add(ball.draw(sprites, sprite_viewport, glow=glow))
         
         # Бонуси
-        self.bonus_manager.draw_bonuses(surface, self.current_time)
+        dirty.add_all(self.bonus_manager.draw_bonuses(sprites, self.current_time, sprite_viewport))
         
         # Частинки
-        self.particle_system.draw(surface)
+        if quality.particles:
+            dirty.add_all(self.particle_system.draw(sprites, sprite_viewport))
+        
+        # Спливаючі очки та назви бонусів
+        dirty.add_all(self.notifications.draw(sprites, sprite_viewport))
 
 
 # =============================================================================
@@ -293,8 +611,9 @@ class GameContext:
 
 def main():
     """Головна функція гри"""
-    # Створюємо контекст гри
+    # Створюємо контекст гри та обираємо якість для цієї машини
     ctx = GameContext()
+    ctx.setup_quality()
     
     # Створюємо state manager
     state_manager = StateManager(ctx)
@@ -312,14 +631,21 @@ def main():
     
     # Головний цикл
     while ctx.running:
-        dt = ctx.clock.tick(60) / 1000.0
+        dt = ctx.clock.tick(TARGET_FPS) / 1000.0
         ctx.current_time = time.time() - ctx.start_time
         
+        # Регулятори бачать лише час роботи кадру, без очікування
+        ctx.record_frame_time(ctx.clock.get_rawtime())
+        
         # Обробка подій
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 ctx.running = False
             
+            # Відкрита заново частина вікна - наступний кадр виводиться повністю
+            if event.type == pygame.WINDOWEXPOSED:
+                ctx.dirty_regions.invalidate()
+            
             # F11 - перемикання повноекранного режиму
             if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
                 ctx.toggle_fullscreen()
@@ -328,39 +654,70 @@ def main():
             state_manager.handle_event(event)
         
         # Оновлюємо фон та ефекти
-        ctx.background.update(dt)
+        if ctx.quality.animated_background:
+            ctx.background.update(dt)
         ctx.screen_shake.update(dt)
         ctx.particle_system.update(dt)
+        ctx.light_map.update(dt)
         ctx.bonus_manager.update(dt)
+        ctx.notifications.update(dt)
         
         # Оновлюємо поточний стан
         new_state = state_manager.current_state.update(dt)
         if new_state:
             state_manager.change_state(new_state)
         
-        # Очищаємо поверхню
-        ctx.game_surface.fill(BLACK)
-        
-        # Малюємо поточний стан
-        state_manager.draw(ctx.game_surface)
-        
-        # Застосовуємо screen shake
-        offset_x, offset_y = ctx.screen_shake.get_offset()
-        
-        # Масштабування для повноекранного режиму
-        scale, display_offset_x, display_offset_y = ctx.get_display_transform()
-        
-        if ctx.is_fullscreen and scale != 1.0:
-            scaled_surface = pygame.transform.scale(
-                ctx.game_surface,
-                (int(WIDTH * scale), int(HEIGHT * scale))
-            )
-            ctx.win.fill(BLACK)
-            ctx.win.blit(scaled_surface, (display_offset_x + offset_x, display_offset_y + offset_y))
+        state = state_manager.current_state
+        shake_offset = ctx.screen_shake.get_offset()
+        native = ctx.use_native_rendering(state)
+        if native:
+            # Малюємо прямо у вікно з трансформацією світ -> екран
+            viewport = ctx.presenter.begin_native_frame(ctx.win, shake_offset)
+            state_manager.draw(ctx.win, viewport)
+            ctx.presenter.end_native_frame(ctx.win)
         else:
-            ctx.win.blit(ctx.game_surface, (offset_x, offset_y))
-        
-        pygame.display.flip()
+            # Очищаємо поверхню (знімок гри під оверлеєм перекриває її повністю)
+            if not state.overlay:
+                ctx.game_surface.fill(BLACK)
+            
+            # Текстурний вивід накладає спрайти ігрового процесу окремо від кадру
+            ctx.sprite_canvas = (ctx.presenter.begin_canvas(ctx.win, shake_offset)
+                                 if state.supports_native else None)
+            
+            # Малюємо поточний стан
+            state_manager.draw(ctx.game_surface)
+            ctx.sprite_canvas = None
+        
+        # Постобробка кадру (у нативній роздільності - лише ігрової області вікна);
+        # дорожчі ефекти відсікає бюджет, а знімок під оверлеєм її вже містить
+        if state.overlay:
+            postfx_local = True
+        elif native:
+            area = viewport.to_screen_rect((0, 0, WIDTH, HEIGHT)).clip(ctx.win.get_rect())
+            postfx_local = ctx.post_processor.apply(ctx.win.subsurface(area))
+        else:
+            postfx_local = ctx.post_processor.apply(ctx.game_surface)
+        
+        # Виводимо лише змінені області, а якщо змінилось багато - весь кадр
+        dirty_rects = ctx.dirty_regions.end_frame(
+            not native and postfx_local and ctx.use_dirty_rects(state, shake_offset))
+        # Оверлей, у якому нічого не змінилось, не виводиться - у вікні вже той самий кадр
+        idle = state.overlay and ctx.dirty_regions.idle and shake_offset == (0, 0)
+        if dirty_rects is None and not idle:
+            if not native:
+                # Кадр з урахуванням screen shake та масштабування
+                ctx.presenter.present(ctx.win, ctx.game_surface, shake_offset)
+            ctx.presenter.flip()
+        elif dirty_rects:
+            ctx.presenter.present_rects(ctx.win, ctx.game_surface, dirty_rects)
+            ctx.presenter.flip_rects(dirty_rects)
+        
+        # Налагодження: спрайти не у форматі дисплея
+        if DISPLAY_FORMAT_AUDIT:
+            get_display_format().audit()
+    
+    # Запам'ятовуємо якість, на якій зупинився регулятор
+    save_machine_preset(QUALITY_FILE, ctx.quality_governor.preset)
     
     pygame.quit()
     sys.exit()
@@ -2,51 +2,238 @@
 Notification System - Manages floating text and temporary messages
 """
 import pygame
-from ui_components import FloatingText
-from game_config import YELLOW, CYAN, GREEN, MAGENTA, WHITE
+import numpy as np
+from collections import OrderedDict
+from text_cache import render_text
+from viewport import IDENTITY
+from game_config import (
+    YELLOW, CYAN, GREEN, MAGENTA, WHITE,
+    FLOATING_TEXT_CAPACITY, FLOATING_TEXT_LIFETIME, FLOATING_TEXT_RISE,
+    FLOATING_TEXT_ALPHA_STEPS, FLOATING_TEXT_SPRITE_CACHE
+)
+
+
+class FloatingTextPool:
+    """
+    Пул спливаючих текстів фіксованої ємності
+    
+    Як і ParticleSystem, пул - це структура масивів NumPy: живі тексти
+    займають перші self.count елементів, рух і затухання рахуються
+    векторно. Кожен різний (текст, колір, розмір) растеризується один раз,
+    а для кроків прозорості зберігаються копії з уже помноженою альфою
+    (premultiplied) - такі копіюються найшвидшим шляхом змішування, і всі
+    тексти малюються одним викликом blits(). Якщо пул заповнений, новий
+    текст витісняє найстаріший.
+    
+    Спрайтів - не більше max_sprites (LRU). Коли витісняється давно не
+    вживаний текст, разом з ним зникають його живі копії - вони старші за
+    всі тексти, що з'являлись пізніше.
+    
+    Кроки прозорості слота растеризуються в масштабі, у якому слот
+    малюється, тож фактичний ключ спрайтів - (текст, колір, розмір,
+    масштаб). Растеризація лінива: у draw() і лише для слотів живих
+    текстів, тому зміна масштабу не перемальовує весь кеш одразу.
+    """
+    
+    def __init__(self, capacity=FLOATING_TEXT_CAPACITY, lifetime=FLOATING_TEXT_LIFETIME,
+                 rise=FLOATING_TEXT_RISE, alpha_steps=FLOATING_TEXT_ALPHA_STEPS,
+                 max_sprites=FLOATING_TEXT_SPRITE_CACHE):
+        """
+        Ініціалізація пулу
+        
+        Args:
+            capacity: Максимальна кількість одночасно живих текстів
+            lifetime: Час життя тексту (секунди)
+            rise: Підйом тексту за час життя (пікселі)
+            alpha_steps: Кількість кроків прозорості
+            max_sprites: Скільки різних текстів тримати в кеші спрайтів
+        """
+        self.capacity = capacity
+        self.lifetime = lifetime
+        self.rise = rise
+        self.alpha_steps = alpha_steps
+        self.max_sprites = max_sprites
+        self.count = 0
+        
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.elapsed = np.zeros(capacity, dtype=np.float32)
+        self.sprite = np.zeros(capacity, dtype=np.int32)
+        
+        # Спрайти: ключ -> слот (LRU); для слота - ключ, кроки прозорості, половина
+        # розміру та масштаб, у якому їх растеризовано (0 - ще не растеризовано)
+        self._slots = OrderedDict()
+        self._keys = [None] * max_sprites
+        self._variants = [None] * max_sprites
+        self._half_sizes = np.zeros((max_sprites, 2), dtype=np.int32)
+        self._scales = np.zeros(max_sprites, dtype=np.float64)
+    
+    def add(self, x, y, text, color, font_size):
+        """
+        Додає спливаючий текст
+        
+        Args:
+            x, y: Центр тексту в момент появи
+            text: Рядок тексту
+            color: Колір тексту (R, G, B)
+            font_size: Розмір шрифту
+        """
+        if self.count == self.capacity:
+            # Витісняємо найстаріший (живі тексти впорядковані за віком)
+            for array in (self.pos, self.elapsed, self.sprite):
+                array[:-1] = array[1:]
+            self.count -= 1
+        sprite = self._get_sprite((text, tuple(color), font_size))
+        
+        i = self.count
+        self.pos[i] = (x, y)
+        self.elapsed[i] = 0.0
+        self.sprite[i] = sprite
+        self.count += 1
+    
+    def update(self, dt):
+        """
+        Старіння текстів і ущільнення пулу
+        
+        Args:
+            dt: Час з попереднього кадру (в секундах)
+        """
+        n = self.count
+        if n == 0:
+            return
+        self.elapsed[:n] += dt
+        self._keep(self.elapsed[:n] < self.lifetime)
+    
+    def _keep(self, alive):
+        """Ущільнює пул, лишаючи тексти з маскою alive (порядок за віком зберігається)"""
+        n = self.count
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count < n:
+            for array in (self.pos, self.elapsed, self.sprite):
+                array[:alive_count] = array[:n][alive]
+            self.count = alive_count
+    
+    def draw(self, surface, viewport=IDENTITY):
+        """
+        Малює всі тексти одним викликом blits()
+        
+        Args:
+            surface: Поверхня для малювання
+            viewport: Трансформація логічних координат у пікселі surface
+        
+        Returns:
+            list: Одна спільна змінена область (або порожній список)
+        """
+        n = self.count
+        if n == 0:
+            return []
+        sprites = self.sprite[:n]
+        
+        # Слоти, ще не растеризовані в цьому масштабі, - лише серед живих текстів
+        stale = sprites[self._scales[sprites] != viewport.scale]
+        for slot in np.unique(stale).tolist():
+            self._render_sprite(slot, viewport.scale)
+        
+        life_ratio = self.elapsed[:n] / self.lifetime
+        alpha_keys = np.minimum((1 - life_ratio) * self.alpha_steps, self.alpha_steps - 1).astype(np.int32)
+        centers = self.pos[:n].copy()
+        centers[:, 1] -= life_ratio * self.rise
+        centers = centers * viewport.scale + (viewport.offset_x, viewport.offset_y)
+        half_sizes = self._half_sizes[sprites]
+        corners = centers.astype(np.int32) - half_sizes
+        
+        variants = self._variants
+        surface.blits([(variants[sprite][alpha], corner, None, pygame.BLEND_PREMULTIPLIED)
+                       for sprite, alpha, corner in zip(sprites.tolist(), alpha_keys.tolist(), corners.tolist())],
+                      doreturn=False)
+        
+        far_corners = corners + half_sizes * 2
+        left, top = corners.min(axis=0).tolist()
+        right, bottom = far_corners.max(axis=0).tolist()
+        return [pygame.Rect(left, top, right - left, bottom - top)]
+    
+    def clear(self):
+        """Прибирає всі тексти"""
+        self.count = 0
+    
+    def _get_sprite(self, key):
+        """Повертає слот спрайта (текст растеризується при першому малюванні)"""
+        slot = self._slots.get(key)
+        if slot is not None:
+            self._slots.move_to_end(key)
+            return slot
+        
+        if len(self._slots) >= self.max_sprites:
+            # Слот давно не вживаного тексту переходить новому разом із його живими копіями
+            slot = self._slots.popitem(last=False)[1]
+            self._keep(self.sprite[:self.count] != slot)
+        else:
+            slot = len(self._slots)
+        self._slots[key] = slot
+        self._keys[slot] = key
+        self._scales[slot] = 0.0
+        return slot
+    
+    def _render_sprite(self, slot, scale):
+        """Растеризує кроки прозорості тексту слота в заданому масштабі"""
+        text, color, font_size = self._keys[slot]
+        base = render_text(text, max(1, round(font_size * scale)), color)
+        variants = []
+        for step in range(self.alpha_steps):
+            # Альфа кроку вмножується в пікселі копії - спільна поверхня кешу не змінюється
+            alpha = min(255, int((step + 0.5) * 256 / self.alpha_steps))
+            variant = base.copy()
+            variant.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+            variants.append(variant.premul_alpha())
+        
+        self._variants[slot] = variants
+        self._half_sizes[slot] = (base.get_width() // 2, base.get_height() // 2)
+        self._scales[slot] = scale
 
 
 class NotificationManager:
     """Manages all notifications and floating texts"""
     
     def __init__(self):
-        self.floating_texts = []
+        self.floating_texts = FloatingTextPool()
         self.notifications = []
-        
+    
     def add_floating_text(self, x, y, text, color=YELLOW, font_size=36):
         """Додає спливаючий текст"""
-        floating = FloatingText(x, y, text, color, font_size)
-        self.floating_texts.append(floating)
-        
+        self.floating_texts.add(x, y, text, color, font_size)
+    
     def add_score_popup(self, x, y, points):
         """Додає попап з очками"""
         text = f"+{points}"
         color = GREEN if points >= 100 else YELLOW
         self.add_floating_text(x, y, text, color, 42)
-        
+    
     def add_combo_popup(self, x, y, combo):
         """Додає попап комбо"""
         if combo >= 5:
             text = f"КОМБО x{combo}!"
             self.add_floating_text(x, y, text, MAGENTA, 48)
-        
+    
     def add_bonus_popup(self, x, y, bonus_name):
         """Додає попап активації бонусу"""
         self.add_floating_text(x, y, bonus_name, CYAN, 40)
-        
+    
     def update(self, dt):
         """Оновлює всі нотифікації"""
-        # Оновлюємо всі спливаючі тексти
-        for text in self.floating_texts[:]:
-            text.update(dt)
-            if not text.active:
-                self.floating_texts.remove(text)
-                
-    def draw(self, surface):
-        """Малює всі нотифікації"""
-        for text in self.floating_texts:
-            text.draw(surface)
-            
+        self.floating_texts.update(dt)
+    
+    def draw(self, surface, viewport=IDENTITY):
+        """
+        Малює всі нотифікації
+        
+        Args:
+            surface: Поверхня для малювання
+            viewport: Трансформація логічних координат у пікселі surface
+        
+        Returns:
+            list: Змінені області
+        """
+        return self.floating_texts.draw(surface, viewport)
+    
     def clear(self):
         """Очищає всі нотифікації"""
         self.floating_texts.clear()
@@ -0,0 +1,300 @@
+"""
+Палітровий (8-бітний) шар цеглинок
+
+Цеглинки малюються в 8-бітну поверхню один раз і перемальовуються лише
+тоді, коли змінилися (удар, руйнування, тремтіння). Анімація кольорів -
+веселкова обводка бонусних цеглинок, пульсація вибухових та неонових
+рядів - виконується зміною палітри через set_palette, без жодного
+перемальовування пікселів. Шар займає чверть пам'яті 32-бітного.
+"""
+import math
+import pygame
+from brick_system import (
+    BrickType, BRICK_COLORS, EXPLOSIVE_PULSE_PERIOD, BONUS_RAINBOW_PERIOD, rainbow_color
+)
+from text_cache import get_font
+from display_format import register_source
+from viewport import Viewport, IDENTITY
+from game_config import PALETTE_RAMP_SHADES, PALETTE_NEON_PULSE, PALETTE_NEON_PERIOD
+
+
+# Фіксовані індекси палітри
+TRANSPARENT_INDEX = 0  # Колірний ключ
+EXPLOSIVE_INDEX = 1    # Пульсуюча обводка вибухових цеглинок
+RAINBOW_INDEX = 2      # Веселкова обводка та зірочка бонусних цеглинок
+FIRST_RAMP_INDEX = 7   # Далі - відтінки кольорів цеглинок
+
+# Кольори, з якими індекси малюються (палітра при малюванні має бути саме такою).
+# Білий, метал, болти та тріщини - кольори з методів Brick.
+FIXED_COLORS = (
+    (0, 0, 0),
+    (255, 35, 0),
+    (255, 0, 0),
+    (255, 255, 255),
+    (100, 100, 120),
+    (60, 60, 80),
+    (50, 50, 50),
+)
+
+NEON_COLORS = BRICK_COLORS[BrickType.NORMAL]['row_colors']
+
+
+def ramp_colors(color, shades, brightness=1.0):
+    """
+    Відтінки одного кольору цеглинки так, як їх малює Brick.draw_static
+    
+    Args:
+        color: Колір цеглинки (R, G, B)
+        shades: Кількість відтінків градієнта
+        brightness: Множник яскравості
+    
+    Returns:
+        list: Відтінки градієнта зверху вниз, потім основний колір,
+            світла та темна грані
+    """
+    color_top = [min(255, int(c * 1.3)) for c in color]
+    color_bottom = [int(c * 0.7) for c in color]
+    colors = []
+    for shade in range(shades):
+        ratio = (shade + 0.5) / shades
+        colors.append([top * (1 - ratio) + bottom * ratio for top, bottom in zip(color_top, color_bottom)])
+    colors.append(color)
+    colors.append([min(255, int(c * 1.5)) for c in color])
+    colors.append([int(c * 0.5) for c in color])
+    return [tuple(min(255, int(c * brightness)) for c in entry) for entry in colors]
+
+
+class PaletteBrickLayer:
+    """
+    8-бітний шар цеглинок з анімацією кольорів через палітру
+    
+    Шар навмисно не у форматі дисплея: кольори анімуються палітрою, тож
+    перетворення при blit - його ціна. Він зареєстрований лише для
+    перевірки формату (DISPLAY_FORMAT_AUDIT).
+    """
+    
+    def __init__(self, shades=PALETTE_RAMP_SHADES):
+        """
+        Ініціалізація шару
+        
+        Args:
+            shades: Кількість відтінків градієнта на один колір
+        """
+        self.shades = shades
+        self.ramp_size = shades + 3
+        self.surface = None
+        self.origin = (0, 0)
+        self.palette = []
+        self.ramps = {}
+        self._bricks = None
+        self._key = None
+        self._rects = {}
+        self._shaking = set()
+        self._animated_rect = None
+        self._neon_ramps = {}
+        register_source('palette', self.iter_surfaces)
+    
+    def draw(self, surface, bricks, current_time, viewport=IDENTITY, gradient=True):
+        """
+        Оновлює змінені цеглинки, анімує палітру та виводить шар
+        
+        Args:
+            surface: Поверхня для малювання
+            bricks: Список цеглинок рівня
+            current_time: Поточний час для анімацій
+            viewport: Трансформація логічних координат у пікселі surface
+            gradient: False - суцільна заливка замість градієнта
+        
+        Returns:
+            list: Змінені області (перемальовані та анімовані цеглинки)
+        """
+        return self.composite(surface, self.prepare(bricks, current_time, viewport, gradient), viewport)
+    
+    def prepare(self, bricks, current_time, viewport=IDENTITY, gradient=True):
+        """
+        Оновлює змінені цеглинки та анімує палітру, не торкаючись кадру
+        
+        Args:
+            bricks: Список цеглинок рівня
+            current_time: Поточний час для анімацій
+            viewport: Трансформація логічних координат у пікселі кадру
+            gradient: False - суцільна заливка замість градієнта
+        
+        Returns:
+            list: Змінені області шару (без зміщення viewport) для composite()
+        """
+        local = Viewport(viewport.scale)
+        if bricks is not self._bricks or (viewport.scale, gradient) != self._key:
+            self._rebuild(bricks, local, gradient)
+            dirty = [self.surface.get_rect(topleft=self.origin)] if self.surface else []
+        else:
+            changed = [brick for brick in bricks
+                       if brick.changed or brick.shake_time > 0 or id(brick) in self._shaking]
+            dirty = self._redraw(changed, bricks, local, gradient) if changed else []
+        
+        if self.surface is None:
+            return []
+        
+        if dirty:
+            self._animated_rect = self._find_animated_rect(bricks)
+        self._animate(current_time)
+        if self._animated_rect:
+            dirty.append(self._animated_rect)
+        return dirty
+    
+    def composite(self, surface, dirty, viewport=IDENTITY):
+        """
+        Виводить підготовлений prepare() шар на кадр
+        
+        Args:
+            surface: Поверхня для малювання
+            dirty: Результат prepare()
+            viewport: Трансформація логічних координат у пікселі surface
+        
+        Returns:
+            list: Змінені області кадру
+        """
+        if self.surface is None:
+            return []
+        offset = (viewport.offset_x + self.origin[0], viewport.offset_y + self.origin[1])
+        surface.blit(self.surface, offset)
+        return [rect.move(viewport.offset_x, viewport.offset_y) for rect in dirty]
+    
+    def iter_surfaces(self):
+        """Пари (назва, поверхня) шару"""
+        return [('layer', self.surface)] if self.surface is not None else []
+    
+    def _rebuild(self, bricks, viewport, gradient):
+        """Створює шар під новий набір цеглинок і малює їх усі"""
+        self._bricks = bricks
+        self._key = (viewport.scale, gradient)
+        self._rects = {}
+        self._shaking = set()
+        self.ramps = {}
+        self.palette = list(FIXED_COLORS) + [(0, 0, 0)] * (256 - len(FIXED_COLORS))
+        self.surface = None
+        if not bricks:
+            return
+        
+        # Запас на тремтіння, як у Brick.draw
+        margin = viewport.scale_length(4)
+        rects = [viewport.to_screen_rect(brick.rect) for brick in bricks]
+        bounds = rects[0].unionall(rects[1:]).inflate(margin * 2, 0)
+        self.origin = bounds.topleft
+        
+        self.surface = pygame.Surface(bounds.size, 0, 8)
+        self.surface.set_colorkey(TRANSPARENT_INDEX)
+        self.surface.fill(TRANSPARENT_INDEX)
+        
+        visible = [brick for brick in bricks if brick.visible]
+        for brick in visible:
+            self._rects[id(brick)] = self._local_rect(brick, viewport)
+        self._prepare_palette(visible)
+        for brick in visible:
+            self._draw_brick(brick, self._rects[id(brick)], viewport, gradient)
+            brick.changed = False
+    
+    def _redraw(self, changed, bricks, viewport, gradient):
+        """
+        Перемальовує змінені цеглинки та сусідів, яких зачепила їх область
+        
+        Returns:
+            list: Перемальовані області (в координатах viewport)
+        """
+        areas = []
+        for brick in changed:
+            old = self._rects.pop(id(brick), None)
+            new = self._local_rect(brick, viewport) if brick.visible else None
+            if new is not None:
+                self._rects[id(brick)] = new
+            area = old.union(new) if old and new else old or new
+            if area:
+                areas.append(area)
+            if brick.shake_time > 0:
+                self._shaking.add(id(brick))
+            else:
+                self._shaking.discard(id(brick))
+            brick.changed = False
+        
+        self._prepare_palette([brick for brick in changed if brick.visible])
+        for area in areas:
+            self.surface.fill(TRANSPARENT_INDEX, area)
+            for brick in bricks:
+                rect = self._rects.get(id(brick))
+                if rect is not None and rect.colliderect(area):
+                    self._draw_brick(brick, rect, viewport, gradient, clip=area)
+        return [area.move(self.origin) for area in areas]
+    
+    def _local_rect(self, brick, viewport):
+        """Прямокутник цеглинки (з урахуванням тремтіння) у координатах шару"""
+        rect = viewport.to_screen_rect(brick.rect.move(int(brick.shake_offset), 0))
+        return rect.move(-self.origin[0], -self.origin[1])
+    
+    def _prepare_palette(self, bricks):
+        """Виділяє відтінки для нових кольорів і вмикає палітру для малювання"""
+        for brick in bricks:
+            if brick.color not in self.ramps:
+                base = FIRST_RAMP_INDEX + len(self.ramps) * self.ramp_size
+                if base + self.ramp_size > 256:
+                    # Палітра заповнена - колір відобразиться на найближчі відтінки
+                    continue
+                self.ramps[brick.color] = base
+                self.palette[base:base + self.ramp_size] = ramp_colors(brick.color, self.shades)
+        self.surface.set_palette(self.palette)
+    
+    def _draw_brick(self, brick, rect, viewport, gradient, clip=None):
+        """
+        Малює цеглинку в шар
+        
+        Кольори відображаються на найближчі записи палітри, тож градієнт
+        потрапляє у відтінки свого кольору, а обводки - в анімовані індекси.
+        """
+        surface = self.surface
+        surface.set_clip(rect.clip(clip) if clip else rect)
+        brick.draw_static(surface, rect, viewport, gradient)
+        
+        if brick.brick_type == BrickType.EXPLOSIVE:
+            self._draw_marker(rect, FIXED_COLORS[EXPLOSIVE_INDEX], "💥", viewport.scale_length(20),
+                              (255, 255, 255), viewport)
+        elif brick.brick_type == BrickType.BONUS:
+            color = FIXED_COLORS[RAINBOW_INDEX]
+            self._draw_marker(rect, color, "★", viewport.scale_length(18), color, viewport)
+        surface.set_clip(None)
+    
+    def _draw_marker(self, rect, border_color, glyph, size, glyph_color, viewport):
+        """Малює обводку та символ анімованої цеглинки (без згладжування - лише точні кольори)"""
+        pygame.draw.rect(self.surface, border_color, rect, viewport.scale_length(3))
+        text = get_font(size).render(glyph, False, glyph_color)
+        self.surface.blit(text, text.get_rect(center=rect.center))
+    
+    def _animate(self, current_time):
+        """Виставляє палітру поточного кадру"""
+        palette = list(self.palette)
+        pulse = math.sin(current_time / EXPLOSIVE_PULSE_PERIOD * 2 * math.pi) * 0.3 + 0.7
+        palette[EXPLOSIVE_INDEX] = (255, int(50 * pulse), 0)
+        palette[RAINBOW_INDEX] = rainbow_color(current_time / BONUS_RAINBOW_PERIOD % 1.0 * 360)
+        
+        if PALETTE_NEON_PULSE > 0:
+            for i, color in enumerate(NEON_COLORS):
+                base = self.ramps.get(color)
+                if base is None:
+                    continue
+                phase = current_time / PALETTE_NEON_PERIOD + i / len(NEON_COLORS)
+                # Яскравість з кроком 1% - відтінки кешуються, а не рахуються щокадру
+                level = round(100 + 100 * PALETTE_NEON_PULSE * math.sin(phase * 2 * math.pi))
+                ramp = self._neon_ramps.get((color, level))
+                if ramp is None:
+                    ramp = ramp_colors(color, self.shades, level / 100)
+                    self._neon_ramps[(color, level)] = ramp
+                palette[base:base + self.ramp_size] = ramp
+        self.surface.set_palette(palette)
+    
+    def _find_animated_rect(self, bricks):
+        """Область цеглинок, чий колір анімує палітра (в координатах viewport)"""
+        animated = [self._rects[id(brick)] for brick in bricks
+                    if id(brick) in self._rects
+                    and (brick.brick_type in (BrickType.EXPLOSIVE, BrickType.BONUS)
+                         or (PALETTE_NEON_PULSE > 0 and brick.brick_type == BrickType.NORMAL))]
+        if not animated:
+            return None
+        return animated[0].unionall(animated[1:]).move(self.origin)
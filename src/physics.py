@@ -168,6 +168,7 @@ def handle_brick_collision(ball, bricks, is_fire_ball, context):
         
         if hit_result['destroyed']:
             context.score += hit_result['points']
+            context.notifications.add_score_popup(brick.rect.centerx, brick.rect.centery, hit_result['points'])
             
             # Ефекти знищення
             context.particle_system.create_explosion(
@@ -177,16 +178,23 @@ def handle_brick_collision(ball, bricks, is_fire_ball, context):
             context.particle_system.create_shockwave(
                 brick.rect.centerx, brick.rect.centery, brick.original_color
             )
+            context.light_map.add_burst(brick.rect.centerx, brick.rect.centery, brick.original_color)
             
             # Вибухові цеглинки
             if hit_result['explosive']:
                 context.sound_manager.play_explosion()
                 context.screen_shake.start(magnitude=5, duration=0.2)
+                context.light_map.add_burst(
+                    brick.rect.centerx, brick.rect.centery, (255, 150, 50), radius=220, lifetime=0.5
+                )
                 explosion_targets = context.level_manager.get_explosion_targets(bricks, brick)
                 for target in explosion_targets:
                     target_result = target.hit()
                     if target_result['destroyed']:
                         context.score += target_result['points']
+                        context.notifications.add_score_popup(
+                            target.rect.centerx, target.rect.centery, target_result['points']
+                        )
                         context.particle_system.create_explosion(
                             target.rect.centerx, target.rect.centery,
                             (255, 100, 0), num_particles=20
@@ -223,6 +231,7 @@ def handle_brick_collision(ball, bricks, is_fire_ball, context):
                 brick.rect.centerx, brick.rect.centery,
                 (255, 100, 0), num_particles=15
             )
+            context.light_map.add_burst(brick.rect.centerx, brick.rect.centery, (255, 100, 0))
         
         return True
     
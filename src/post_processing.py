@@ -0,0 +1,238 @@
+"""
+Етап постобробки кадру: світіння (bloom), віньєтка та хроматична аберація
+
+Ефекти застосовуються до готового кадру один за одним у порядку
+пріоритету, поки вміщуються в бюджет часу. Вартість кожного ефекту
+вимірюється і згладжується; ефект, що не вміщується, пропускається і
+пробується знову через паузу, що подвоюється після кожної невдалої спроби.
+"""
+import time
+import numpy as np
+import pygame
+from display_format import create_surface, register_source
+from game_config import (
+    POSTFX_BUDGET_MS, POSTFX_COST_SMOOTHING, POSTFX_RETRY_FRAMES, POSTFX_MAX_RETRY_FRAMES,
+    BLOOM_DOWNSAMPLE, BLOOM_BLUR_FACTOR, BLOOM_THRESHOLD, BLOOM_INTENSITY,
+    VIGNETTE_STRENGTH, CHROMATIC_ABERRATION_OFFSET
+)
+
+
+def _constant_surface(size, value):
+    """Поверхня, залита сірим значенням (операнд для BLEND_SUB/BLEND_MULT)"""
+    surface = create_surface(size)
+    surface.fill((value, value, value))
+    return surface
+
+
+class Vignette:
+    """Затемнення країв кадру кешованою маскою (BLEND_MULT)"""
+    
+    # Змінює лише свої пікселі, тож вивід змінених областей лишається коректним
+    local = True
+    
+    def __init__(self, strength=VIGNETTE_STRENGTH):
+        """
+        Ініціалізація віньєтки
+        
+        Args:
+            strength: Затемнення кутів (0 - немає, 1 - повністю чорні)
+        """
+        self.strength = strength
+        self._mask = None
+        register_source('vignette', self.iter_surfaces, self.invalidate)
+    
+    def apply(self, surface):
+        """Множить кадр на маску"""
+        size = surface.get_size()
+        if self._mask is None or self._mask.get_size() != size:
+            self._mask = self._render_mask(size)
+        surface.blit(self._mask, (0, 0), special_flags=pygame.BLEND_MULT)
+    
+    def invalidate(self):
+        """Відкидає маску (буде відрендерена заново)"""
+        self._mask = None
+    
+    def iter_surfaces(self):
+        """Пари (назва, поверхня) кешованої маски"""
+        return [('mask', self._mask)]
+    
+    def _render_mask(self, size):
+        """Рендерить маску: білий центр, що до кутів темнішає на strength"""
+        width, height = size
+        x = np.linspace(-1.0, 1.0, width, dtype=np.float32)[:, None]
+        y = np.linspace(-1.0, 1.0, height, dtype=np.float32)[None, :]
+        distance = np.minimum(np.sqrt(x * x + y * y) / np.sqrt(2.0), 1.0)
+        shade = (255 * (1.0 - self.strength * distance ** 2)).astype(np.uint8)
+        
+        mask = create_surface(size)
+        pygame.surfarray.blit_array(mask, np.repeat(shade[:, :, None], 3, axis=2))
+        return mask
+
+
+class Bloom:
+    """
+    Світіння яскравих ділянок у зниженій роздільності
+    
+    Кадр зменшується (BLOOM_DOWNSAMPLE), з нього віднімається поріг
+    яскравості, розмиття - це ще одне зменшення в BLOOM_BLUR_FACTOR разів
+    і згладжене збільшення назад. Результат множиться на інтенсивність,
+    збільшується до розміру кадру і додається (BLEND_ADD). Усі поверхні
+    виділяються лише при зміні розміру кадру.
+    """
+    
+    local = False
+    
+    def __init__(self, downsample=BLOOM_DOWNSAMPLE, blur_factor=BLOOM_BLUR_FACTOR,
+                 threshold=BLOOM_THRESHOLD, intensity=BLOOM_INTENSITY):
+        """
+        Ініціалізація світіння
+        
+        Args:
+            downsample: У скільки разів зменшується кадр
+            blur_factor: Додаткове зменшення для розмиття
+            threshold: Поріг яскравості каналу (0-255)
+            intensity: Множник світіння (0-1)
+        """
+        self.downsample = downsample
+        self.blur_factor = blur_factor
+        self.threshold = threshold
+        self.intensity = intensity
+        self._size = None
+        register_source('bloom', self.iter_surfaces, self.invalidate)
+    
+    def apply(self, surface):
+        """Додає до кадру світіння яскравих ділянок"""
+        if surface.get_size() != self._size:
+            self._allocate(surface.get_size())
+        
+        small, blurred, tiny = self._small, self._blurred, self._tiny
+        pygame.transform.scale(surface, small.get_size(), small)
+        small.blit(self._threshold, (0, 0), special_flags=pygame.BLEND_SUB)
+        pygame.transform.smoothscale(small, tiny.get_size(), tiny)
+        pygame.transform.smoothscale(tiny, blurred.get_size(), blurred)
+        blurred.blit(self._intensity, (0, 0), special_flags=pygame.BLEND_MULT)
+        pygame.transform.smoothscale(blurred, self._size, self._full)
+        surface.blit(self._full, (0, 0), special_flags=pygame.BLEND_ADD)
+    
+    def invalidate(self):
+        """Відкидає проміжні поверхні (будуть виділені при наступному apply)"""
+        self._size = None
+    
+    def iter_surfaces(self):
+        """Пари (назва, поверхня) проміжних поверхонь"""
+        if self._size is None:
+            return []
+        return [('small', self._small), ('blurred', self._blurred), ('tiny', self._tiny),
+                ('full', self._full), ('threshold', self._threshold), ('intensity', self._intensity)]
+    
+    def _allocate(self, size):
+        """Виділяє проміжні поверхні під розмір кадру"""
+        width, height = self._size = size
+        small_size = (max(1, width // self.downsample), max(1, height // self.downsample))
+        tiny_size = (max(1, small_size[0] // self.blur_factor), max(1, small_size[1] // self.blur_factor))
+        
+        self._small = create_surface(small_size)
+        self._blurred = create_surface(small_size)
+        self._tiny = create_surface(tiny_size)
+        self._full = create_surface(size)
+        self._threshold = _constant_surface(small_size, self.threshold)
+        self._intensity = _constant_surface(small_size, int(255 * self.intensity))
+
+
+class ChromaticAberration:
+    """Зсув червоного та синього каналів у протилежні боки (через surfarray)"""
+    
+    local = False
+    
+    def __init__(self, offset=CHROMATIC_ABERRATION_OFFSET):
+        """
+        Ініціалізація аберації
+        
+        Args:
+            offset: Зсув каналів у пікселях
+        """
+        self.offset = offset
+    
+    def apply(self, surface):
+        """Зсуває канали кадру на місці"""
+        offset = self.offset
+        if offset <= 0 or surface.get_width() <= offset:
+            return
+        pixels = pygame.surfarray.pixels3d(surface)
+        pixels[offset:, :, 0] = pixels[:-offset, :, 0]
+        pixels[:-offset, :, 2] = pixels[offset:, :, 2]
+        del pixels
+
+
+class PostProcessor:
+    """
+    Ланцюжок ефектів постобробки з бюджетом часу на кадр
+    
+    Ефекти йдуть у порядку пріоритету. Перед кожним перевіряється, чи
+    вміщується його згладжена вартість у залишок бюджету. Ефект, що не
+    вміщується, чекає POSTFX_RETRY_FRAMES кадрів і пробується знову; кожна
+    невдала спроба подвоює паузу (до POSTFX_MAX_RETRY_FRAMES), тож дорогий
+    ефект не смикає кадр регулярно, а коли навантаження спаде - вмикається.
+    """
+    
+    def __init__(self, effects=None, budget_ms=POSTFX_BUDGET_MS):
+        """
+        Ініціалізація етапу
+        
+        Args:
+            effects: Ефекти у порядку пріоритету (None - віньєтка, світіння, аберація)
+            budget_ms: Бюджет постобробки на кадр у мілісекундах
+        """
+        if effects is None:
+            effects = [Vignette(), Bloom(), ChromaticAberration()]
+        self.effects = effects
+        self.budget_ms = budget_ms
+        self.enabled = True
+        self.costs = {effect: 0.0 for effect in effects}
+        self.applied = []
+        self._wait = {effect: 0 for effect in effects}
+        self._retry_frames = {effect: POSTFX_RETRY_FRAMES for effect in effects}
+    
+    def apply(self, surface):
+        """
+        Застосовує ефекти, що вміщуються в бюджет
+        
+        Args:
+            surface: Готовий кадр (змінюється на місці)
+        
+        Returns:
+            bool: True, якщо всі застосовані ефекти локальні і їх набір не
+                змінився з минулого кадру (вивід змінених областей коректний)
+        """
+        previous, self.applied = self.applied, []
+        if not self.enabled:
+            return not previous
+        
+        remaining = self.budget_ms
+        for effect in self.effects:
+            if self._wait[effect] > 0:
+                self._wait[effect] -= 1
+                if self._wait[effect] == 0:
+                    # Пауза минула - забуваємо оцінку, щоб ефект спробувався
+                    self.costs[effect] = 0.0
+                continue
+            
+            estimate = self.costs[effect]
+            if estimate > remaining:
+                self._wait[effect] = self._retry_frames[effect]
+                self._retry_frames[effect] = min(self._retry_frames[effect] * 2, POSTFX_MAX_RETRY_FRAMES)
+                continue
+            
+            start = time.perf_counter()
+            effect.apply(surface)
+            cost = (time.perf_counter() - start) * 1000
+            self.costs[effect] = estimate + (cost - estimate) * POSTFX_COST_SMOOTHING if estimate else cost
+            if cost <= remaining:
+                self._retry_frames[effect] = POSTFX_RETRY_FRAMES
+            remaining -= cost
+            self.applied.append(effect)
+        return self.applied == previous and all(effect.local for effect in self.applied)
+    
+    def is_active(self, effect_type):
+        """Чи застосовувався ефект цього типу на останньому кадрі"""
+        return any(isinstance(effect, effect_type) for effect in self.applied)
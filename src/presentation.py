@@ -0,0 +1,336 @@
+"""
+Етап виводу кадру: масштабування ігрової поверхні на дисплей
+"""
+import pygame
+from display_format import create_surface, register_source
+from viewport import Viewport
+from game_config import BLACK, PRESENTATION_SCALE_MODE, RENDER_SCALE_SMOOTH
+
+
+# Режими масштабування
+SCALE_NEAREST = "nearest"  # Найближчий сусід, дробовий масштаб на весь екран
+SCALE_INTEGER = "integer"  # Найближчий сусід, лише цілий масштаб (чіткі пікселі)
+SCALE_SMOOTH = "smooth"    # Білінійне згладжування (smoothscale)
+SCALE_SDL = "sdl"          # Масштабує сам SDL (прапорець pygame.SCALED)
+
+SCALE_MODES = (SCALE_NEAREST, SCALE_INTEGER, SCALE_SMOOTH, SCALE_SDL)
+
+
+class Presenter:
+    """
+    Виводить логічну ігрову поверхню у вікно
+    
+    Трансформація кешується до зміни режиму дисплея, а масштабування
+    виконується у заздалегідь виділену поверхню призначення. Якщо формат
+    вікна збігається з форматом кадру, призначенням є підповерхня самого
+    вікна, тож кадр не копіюється вдруге.
+    """
+    
+    def __init__(self, logical_size, mode=PRESENTATION_SCALE_MODE):
+        """
+        Ініціалізація етапу виводу
+        
+        Args:
+            logical_size: Логічний розмір гри (ширина, висота)
+            mode: Режим масштабування (один з SCALE_MODES)
+        """
+        if mode not in SCALE_MODES:
+            raise ValueError(f"Unknown presentation mode '{mode}'")
+        self.logical_size = logical_size
+        self.mode = mode
+        self._transform = None
+        self._window_size = None
+        self._scaled = None
+        self._last_rect = None
+        register_source('presenter', self.iter_surfaces, self.invalidate)
+    
+    def set_display_mode(self, fullscreen):
+        """
+        Створює вікно для заданого режиму та скидає кеш трансформації
+        
+        Args:
+            fullscreen: True для повноекранного режиму
+        
+        Returns:
+            pygame.Surface: Поверхня дисплея
+        """
+        if self.mode == SCALE_SDL:
+            window = self._set_scaled_mode(fullscreen)
+        elif fullscreen:
+            window = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            window = pygame.display.set_mode(self.logical_size)
+        
+        self.invalidate()
+        return window
+    
+    def _set_scaled_mode(self, fullscreen):
+        """
+        Перемикає SCALED-вікно без переініціалізації відеопідсистеми
+        
+        Якщо драйвер не може створити рендерер для нового режиму,
+        повноекранність перемикається у вже створеному вікні, а якщо й це не
+        підтримується - вікно лишається як є.
+        
+        Args:
+            fullscreen: True для повноекранного режиму
+        
+        Returns:
+            pygame.Surface: Поверхня дисплея
+        """
+        flags = pygame.SCALED | (pygame.FULLSCREEN if fullscreen else 0)
+        window = pygame.display.get_surface()
+        try:
+            return pygame.display.set_mode(self.logical_size, flags)
+        except pygame.error:
+            if window is None:
+                raise
+        if bool(window.get_flags() & pygame.FULLSCREEN) != fullscreen:
+            try:
+                pygame.display.toggle_fullscreen()
+            except pygame.error as e:
+                print(f"Не вдалося перемкнути повноекранний режим: {e}")
+        return pygame.display.get_surface()
+    
+    def invalidate(self):
+        """Скидає кешовану трансформацію та поверхню призначення"""
+        self._transform = None
+        self._window_size = None
+        self._scaled = None
+        self._last_rect = None
+    
+    def iter_surfaces(self):
+        """Пари (назва, поверхня) виділених буферів"""
+        return [('scaled', self._scaled)]
+    
+    def get_transform(self, window):
+        """
+        Повертає параметри трансформації (кешовані до зміни розміру вікна)
+        
+        Args:
+            window: Поверхня дисплея
+        
+        Returns:
+            tuple: (масштаб, зміщення x, зміщення y)
+        """
+        window_size = self._get_window_size(window)
+        if self._transform is not None and window_size == self._window_size:
+            return self._transform
+        
+        game_width, game_height = self.logical_size
+        screen_width, screen_height = window_size
+        scale = min(screen_width / game_width, screen_height / game_height)
+        if self.mode == SCALE_INTEGER and scale >= 1:
+            scale = float(int(scale))
+        
+        scaled_width = int(game_width * scale)
+        scaled_height = int(game_height * scale)
+        offset_x = (screen_width - scaled_width) // 2
+        offset_y = (screen_height - scaled_height) // 2
+        
+        self._window_size = window_size
+        self._transform = (scale, offset_x, offset_y)
+        self._scaled = None
+        return self._transform
+    
+    def present(self, window, frame, shake_offset=(0, 0)):
+        """
+        Виводить кадр у вікно (без flip)
+        
+        Args:
+            window: Поверхня дисплея
+            frame: Логічна ігрова поверхня
+            shake_offset: Зміщення тремтіння екрану (x, y)
+        """
+        scale, offset_x, offset_y = self.get_transform(window)
+        shake_x, shake_y = shake_offset
+        
+        if scale == 1.0:
+            window.blit(frame, (offset_x + shake_x, offset_y + shake_y))
+            return
+        
+        size = (int(self.logical_size[0] * scale), int(self.logical_size[1] * scale))
+        rect = pygame.Rect((offset_x + shake_x, offset_y + shake_y), size)
+        self._fill_borders(window, rect)
+        
+        direct = self._can_scale_into(window, frame, rect)
+        scaled = window.subsurface(rect) if direct else self._get_scaled_surface(frame, size)
+        if self.mode == SCALE_SMOOTH:
+            pygame.transform.smoothscale(frame, size, scaled)
+        else:
+            pygame.transform.scale(frame, size, scaled)
+        
+        if not direct:
+            window.blit(scaled, rect)
+    
+    @staticmethod
+    def flip():
+        """Показує виведений кадр"""
+        pygame.display.flip()
+    
+    @staticmethod
+    def flip_rects(rects):
+        """Показує лише задані області кадру"""
+        pygame.display.update(rects)
+    
+    @staticmethod
+    def set_caption(title):
+        """Задає заголовок вікна"""
+        pygame.display.set_caption(title)
+    
+    def is_identity(self, window):
+        """Чи виводиться кадр у вікно один до одного (без масштабу та зміщення)"""
+        return self.mode != SCALE_SDL and self.get_transform(window) == (1.0, 0, 0)
+    
+    @staticmethod
+    def present_rects(window, frame, rects):
+        """
+        Копіює у вікно лише задані області кадру (для display.update(rects))
+        
+        Args:
+            window: Поверхня дисплея (того ж розміру, що й кадр)
+            frame: Логічна ігрова поверхня
+            rects: Змінені області
+        """
+        window.blits([(frame, rect, rect) for rect in rects], doreturn=False)
+    
+    def supports_native(self, window):
+        """Чи має сенс малювати прямо у вікно (воно більше за логічний розмір)"""
+        return self.mode != SCALE_SDL and window.get_size() != self.logical_size
+    
+    def begin_native_frame(self, window, shake_offset=(0, 0)):
+        """
+        Готує вікно до малювання в нативній роздільності
+        
+        Зафарбовує смуги навколо ігрової області та обмежує малювання (clip)
+        цією областю. Саму область не очищає - фон гри перекриває її
+        повністю. Після малювання викликати end_native_frame().
+        
+        Args:
+            window: Поверхня дисплея
+            shake_offset: Зміщення тремтіння екрану (x, y)
+        
+        Returns:
+            Viewport: Трансформація логічних координат у пікселі вікна
+        """
+        scale, offset_x, offset_y = self.get_transform(window)
+        viewport = Viewport(scale, offset_x + shake_offset[0], offset_y + shake_offset[1])
+        rect = viewport.to_screen_rect((0, 0, *self.logical_size))
+        
+        self._fill_borders(window, rect)
+        window.set_clip(rect)
+        return viewport
+    
+    @staticmethod
+    def begin_canvas(window, shake_offset=(0, 0)):
+        """Канва спрайтів поверх кадру - лише у текстурного виводу (тут None)"""
+        return None
+    
+    @staticmethod
+    def end_native_frame(window):
+        """Знімає обмеження малювання після кадру в нативній роздільності"""
+        window.set_clip(None)
+    
+    @staticmethod
+    def _get_window_size(window):
+        """Розмір вікна в пікселях"""
+        return window.get_size()
+    
+    @staticmethod
+    def _can_scale_into(window, frame, rect):
+        """Чи можна масштабувати кадр прямо у вікно (той самий формат, без обрізання)"""
+        return (window.get_bitsize() == frame.get_bitsize()
+                and window.get_masks() == frame.get_masks()
+                and window.get_rect().contains(rect))
+    
+    def _get_scaled_surface(self, frame, size):
+        """Повертає заздалегідь виділену проміжну поверхню призначення"""
+        if self._scaled is None or self._scaled.get_size() != size:
+            # Кадр створено у форматі дисплея - проміжна поверхня в тому самому
+            self._scaled = create_surface(size)
+        return self._scaled
+    
+    def _fill_borders(self, window, rect):
+        """Зафарбовує лише смуги навколо кадру, а не весь екран"""
+        if rect == self._last_rect:
+            return
+        width, height = window.get_size()
+        for border in (
+            pygame.Rect(0, 0, width, rect.top),
+            pygame.Rect(0, rect.bottom, width, height - rect.bottom),
+            pygame.Rect(0, rect.top, rect.left, rect.height),
+            pygame.Rect(rect.right, rect.top, width - rect.right, rect.height),
+        ):
+            if border.width > 0 and border.height > 0:
+                window.fill(BLACK, border)
+        self._last_rect = rect
+
+
+class ScaledLayer:
+    """
+    Шар зниженої роздільності, що збільшується у цільову область
+    
+    Внутрішня поверхня створюється у форматі дисплея (як і ціль), тож
+    збільшення зазвичай пишеться прямо в підповерхню цілі. Поверхні
+    виділяються лише при зміні розміру або формату дисплея.
+    """
+    
+    def __init__(self, smooth=RENDER_SCALE_SMOOTH):
+        """
+        Ініціалізація шару
+        
+        Args:
+            smooth: True - білінійне збільшення (smoothscale)
+        """
+        self.smooth = smooth
+        self._surface = None
+        self._scaled = None
+        register_source('scaled_layer', self.iter_surfaces, self.invalidate)
+    
+    def get_surface(self, size, target):
+        """
+        Повертає внутрішню поверхню (виділяє при зміні розміру)
+        
+        Args:
+            size: Розмір внутрішньої поверхні
+            target: Поверхня, у яку шар буде збільшено
+        
+        Returns:
+            pygame.Surface: Внутрішня поверхня
+        """
+        if self._surface is None or self._surface.get_size() != size:
+            self._surface = create_surface(size)
+        return self._surface
+    
+    def invalidate(self):
+        """Відкидає поверхні шару (будуть виділені заново)"""
+        self._surface = None
+        self._scaled = None
+    
+    def iter_surfaces(self):
+        """Пари (назва, поверхня) поверхонь шару"""
+        return [('surface', self._surface), ('scaled', self._scaled)]
+    
+    def present(self, target, rect):
+        """
+        Збільшує внутрішню поверхню в область цілі
+        
+        Args:
+            target: Цільова поверхня
+            rect: Область цілі (може виходити за її межі при тремтінні)
+        """
+        direct = target.get_rect().contains(rect)
+        if direct:
+            scaled = target.subsurface(rect)
+        else:
+            if self._scaled is None or self._scaled.get_size() != rect.size:
+                self._scaled = create_surface(rect.size)
+            scaled = self._scaled
+        
+        if self.smooth:
+            pygame.transform.smoothscale(self._surface, rect.size, scaled)
+        else:
+            pygame.transform.scale(self._surface, rect.size, scaled)
+        
+        if not direct:
+            target.blit(scaled, rect)
@@ -0,0 +1,290 @@
+"""
+Пресети якості графіки та адаптивний регулятор, що тримає цільовий FPS
+"""
+import json
+import os
+import platform
+from game_config import (
+    ENABLE_PARTICLES, ENABLE_BALL_TRAIL, ENABLE_BRICK_GRADIENTS,
+    ENABLE_GLOWING_BALL, ENABLE_ANIMATED_BACKGROUND, ENABLE_POST_PROCESSING, ENABLE_DYNAMIC_LIGHTING,
+    QUALITY_PRESETS, QUALITY_PRESET_ORDER, DEFAULT_QUALITY_PRESET, TARGET_FPS,
+    QUALITY_SAMPLE_FRAMES, QUALITY_DOWNGRADE_RATIO, QUALITY_UPGRADE_RATIO,
+    QUALITY_DOWNGRADE_WINDOWS, QUALITY_UPGRADE_WINDOWS, QUALITY_CALIBRATION_HEADROOM,
+    RENDER_SCALE_MIN, RENDER_SCALE_STEP, RENDER_SCALE_SAMPLE_FRAMES, RENDER_SCALE_UPGRADE_WINDOWS
+)
+
+
+# Прапорці з game_config - верхня межа для всіх пресетів
+FEATURE_FLAGS = {
+    'particles': ENABLE_PARTICLES,
+    'ball_trail': ENABLE_BALL_TRAIL,
+    'brick_gradients': ENABLE_BRICK_GRADIENTS,
+    'glowing_ball': ENABLE_GLOWING_BALL,
+    'animated_background': ENABLE_ANIMATED_BACKGROUND,
+    'post_processing': ENABLE_POST_PROCESSING,
+    'lighting': ENABLE_DYNAMIC_LIGHTING,
+}
+
+
+class QualitySettings:
+    """Увімкнені ефекти для одного пресету (з урахуванням прапорців ENABLE_*)"""
+    
+    def __init__(self, name, preset):
+        """
+        Ініціалізація налаштувань
+        
+        Args:
+            name: Назва пресету
+            preset: Словник пресету з QUALITY_PRESETS
+        """
+        self.name = name
+        self.particles = preset['particles'] and FEATURE_FLAGS['particles']
+        self.ball_trail = preset['ball_trail'] and FEATURE_FLAGS['ball_trail']
+        self.brick_gradients = preset['brick_gradients'] and FEATURE_FLAGS['brick_gradients']
+        self.glowing_ball = preset['glowing_ball'] and FEATURE_FLAGS['glowing_ball']
+        self.animated_background = preset['animated_background'] and FEATURE_FLAGS['animated_background']
+        self.post_processing = preset['post_processing'] and FEATURE_FLAGS['post_processing']
+        self.lighting = preset['lighting'] and FEATURE_FLAGS['lighting']
+        self.particle_budget = preset['particle_budget']
+
+
+class QualityGovernor:
+    """
+    Регулятор якості за часом кадру
+    
+    Час роботи кадру (без очікування clock.tick) збирається у вікна по
+    QUALITY_SAMPLE_FRAMES кадрів. Якщо середнє кількох вікон поспіль
+    перевищує частку бюджету кадру, якість знижується на один пресет;
+    підвищується вона лише після значно довшої серії легких вікон і при
+    значно меншому навантаженні - цей гістерезис не дає якості коливатись.
+    """
+    
+    def __init__(self, preset=DEFAULT_QUALITY_PRESET, target_fps=TARGET_FPS, adaptive=True):
+        """
+        Ініціалізація регулятора
+        
+        Args:
+            preset: Початковий пресет (назва з QUALITY_PRESET_ORDER)
+            target_fps: Цільова частота кадрів
+            adaptive: False - пресет змінюється лише вручну
+        """
+        self.frame_budget_ms = 1000.0 / target_fps
+        self.adaptive = adaptive
+        self.index = QUALITY_PRESET_ORDER.index(preset)
+        self.settings = QualitySettings(preset, QUALITY_PRESETS[preset])
+        self._samples = []
+        self._slow_windows = 0
+        self._fast_windows = 0
+    
+    @property
+    def preset(self):
+        """Назва поточного пресету"""
+        return QUALITY_PRESET_ORDER[self.index]
+    
+    def set_preset(self, preset):
+        """
+        Вмикає пресет і скидає накопичену статистику
+        
+        Args:
+            preset: Назва пресету
+        
+        Returns:
+            QualitySettings: Нові налаштування
+        """
+        self.index = QUALITY_PRESET_ORDER.index(preset)
+        self.settings = QualitySettings(preset, QUALITY_PRESETS[preset])
+        self._samples.clear()
+        self._slow_windows = 0
+        self._fast_windows = 0
+        return self.settings
+    
+    def record_frame(self, work_ms):
+        """
+        Додає час роботи кадру і за потреби змінює пресет
+        
+        Args:
+            work_ms: Час оновлення та малювання кадру в мілісекундах
+        
+        Returns:
+            bool: True, якщо пресет змінився
+        """
+        if not self.adaptive:
+            return False
+        
+        self._samples.append(work_ms)
+        if len(self._samples) < QUALITY_SAMPLE_FRAMES:
+            return False
+        
+        load = sum(self._samples) / len(self._samples) / self.frame_budget_ms
+        self._samples.clear()
+        
+        if load > QUALITY_DOWNGRADE_RATIO:
+            self._slow_windows += 1
+            self._fast_windows = 0
+        elif load < QUALITY_UPGRADE_RATIO:
+            self._fast_windows += 1
+            self._slow_windows = 0
+        else:
+            self._slow_windows = 0
+            self._fast_windows = 0
+        
+        if self._slow_windows >= QUALITY_DOWNGRADE_WINDOWS and self.index > 0:
+            self.set_preset(QUALITY_PRESET_ORDER[self.index - 1])
+            return True
+        if self._fast_windows >= QUALITY_UPGRADE_WINDOWS and self.index < len(QUALITY_PRESET_ORDER) - 1:
+            self.set_preset(QUALITY_PRESET_ORDER[self.index + 1])
+            return True
+        return False
+    
+    def choose_calibrated(self, costs_ms):
+        """
+        Обирає найвищий пресет, чий виміряний час кадру вміщується в бюджет
+        
+        Args:
+            costs_ms: Словник {пресет: середній час кадру в мс}
+        
+        Returns:
+            str: Назва пресету (найнижчий, якщо не вміщується жоден)
+        """
+        limit = self.frame_budget_ms * QUALITY_CALIBRATION_HEADROOM
+        for preset in reversed(QUALITY_PRESET_ORDER):
+            if costs_ms.get(preset, float('inf')) <= limit:
+                return preset
+        return QUALITY_PRESET_ORDER[0]
+
+
+class ResolutionScaler:
+    """
+    Регулятор внутрішньої роздільності ігрового поля за часом кадру
+    
+    Працює як QualityGovernor, але реагує швидше: важке вікно одразу
+    зменшує масштаб на один крок, а підвищення вимагає кількох легких
+    вікон поспіль. Масштаб завжди кратний кроку, тож розмір внутрішньої
+    поверхні набуває лише кількох значень.
+    
+    Збільшення поля до повного розміру теж коштує часу. Якщо після кроку
+    вниз навантаження не зменшилось, крок скасовується, а поточний масштаб
+    стає нижньою межею - далі кадр полегшує QualityGovernor.
+    """
+    
+    def __init__(self, min_scale=RENDER_SCALE_MIN, step=RENDER_SCALE_STEP,
+                 target_fps=TARGET_FPS, adaptive=True):
+        """
+        Ініціалізація регулятора
+        
+        Args:
+            min_scale: Мінімальний масштаб (частка логічної роздільності)
+            step: Крок зміни масштабу
+            target_fps: Цільова частота кадрів
+            adaptive: False - масштаб завжди 1.0
+        """
+        self.min_scale = min_scale
+        self.step = step
+        self.frame_budget_ms = 1000.0 / target_fps
+        self.adaptive = adaptive
+        self.scale = 1.0
+        self._samples = []
+        self._fast_windows = 0
+        self._load_before_step = None
+    
+    @property
+    def at_min(self):
+        """Чи досягнуто мінімального масштабу"""
+        return self.scale <= self.min_scale
+    
+    @property
+    def at_max(self):
+        """Чи поле малюється в повній роздільності"""
+        return self.scale >= 1.0
+    
+    def record_frame(self, work_ms):
+        """
+        Додає час роботи кадру і за потреби змінює масштаб
+        
+        Args:
+            work_ms: Час оновлення та малювання кадру в мілісекундах
+        
+        Returns:
+            bool: True, якщо масштаб змінився
+        """
+        if not self.adaptive:
+            return False
+        
+        self._samples.append(work_ms)
+        if len(self._samples) < RENDER_SCALE_SAMPLE_FRAMES:
+            return False
+        
+        load = sum(self._samples) / len(self._samples) / self.frame_budget_ms
+        self._samples.clear()
+        
+        load_before_step, self._load_before_step = self._load_before_step, None
+        if load_before_step is not None and load >= load_before_step:
+            # Крок не допоміг - повертаємо масштаб і більше нижче не йдемо
+            self.scale = min(1.0, self.scale + self.step)
+            self.min_scale = self.scale
+            self._fast_windows = 0
+            return True
+        
+        if load > QUALITY_DOWNGRADE_RATIO and not self.at_min:
+            self._fast_windows = 0
+            self._load_before_step = load
+            self.scale = max(self.min_scale, self.scale - self.step)
+            return True
+        
+        self._fast_windows = self._fast_windows + 1 if load < QUALITY_UPGRADE_RATIO else 0
+        if self._fast_windows >= RENDER_SCALE_UPGRADE_WINDOWS and not self.at_max:
+            self._fast_windows = 0
+            self.scale = min(1.0, self.scale + self.step)
+            return True
+        return False
+
+
+def get_machine_key():
+    """Повертає ключ поточної машини для збереження пресету"""
+    return platform.node() or 'default'
+
+
+def load_machine_preset(filename):
+    """
+    Завантажує збережений пресет для цієї машини
+    
+    Args:
+        filename: Шлях до JSON файлу з пресетами
+    
+    Returns:
+        str або None: Назва пресету або None, якщо калібрування ще не було
+    """
+    if not os.path.exists(filename):
+        return None
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            preset = json.load(f).get(get_machine_key())
+    except (json.JSONDecodeError, IOError, AttributeError) as e:
+        print(f"Помилка завантаження налаштувань якості: {e}")
+        return None
+    return preset if preset in QUALITY_PRESETS else None
+
+
+def save_machine_preset(filename, preset):
+    """
+    Зберігає пресет для цієї машини (записи інших машин лишаються)
+    
+    Args:
+        filename: Шлях до JSON файлу з пресетами
+        preset: Назва пресету
+    """
+    presets = {}
+    if os.path.exists(filename):
+        try:
+            with open(filename, 'r', encoding='utf-8') as f:
+                presets = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Помилка завантаження налаштувань якості: {e}")
+        if not isinstance(presets, dict):
+            presets = {}
+    presets[get_machine_key()] = preset
+    try:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(presets, f, ensure_ascii=False, indent=2)
+    except IOError as e:
+        print(f"Помилка збереження налаштувань якості: {e}")
@@ -9,19 +9,34 @@ from game_config import (
     WIDTH, HEIGHT, WHITE, BLACK, RED, BLUE, GREEN, YELLOW, CYAN, MAGENTA,
     MENU_COLOR, MENU_HOVER_COLOR, MENU_SELECTED_COLOR,
     BUTTON_BG_COLOR, BUTTON_BORDER_COLOR,
+    MENU_BUTTON_WIDTH, MENU_BUTTON_HEIGHT, MENU_BUTTON_SPACING,
     FONT_SIZE, LARGE_FONT_SIZE, MENU_FONT_SIZE, SMALL_FONT_SIZE,
     INITIAL_LIVES, NEON_THEME, WALL_THICKNESS, BALL_RADIUS,
     PADDLE_SPEED, BASE_BALL_SPEED, MAX_BALL_SPEED, SPEED_INCREASE_PER_LEVEL,
-    MIN_VERTICAL_SPEED_RATIO, MAX_BOUNCE_ANGLE_DEG
+    MIN_VERTICAL_SPEED_RATIO, MAX_BOUNCE_ANGLE_DEG, OVERLAY_DIM_ALPHA
 )
 from graphics_effects import draw_pulsing_text, draw_neon_heart
+from text_cache import get_font, render_text
+from ui_components import Button, Label, Table, WidgetGroup
 from bonus_system import BonusType
+from viewport import IDENTITY
 import physics
 
 
 class GameState(ABC):
     """Базовий клас для всіх станів гри"""
     
+    # Чи вміє стан малювати з трансформацією Viewport (нативна роздільність)
+    supports_native = False
+    
+    # Чи повідомляє стан змінені області у context.dirty_regions
+    supports_dirty_rects = False
+    
+    # Чи малює стан поверх знімка гри (FrozenFrame): знімок перекриває весь
+    # кадр і вже містить постобробку, тож головний цикл не очищає кадр, не
+    # застосовує постобробку і не виводить кадр, у якому нічого не змінилось
+    overlay = False
+    
     def __init__(self, game_context):
         """
         Ініціалізація стану
@@ -38,7 +53,7 @@ class GameState(ABC):
         
         Args:
             event: pygame event
-            
+        
         Returns:
             str або None: Назва нового стану для переходу (або None)
         """
@@ -71,6 +86,11 @@ class GameState(ABC):
     def on_exit(self):
         """Викликається при виході зі стану"""
         pass
+    
+    def _update_buttons(self, buttons, selected_index, hovered_index):
+        """Підсвічує вибрану кнопку та кнопку під курсором"""
+        for i, button in enumerate(buttons):
+            button.set_selected(i == selected_index or i == hovered_index)
 
 
 class StateManager:
@@ -116,6 +136,7 @@ class StateManager:
         self.current_state_name = name
         self.current_state = self.states[name]
         self.current_state.on_enter()
+        self.context.dirty_regions.invalidate()
     
     def handle_event(self, event):
         """Передає подію поточному стану"""
@@ -129,24 +150,40 @@ class StateManager:
         if self.current_state:
             self.current_state.update(dt)
     
-    def draw(self, surface):
-        """Малює поточний стан"""
+    def draw(self, surface, viewport=None):
+        """
+        Малює поточний стан
+        
+        Args:
+            surface: Поверхня для малювання
+            viewport: Трансформація для станів з supports_native (None - логічна поверхня)
+        """
         if self.current_state:
-            self.current_state.draw(surface)
+            if viewport is None:
+                self.current_state.draw(surface)
+            else:
+                self.current_state.draw(surface, viewport)
 
 
 # Допоміжні функції для UI
 
-def draw_button(surface, text, rect, font, is_selected=False):
-    """Малює кнопку"""
-    color = MENU_SELECTED_COLOR if is_selected else BUTTON_BG_COLOR
-    pygame.draw.rect(surface, color, rect)
-    pygame.draw.rect(surface, BUTTON_BORDER_COLOR, rect, 3)
-    
-    text_color = BLACK if is_selected else WHITE
-    text_surface = font.render(text, True, text_color)
-    text_rect = text_surface.get_rect(center=rect.center)
-    surface.blit(text_surface, text_rect)
+def create_menu_buttons(items, start_y):
+    """
+    Створює кнопки меню, вирівняні по центру екрану
+    
+    Args:
+        items: Тексти кнопок
+        start_y: Верхній край першої кнопки
+    
+    Returns:
+        list: Віджети Button
+    """
+    return [
+        Button(item, pygame.Rect(WIDTH // 2 - MENU_BUTTON_WIDTH // 2,
+                                 start_y + i * (MENU_BUTTON_HEIGHT + MENU_BUTTON_SPACING),
+                                 MENU_BUTTON_WIDTH, MENU_BUTTON_HEIGHT), MENU_FONT_SIZE)
+        for i, item in enumerate(items)
+    ]
 
 
 # Конкретні стани
@@ -154,14 +191,27 @@ def draw_button(surface, text, rect, font, is_selected=False):
 class MainMenuState(GameState):
     """Головне меню"""
     
+    supports_dirty_rects = True
+    
     def __init__(self, game_context):
         super().__init__(game_context)
         self.selected_index = 0
         self.menu_items = ["ПОЧАТИ ГРУ", "РЕКОРДИ", "ВИХІД"]
-        self.font = pygame.font.Font(None, LARGE_FONT_SIZE)
-        self.menu_font = pygame.font.Font(None, MENU_FONT_SIZE)
-        self.button_rects = []  # Зберігаємо прямокутники кнопок для миші
+        self.font = get_font(LARGE_FONT_SIZE)
         self.hovered_index = -1  # Індекс кнопки під курсором
+        
+        # Віджети створюються один раз і перемальовуються лише при зміні стану
+        self.buttons = create_menu_buttons(self.menu_items, 250)
+        self.button_rects = [button.button_rect for button in self.buttons]
+        self.instruction_labels = [
+            Label("", SMALL_FONT_SIZE, WHITE, (WIDTH // 2, HEIGHT - 120 + i * 30), 'center')
+            for i in range(5)
+        ]
+        self.widgets = WidgetGroup([
+            Label("✨ З ВІЗУАЛЬНИМИ ЕФЕКТАМИ ✨", 32, YELLOW, (WIDTH // 2, 160), 'center'),
+            *self.buttons,
+            *self.instruction_labels,
+        ])
     
     def handle_event(self, event):
         # Клавіатура
@@ -220,35 +270,14 @@ class MainMenuState(GameState):
         pass
     
     def draw(self, surface):
-        self.context.background.draw(surface, self.context.current_time)
+        dirty = self.context.dirty_regions
+        dirty.add_all(self.context.background.draw(surface, self.context.current_time))
         
         # Pulsing Title
-        draw_pulsing_text(surface, "АРКАНОЇД", self.font, (WIDTH // 2, 100), CYAN, self.context.current_time)
-        
-        subtitle = pygame.font.Font(None, 32).render("✨ З ВІЗУАЛЬНИМИ ЕФЕКТАМИ ✨", True, YELLOW)
-        subtitle_rect = subtitle.get_rect(center=(WIDTH // 2, 160))
-        surface.blit(subtitle, subtitle_rect)
-        
-        button_width = 300
-        button_height = 60
-        button_spacing = 20
-        start_y = 250
-        
-        # Очищаємо список кнопок
-        self.button_rects = []
-        
-        for i, item in enumerate(self.menu_items):
-            button_rect = pygame.Rect(
-                WIDTH // 2 - button_width // 2,
-                start_y + i * (button_height + button_spacing),
-                button_width,
-                button_height
-            )
-            self.button_rects.append(button_rect)
-            
-            # Визначаємо чи кнопка вибрана або під курсором
-            is_selected = i == self.selected_index or i == self.hovered_index
-            draw_button(surface, item, button_rect, self.menu_font, is_selected)
+        dirty.add(draw_pulsing_text(surface, "АРКАНОЇД", self.font, (WIDTH // 2, 100), CYAN,
+                                    self.context.current_time))
+        
+        self._update_buttons(self.buttons, self.selected_index, self.hovered_index)
         
         # Інструкції
         mode_text = "Повноекранний режим" if self.context.is_fullscreen else "Віконний режим"
@@ -259,22 +288,16 @@ class MainMenuState(GameState):
             f"Режим: {mode_text} (F11 - перемкнути)",
             "ESC - вихід з повноекранного" if self.context.is_fullscreen else "ESC - вихід з гри"
         ]
-        small_font = pygame.font.Font(None, SMALL_FONT_SIZE)
-        y_offset = HEIGHT - 120
-        for instruction in instructions:
-            text = small_font.render(instruction, True, WHITE)
-            rect = text.get_rect(center=(WIDTH // 2, y_offset))
-            surface.blit(text, rect)
-            y_offset += 30
+        for label, instruction in zip(self.instruction_labels, instructions):
+            label.set_text(instruction)
+        
+        dirty.add_all(self.widgets.draw(surface))
 
 
 class HighScoresState(GameState):
     """Екран рекордів"""
     
-    def __init__(self, game_context):
-        super().__init__(game_context)
-        self.font = pygame.font.Font(None, LARGE_FONT_SIZE)
-        self.menu_font = pygame.font.Font(None, MENU_FONT_SIZE)
+    supports_dirty_rects = True
     
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -285,63 +308,55 @@ class HighScoresState(GameState):
     def update(self, dt):
         pass
     
-    def draw(self, surface):
-        self.context.background.draw(surface, self.context.current_time)
-        
-        title_text = self.font.render("РЕКОРДИ", True, YELLOW)
-        title_rect = title_text.get_rect(center=(WIDTH // 2, 60))
-        surface.blit(title_text, title_rect)
-        
+    def __init__(self, game_context):
+        super().__init__(game_context)
+        self.table = Table(["#", "РАХУНОК", "РІВЕНЬ", "ДАТА"], [0, 150, 350, 470], (150, 120),
+                           SMALL_FONT_SIZE)
+        self.title = Label("РЕКОРДИ", LARGE_FONT_SIZE, YELLOW, (WIDTH // 2, 60), 'center')
+        self.no_scores = Label("Рекордів поки немає", MENU_FONT_SIZE, WHITE,
+                               (WIDTH // 2, HEIGHT // 2), 'center')
+        self.back = Label("Натисніть ESC для повернення", MENU_FONT_SIZE, MENU_COLOR,
+                          (WIDTH // 2, HEIGHT - 50), 'center')
+        self.widgets = WidgetGroup()
+    
+    def on_enter(self):
+        # Рекорди змінюються лише поза цим екраном
         scores = self.context.high_score_manager.get_scores()
-        
-        if not scores:
-            no_scores_text = self.menu_font.render("Рекордів поки немає", True, WHITE)
-            no_scores_rect = no_scores_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-            surface.blit(no_scores_text, no_scores_rect)
-        else:
-            headers = ["#", "РАХУНОК", "РІВЕНЬ", "ДАТА"]
-            header_y = 120
-            x_positions = [150, 300, 500, 620]
-            
-            small_font = pygame.font.Font(None, SMALL_FONT_SIZE)
-            for i, header in enumerate(headers):
-                text = small_font.render(header, True, CYAN)
-                surface.blit(text, (x_positions[i], header_y))
-            
-            y_offset = header_y + 40
-            for i, score_data in enumerate(scores[:10]):
-                rank_text = small_font.render(f"{i + 1}", True, WHITE)
-                score_text = small_font.render(str(score_data['score']), True, WHITE)
-                level_text = small_font.render(str(score_data['level']), True, WHITE)
-                date_text = small_font.render(score_data['date'][:16], True, WHITE)
-                
-                surface.blit(rank_text, (x_positions[0], y_offset))
-                surface.blit(score_text, (x_positions[1], y_offset))
-                surface.blit(level_text, (x_positions[2], y_offset))
-                surface.blit(date_text, (x_positions[3], y_offset))
-                
-                y_offset += 35
-        
-        back_text = self.menu_font.render("Натисніть ESC для повернення", True, MENU_COLOR)
-        back_rect = back_text.get_rect(center=(WIDTH // 2, HEIGHT - 50))
-        surface.blit(back_text, back_rect)
+        self.table.set_rows((str(i + 1), str(score_data['score']), str(score_data['level']),
+                             score_data['date'][:16])
+                            for i, score_data in enumerate(scores[:10]))
+        self.widgets = WidgetGroup([self.title, self.table if scores else self.no_scores, self.back])
+    
+    def draw(self, surface):
+        # Змінюються лише зірки фону
+        dirty = self.context.dirty_regions
+        dirty.add_all(self.context.background.draw(surface, self.context.current_time))
+        dirty.add_all(self.widgets.draw(surface))
 
 
 class PauseState(GameState):
     """Стан паузи"""
     
+    supports_dirty_rects = True
+    overlay = True
+    
     def __init__(self, game_context):
         super().__init__(game_context)
         self.selected_index = 0
         self.menu_items = ["ПРОДОВЖИТИ", "ГОЛОВНЕ МЕНЮ"]
-        self.font = pygame.font.Font(None, LARGE_FONT_SIZE)
-        self.menu_font = pygame.font.Font(None, MENU_FONT_SIZE)
-        self.button_rects = []
         self.hovered_index = -1
+        
+        self.buttons = create_menu_buttons(self.menu_items, 280)
+        self.button_rects = [button.button_rect for button in self.buttons]
+        self.widgets = WidgetGroup([
+            Label("ПАУЗА", LARGE_FONT_SIZE, YELLOW, (WIDTH // 2, 150), 'center'),
+            *self.buttons,
+        ])
     
     def on_enter(self):
         self.selected_index = 0
         self.hovered_index = -1
+        self.context.frozen_frame.invalidate()
     
     def handle_event(self, event):
         # Клавіатура
@@ -394,47 +409,31 @@ class PauseState(GameState):
         pass
     
     def draw(self, surface):
-        # Малюємо гру під паузою (затемнену)
-        self.context.draw_game_background(surface)
-        
-        pause_surface = pygame.Surface((WIDTH, HEIGHT))
-        pause_surface.set_alpha(180)
-        pause_surface.fill(BLACK)
-        surface.blit(pause_surface, (0, 0))
-        
-        title_text = self.font.render("ПАУЗА", True, YELLOW)
-        title_rect = title_text.get_rect(center=(WIDTH // 2, 150))
-        surface.blit(title_text, title_rect)
-        
-        button_width = 300
-        button_height = 60
-        button_spacing = 20
-        start_y = 280
-        
-        # Очищаємо список кнопок
-        self.button_rects = []
-        
-        for i, item in enumerate(self.menu_items):
-            button_rect = pygame.Rect(
-                WIDTH // 2 - button_width // 2,
-                start_y + i * (button_height + button_spacing),
-                button_width,
-                button_height
-            )
-            self.button_rects.append(button_rect)
-            
-            # Визначаємо чи кнопка вибрана або під курсором
-            is_selected = i == self.selected_index or i == self.hovered_index
-            draw_button(surface, item, button_rect, self.menu_font, is_selected)
+        # Гра під паузою - затемнений знімок, знятий при вході
+        ctx = self.context
+        ctx.dirty_regions.add(ctx.frozen_frame.draw(surface, ctx.draw_playfield, OVERLAY_DIM_ALPHA))
+        
+        self._update_buttons(self.buttons, self.selected_index, self.hovered_index)
+        self.context.dirty_regions.add_all(self.widgets.draw(surface))
 
 
 class LevelTransitionState(GameState):
     """Перехід між рівнями"""
     
+    supports_dirty_rects = True
+    overlay = True
+    
     def __init__(self, game_context):
         super().__init__(game_context)
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        self.large_font = pygame.font.Font(None, LARGE_FONT_SIZE)
+        self.message_label = Label("", LARGE_FONT_SIZE, WHITE, (WIDTH // 2, HEIGHT // 2 - 50), 'center')
+        self.widgets = WidgetGroup([
+            self.message_label,
+            Label("Натисніть Enter", FONT_SIZE, WHITE, (WIDTH // 2, HEIGHT // 2 + 10), 'center'),
+        ])
+    
+    def on_enter(self):
+        self.message_label.set_text(f"РІВЕНЬ {self.context.level}")
+        self.context.frozen_frame.invalidate()
     
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -447,23 +446,35 @@ class LevelTransitionState(GameState):
         pass
     
     def draw(self, surface):
-        self.context.draw_game_background(surface)
-        
-        message_text = self.large_font.render(f"РІВЕНЬ {self.context.level}", True, WHITE)
-        instruction_text = self.font.render("Натисніть Enter", True, WHITE)
-        message_rect = message_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 50))
-        instruction_rect = instruction_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 10))
-        surface.blit(message_text, message_rect)
-        surface.blit(instruction_text, instruction_rect)
+        ctx = self.context
+        ctx.dirty_regions.add(ctx.frozen_frame.draw(surface, ctx.draw_playfield))
+        ctx.dirty_regions.add_all(self.widgets.draw(surface))
 
 
 class GameOverState(GameState):
     """Кінець гри"""
     
+    supports_dirty_rects = True
+    overlay = True
+    
     def __init__(self, game_context):
         super().__init__(game_context)
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        self.large_font = pygame.font.Font(None, LARGE_FONT_SIZE)
+        self.large_font = get_font(LARGE_FONT_SIZE)
+        self.score_label = Label("", FONT_SIZE, WHITE, (WIDTH // 2, HEIGHT // 2 - 10), 'center')
+        self.instruction_label = Label("Натисніть Enter для головного меню", FONT_SIZE, WHITE,
+                                       (WIDTH // 2, HEIGHT // 2 + 40), 'center')
+        self.record_label = Label("🏆 НОВИЙ РЕКОРД! 🏆", FONT_SIZE, YELLOW,
+                                  (WIDTH // 2, HEIGHT // 2 + 80), 'center')
+        self.widgets = WidgetGroup([])
+    
+    def on_enter(self):
+        ctx = self.context
+        self.score_label.set_text(f"Ваш рахунок: {ctx.score}")
+        widgets = [self.score_label, self.instruction_label]
+        if ctx.high_score_manager.is_high_score(ctx.score):
+            widgets.append(self.record_label)
+        self.widgets = WidgetGroup(widgets)
+        ctx.frozen_frame.invalidate()
     
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -476,32 +487,20 @@ class GameOverState(GameState):
         pass
     
     def draw(self, surface):
-        self.context.draw_game_background(surface)
-        
-        draw_pulsing_text(surface, "ГРА ЗАКІНЧЕНА", self.large_font, (WIDTH // 2, HEIGHT // 2 - 80), 
-                         RED, self.context.current_time, scale_range=(1.0, 1.2))
-        
-        score_text = self.font.render(f"Ваш рахунок: {self.context.score}", True, WHITE)
-        instruction_text = self.font.render("Натисніть Enter для головного меню", True, WHITE)
-        
-        score_rect = score_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 - 10))
-        instruction_rect = instruction_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 40))
-        
-        surface.blit(score_text, score_rect)
-        surface.blit(instruction_text, instruction_rect)
+        ctx = self.context
+        dirty = ctx.dirty_regions
+        dirty.add(ctx.frozen_frame.draw(surface, ctx.draw_playfield))
         
-        if self.context.high_score_manager.is_high_score(self.context.score):
-            new_record_text = self.font.render("🏆 НОВИЙ РЕКОРД! 🏆", True, YELLOW)
-            new_record_rect = new_record_text.get_rect(center=(WIDTH // 2, HEIGHT // 2 + 80))
-            surface.blit(new_record_text, new_record_rect)
+        dirty.add(draw_pulsing_text(surface, "ГРА ЗАКІНЧЕНА", self.large_font, (WIDTH // 2, HEIGHT // 2 - 80),
+                                    RED, ctx.current_time, scale_range=(1.0, 1.2)))
+        dirty.add_all(self.widgets.draw(surface))
 
 
 class PlayingState(GameState):
     """Активна гра"""
     
-    def __init__(self, game_context):
-        super().__init__(game_context)
-        self.font = pygame.font.Font(None, FONT_SIZE)
+    supports_native = True
+    supports_dirty_rects = True
     
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -530,14 +529,17 @@ class PlayingState(GameState):
             ctx.sound_manager.play_powerup()
             ctx.particle_system.create_sparkle(bonus.rect.centerx, bonus.rect.centery, bonus.color)
             ctx.bonus_manager.apply_bonus(bonus)
+            ctx.notifications.add_bonus_popup(bonus.rect.centerx, bonus.rect.top, bonus.config['name'])
             
             if bonus.bonus_type == BonusType.EXTRA_LIFE:
                 ctx.lives += 1
             elif bonus.bonus_type == BonusType.MULTI_BALL:
                 ctx.activate_multiball()
         
-        # Оновлення м'ячів
+        # Оновлення м'ячів та тремтіння цеглинок
         self._update_balls(dt)
+        for brick in ctx.bricks:
+            brick.update(dt)
         
         # Перевірка перемоги
         all_bricks_destroyed = True
@@ -570,10 +572,6 @@ class PlayingState(GameState):
             
             b.vx, b.vy = original_vx, original_vy
             
-            # Трейл
-            if i == 0:
-                ctx.ball_trail.add_position(b.centerx, b.centery)
-            
             # Відбиття від стін
             physics.handle_wall_collision(b, ctx.sound_manager)
             
@@ -592,6 +590,10 @@ class PlayingState(GameState):
         for index in sorted(balls_to_remove, reverse=True):
             ctx.balls.pop(index)
         
+        # Сліди всіх м'ячів
+        if ctx.quality.ball_trail:
+            ctx.ball_trail.update(ctx.balls)
+        
         # Якщо всі м'ячі втрачено
         if not ctx.balls:
             ctx.lives -= 1
@@ -607,8 +609,8 @@ class PlayingState(GameState):
         
         return None
     
-    def draw(self, surface):
+    def draw(self, surface, viewport=IDENTITY):
         ctx = self.context
-        ctx.draw_game_background(surface)
-        ctx.render_ui(surface, self.font)
+        # Поле - у динамічній роздільності, HUD - завжди в повній
+        ctx.draw_game(surface, viewport)
 
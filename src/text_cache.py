@@ -0,0 +1,205 @@
+"""
+Реєстр шрифтів та кеш відрендереного тексту
+"""
+import pygame
+from collections import OrderedDict
+from display_format import convert_surface, register_source
+from game_config import TEXT_CACHE_SIZE
+
+
+class FontRegistry:
+    """Реєстр шрифтів: один екземпляр pygame.font.Font на кожен розмір"""
+    
+    def __init__(self):
+        """Ініціалізація реєстру"""
+        self._fonts = {}
+    
+    def get(self, size):
+        """
+        Повертає шрифт заданого розміру (створює лише при першому запиті)
+        
+        Args:
+            size: Розмір шрифту
+        
+        Returns:
+            pygame.font.Font: Спільний екземпляр шрифту
+        """
+        font = self._fonts.get(size)
+        if font is None:
+            font = pygame.font.Font(None, size)
+            self._fonts[size] = font
+        return font
+    
+    def clear(self):
+        """Забуває всі створені шрифти"""
+        self._fonts.clear()
+
+
+class TextCache:
+    """LRU кеш текстових поверхонь з ключем (текст, розмір, колір)"""
+    
+    def __init__(self, fonts, max_entries=TEXT_CACHE_SIZE):
+        """
+        Ініціалізація кешу
+        
+        Args:
+            fonts: FontRegistry для отримання шрифтів
+            max_entries: Максимальна кількість збережених поверхонь
+        """
+        self.fonts = fonts
+        self.max_entries = max_entries
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def render(self, text, size, color):
+        """
+        Повертає відрендерений текст (з кешу або новий)
+        
+        Args:
+            text: Рядок тексту
+            size: Розмір шрифту
+            color: Колір тексту (R, G, B)
+        
+        Returns:
+            pygame.Surface: Поверхня з текстом (не змінювати - вона спільна)
+        """
+        key = (text, size, tuple(color))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        
+        self.misses += 1
+        surface = convert_surface(self.fonts.get(size).render(text, True, key[2]), alpha=True)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_entries:
+            self._surfaces.popitem(last=False)
+        return surface
+    
+    def clear(self):
+        """Очищає кеш"""
+        self._surfaces.clear()
+    
+    def iter_surfaces(self):
+        """Пари (ключ, поверхня) усіх збережених текстів"""
+        return list(self._surfaces.items())
+    
+    def __len__(self):
+        return len(self._surfaces)
+
+
+class DigitAtlas:
+    """
+    Атлас гліфів для чисел у HUD
+    
+    Кожен символ растеризується один раз, а число, що змінюється,
+    складається з готових гліфів одним викликом blits().
+    """
+    
+    DEFAULT_CHARS = "0123456789+-x:.s "
+    
+    def __init__(self, font, color, chars=DEFAULT_CHARS):
+        """
+        Ініціалізація атласу
+        
+        Args:
+            font: Шрифт для растеризації гліфів
+            color: Колір гліфів (R, G, B)
+            chars: Набір символів атласу
+        """
+        self.glyphs = {char: convert_surface(font.render(char, True, color), alpha=True) for char in chars}
+        self.height = font.get_height()
+    
+    def get_width(self, text):
+        """Повертає ширину рядка в пікселях"""
+        return sum(self.glyphs[char].get_width() for char in text)
+    
+    def draw(self, surface, text, pos):
+        """
+        Малює рядок з гліфів атласу
+        
+        Args:
+            surface: Поверхня для малювання
+            text: Рядок (лише символи атласу)
+            pos: Лівий верхній кут (x, y)
+        
+        Returns:
+            pygame.Rect: Область, яку зайняв текст
+        """
+        x, y = pos
+        blit_sequence = []
+        for char in text:
+            glyph = self.glyphs[char]
+            blit_sequence.append((glyph, (x, y)))
+            x += glyph.get_width()
+        surface.blits(blit_sequence, doreturn=False)
+        return pygame.Rect(pos[0], y, x - pos[0], self.height)
+
+
+# Спільні екземпляри для всієї гри
+_font_registry = FontRegistry()
+_text_cache = TextCache(_font_registry)
+_digit_atlases = {}
+
+
+def get_font(size):
+    """Повертає спільний шрифт заданого розміру"""
+    return _font_registry.get(size)
+
+
+def render_text(text, size, color):
+    """
+    Повертає кешовану поверхню з текстом
+    
+    Args:
+        text: Рядок тексту
+        size: Розмір шрифту
+        color: Колір тексту (R, G, B)
+    
+    Returns:
+        pygame.Surface: Поверхня з текстом
+    """
+    return _text_cache.render(text, size, color)
+
+
+def get_digit_atlas(size, color):
+    """
+    Повертає атлас цифр для заданого розміру та кольору
+    
+    Args:
+        size: Розмір шрифту
+        color: Колір гліфів (R, G, B)
+    
+    Returns:
+        DigitAtlas: Спільний атлас
+    """
+    key = (size, tuple(color))
+    atlas = _digit_atlases.get(key)
+    if atlas is None:
+        atlas = DigitAtlas(get_font(size), key[1])
+        _digit_atlases[key] = atlas
+    return atlas
+
+
+def _iter_text_surfaces():
+    """Поверхні кешу тексту та гліфи атласів цифр (для перевірки формату)"""
+    surfaces = _text_cache.iter_surfaces()
+    for key, atlas in _digit_atlases.items():
+        surfaces.extend(((key, char), glyph) for char, glyph in atlas.glyphs.items())
+    return surfaces
+
+
+def _reset_text():
+    """Відкидає відрендерений текст і атласи (після зміни формату дисплея)"""
+    _text_cache.clear()
+    _digit_atlases.clear()
+
+
+register_source('text', _iter_text_surfaces, _reset_text)
+
+
+def get_text_cache():
+    """Повертає спільний кеш тексту (для статистики та очищення)"""
+    return _text_cache
@@ -0,0 +1,296 @@
+"""
+Текстурний бекенд виводу: рендерер SDL (pygame._sdl2.video) замість масштабування поверхонь
+"""
+import os
+import weakref
+from collections import OrderedDict
+import pygame
+from pygame._sdl2.video import Window, Renderer, Texture, error as SDLError
+from presentation import Presenter, SCALE_SMOOTH
+from viewport import Viewport, IDENTITY
+from game_config import BLACK, PRESENTATION_SCALE_MODE, TEXTURE_CACHE_SIZE
+
+# Режими змішування SDL (SDL_BlendMode)
+SDL_BLENDMODE_BLEND = 1
+SDL_BLENDMODE_ADD = 2
+SDL_BLENDMODE_MOD = 4
+
+# Множники та операція для власного режиму змішування
+SDL_BLENDFACTOR_ONE = 2
+SDL_BLENDFACTOR_ONE_MINUS_SRC_ALPHA = 6
+SDL_BLENDOPERATION_ADD = 1
+
+
+class TextureCache:
+    """
+    Текстури спрайтів, завантажені в рендерер один раз
+    
+    Ключ - сама поверхня: спрайти беруться з кешів (атласи частинок,
+    м'ячі, капсули бонусів, панелі HUD) і після створення не змінюються.
+    Коли поверхню звільнено, її текстура видаляється; кількість текстур
+    обмежена, найдавніше використані витісняються першими.
+    """
+    
+    def __init__(self, renderer, max_size=TEXTURE_CACHE_SIZE):
+        """
+        Ініціалізація кешу
+        
+        Args:
+            renderer: Рендерер, якому належать текстури
+            max_size: Максимальна кількість текстур
+        """
+        self.renderer = renderer
+        self.max_size = max_size
+        self.uploads = 0
+        self._entries = OrderedDict()
+    
+    def get(self, surface):
+        """
+        Повертає текстуру поверхні (завантажує при першому запиті)
+        
+        Args:
+            surface: Незмінна поверхня спрайта
+        
+        Returns:
+            Texture: Текстура з режимом змішування, як у поверхні
+        """
+        key = id(surface)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is surface:
+            self._entries.move_to_end(key)
+            return entry[1]
+        
+        texture = Texture.from_surface(self.renderer, surface)
+        # Колбек спрацьовує при звільненні поверхні, до того як її id знову стане вільним
+        ref = weakref.ref(surface, lambda _, key=key: self._entries.pop(key, None))
+        self._entries[key] = (ref, texture)
+        self.uploads += 1
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return texture
+    
+    def clear(self):
+        """Видаляє всі текстури"""
+        self._entries.clear()
+
+
+class TextureCanvas:
+    """
+    Канва спрайтів, що збирає кадр з копій текстур
+    
+    Має ту частину інтерфейсу pygame.Surface, якою користуються спрайтові
+    шари (blit, blits, розміри), тож шари малюють у неї без змін. Виклики
+    лише записуються: виконуються вони після того, як у рендерер виведено
+    сам кадр, щоб спрайти лягли поверх нього в тому ж порядку.
+    """
+    
+    def __init__(self, textures, premultiplied_mode=SDL_BLENDMODE_BLEND):
+        """
+        Ініціалізація канви
+        
+        Args:
+            textures: TextureCache рендерера
+            premultiplied_mode: Режим SDL для BLEND_PREMULTIPLIED (якщо рендерер
+                не підтримує власних режимів - звичайне альфа-змішування)
+        """
+        self.textures = textures
+        self.viewport = IDENTITY
+        self.commands = []
+        self._size = (0, 0)
+        self._blend_modes = {
+            pygame.BLEND_ADD: SDL_BLENDMODE_ADD,
+            pygame.BLEND_MULT: SDL_BLENDMODE_MOD,
+            pygame.BLEND_PREMULTIPLIED: premultiplied_mode,
+        }
+    
+    def begin(self, viewport, size):
+        """
+        Починає новий кадр
+        
+        Args:
+            viewport: Трансформація логічних координат у пікселі канви
+            size: Розмір канви в пікселях
+        """
+        self.commands.clear()
+        self.viewport = viewport
+        self._size = size
+    
+    def blit(self, source, dest, area=None, special_flags=0):
+        """Записує копіювання спрайта (як Surface.blit)"""
+        size = area[2:] if area is not None else source.get_size()
+        rect = pygame.Rect(dest[0], dest[1], *size)
+        if rect.width > 0 and rect.height > 0:
+            self.commands.append((source, rect, area, special_flags))
+        return rect
+    
+    def blits(self, blit_sequence, doreturn=True):
+        """Записує послідовність копіювань (як Surface.blits)"""
+        rects = [self.blit(*item) for item in blit_sequence]
+        return rects if doreturn else None
+    
+    def get_size(self):
+        """Розмір канви"""
+        return self._size
+    
+    def get_rect(self, **kwargs):
+        """Прямокутник канви (як Surface.get_rect)"""
+        rect = pygame.Rect((0, 0), self._size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+    
+    def flush(self):
+        """Виконує записані копіювання в поточну ціль рендерера"""
+        blend_modes = self._blend_modes
+        for source, rect, area, special_flags in self.commands:
+            texture = self.textures.get(source)
+            blend_mode = blend_modes.get(special_flags)
+            if blend_mode is None:
+                texture.draw(area, rect)
+            else:
+                default, texture.blend_mode = texture.blend_mode, blend_mode
+                texture.draw(area, rect)
+                texture.blend_mode = default
+        self.commands.clear()
+
+
+class TexturePresenter(Presenter):
+    """
+    Виводить кадр через рендерер SDL
+    
+    Логічний кадр щокадру оновлює одну потокову текстуру, а масштабує її
+    до розміру вікна сам рендерер. Спрайтові шари ігрового процесу
+    записуються в канву (begin_canvas) і копіюються текстурами поверх кадру
+    в нативній роздільності - їхні поверхні завантажуються лише раз.
+    Спершу пробується апаратний рендерер, за його відсутності - програмний.
+    """
+    
+    def __init__(self, logical_size, mode=PRESENTATION_SCALE_MODE):
+        """
+        Ініціалізація виводу
+        
+        Args:
+            logical_size: Логічний розмір гри (ширина, висота)
+            mode: Режим масштабування (один з SCALE_MODES; 'sdl' - як 'nearest')
+        """
+        super().__init__(logical_size, mode)
+        self.window = None
+        self.renderer = None
+        self.accelerated = False
+        self.textures = None
+        self.canvas = None
+        self._frame_texture = None
+    
+    def set_display_mode(self, fullscreen):
+        """
+        Створює вікно з рендерером (один раз) і перемикає повноекранний режим
+        
+        Args:
+            fullscreen: True для повноекранного режиму
+        
+        Returns:
+            Window: Вікно SDL
+        """
+        if self.window is None:
+            self._create_window()
+        if fullscreen:
+            self.window.set_fullscreen(desktop=True)
+        else:
+            self.window.set_windowed()
+            self.window.size = self.logical_size
+        
+        self.invalidate()
+        return self.window
+    
+    def _create_window(self):
+        """Створює вікно, рендерер (апаратний, інакше програмний) і кеш текстур"""
+        # Підказка читається при створенні текстур і задає фільтр масштабування
+        os.environ['SDL_RENDER_SCALE_QUALITY'] = 'linear' if self.mode == SCALE_SMOOTH else 'nearest'
+        self.window = Window(size=self.logical_size)
+        try:
+            self.renderer = Renderer(self.window, accelerated=1)
+            self.accelerated = True
+        except SDLError:
+            self.renderer = Renderer(self.window, accelerated=0)
+            self.accelerated = False
+        self.renderer.draw_color = (*BLACK, 255)
+        
+        self.textures = TextureCache(self.renderer)
+        self.canvas = TextureCanvas(self.textures, self._probe_premultiplied_mode())
+        self._frame_texture = None
+    
+    def _probe_premultiplied_mode(self):
+        """Режим змішування для premultiplied-спрайтів, якщо рендерер його підтримує"""
+        mode = Renderer.compose_custom_blend_mode(
+            (SDL_BLENDFACTOR_ONE, SDL_BLENDFACTOR_ONE_MINUS_SRC_ALPHA, SDL_BLENDOPERATION_ADD),
+            (SDL_BLENDFACTOR_ONE, SDL_BLENDFACTOR_ONE_MINUS_SRC_ALPHA, SDL_BLENDOPERATION_ADD))
+        try:
+            Texture(self.renderer, (1, 1)).blend_mode = mode
+        except (SDLError, pygame.error):
+            return SDL_BLENDMODE_BLEND
+        return mode
+    
+    def begin_canvas(self, window, shake_offset=(0, 0)):
+        """
+        Починає запис спрайтів поверх кадру
+        
+        Координати канви відлічуються від кута ігрової області (її задає
+        present()), тож у трансформації немає зміщення.
+        
+        Args:
+            window: Вікно SDL
+            shake_offset: Зміщення тремтіння екрану (враховує present())
+        
+        Returns:
+            TextureCanvas: Канва з трансформацією у нативну роздільність
+        """
+        scale = self.get_transform(window)[0]
+        size = (int(self.logical_size[0] * scale), int(self.logical_size[1] * scale))
+        self.canvas.begin(Viewport(scale), size)
+        return self.canvas
+    
+    def present(self, window, frame, shake_offset=(0, 0)):
+        """
+        Виводить кадр і записані спрайти у рендерер (без present)
+        
+        Args:
+            window: Вікно SDL
+            frame: Логічна ігрова поверхня
+            shake_offset: Зміщення тремтіння екрану (x, y)
+        """
+        scale, offset_x, offset_y = self.get_transform(window)
+        size = (int(self.logical_size[0] * scale), int(self.logical_size[1] * scale))
+        area = pygame.Rect((offset_x + shake_offset[0], offset_y + shake_offset[1]), size)
+        
+        texture = self._frame_texture
+        if texture is None or texture.get_rect().size != frame.get_size():
+            texture = self._frame_texture = Texture(self.renderer, frame.get_size(), streaming=True)
+        texture.update(frame)
+        
+        renderer = self.renderer
+        renderer.clear()
+        renderer.set_viewport(area)
+        texture.draw(None, pygame.Rect((0, 0), size))
+        self.canvas.flush()
+        renderer.set_viewport(None)
+    
+    def flip(self):
+        """Показує виведений кадр"""
+        self.renderer.present()
+    
+    def set_caption(self, title):
+        """Задає заголовок вікна"""
+        self.window.title = title
+    
+    def is_identity(self, window):
+        """Кадр завжди проходить через рендерер, тож вивід змінених областей не застосовний"""
+        return False
+    
+    def supports_native(self, window):
+        """Нативну роздільність дає канва спрайтів, а не малювання у вікно"""
+        return False
+    
+    @staticmethod
+    def _get_window_size(window):
+        """Розмір вікна SDL у пікселях"""
+        return window.size
@@ -3,47 +3,266 @@ UI Components Module - Reusable UI elements for the game
 """
 import pygame
 import math
+import weakref
+import numpy as np
+from abc import ABC, abstractmethod
+from display_format import create_surface, register_source
 from game_config import (
     WHITE, BLACK, CYAN, MAGENTA, YELLOW, GREEN,
-    NEON_THEME, SMALL_FONT_SIZE
+    NEON_THEME, SMALL_FONT_SIZE,
+    MENU_SELECTED_COLOR, BUTTON_BG_COLOR, BUTTON_BORDER_COLOR
 )
+from text_cache import get_font, render_text, get_digit_atlas
+from animation_strips import get_strip
 
 
-class ProgressBar:
+# Період пульсації тексту комбо (синусоїда sin(t * 10))
+COMBO_PULSE_PERIOD = 2 * math.pi / 10
+
+# Усі створені віджети (після зміни формату дисплея рендеряться заново)
+_widgets = weakref.WeakSet()
+
+
+def _iter_widget_surfaces():
+    """Пари ((клас, id), поверхня) відрендерених віджетів (для перевірки формату)"""
+    return [((type(widget).__name__, id(widget)), widget._surface) for widget in list(_widgets)]
+
+
+def _reset_widgets():
+    """Позначає всі віджети для повторного рендерингу (після зміни формату дисплея)"""
+    for widget in list(_widgets):
+        widget.invalidate()
+
+
+register_source('widgets', _iter_widget_surfaces, _reset_widgets)
+
+
+class Widget(ABC):
+    """
+    Віджет з кешованою поверхнею (retained mode)
+    
+    Поверхня рендериться лише після invalidate(), тобто після зміни стану
+    віджета (тексту, виділення, значення). На кожному кадрі віджет лише
+    копіюється на екран.
+    """
+    
+    def __init__(self, pos=(0, 0), anchor='topleft'):
+        """
+        Ініціалізація віджета
+        
+        Args:
+            pos: Позиція точки прив'язки
+            anchor: Точка прив'язки (атрибут pygame.Rect: topleft, center, ...)
+        """
+        self.pos = pos
+        self.anchor = anchor
+        self.rect = None
+        self._surface = None
+        self._previous_rect = None
+        self.changed = True
+        _widgets.add(self)
+    
+    def invalidate(self):
+        """Позначає віджет для повторного рендерингу"""
+        self._surface = None
+    
+    @abstractmethod
+    def render(self):
+        """Рендерить поверхню віджета"""
+        pass
+    
+    def get_surface(self):
+        """Повертає кешовану поверхню (рендерить, якщо віджет змінився)"""
+        if self._surface is None:
+            self._surface = self.render()
+            self._previous_rect = self.rect
+            self.rect = self._surface.get_rect(**{self.anchor: self.pos})
+            self.changed = True
+        return self._surface
+    
+    def pop_changes(self):
+        """
+        Повертає області, змінені з попереднього малювання
+        
+        Returns:
+            list: Стара та нова область віджета (порожній, якщо не змінювався)
+        """
+        if not self.changed:
+            return []
+        self.changed = False
+        return [rect for rect in (self._previous_rect, self.rect) if rect]
+    
+    def draw(self, surface):
+        """
+        Малює віджет
+        
+        Returns:
+            list: Змінені області (див. pop_changes)
+        """
+        surface.blit(self.get_surface(), self.rect)
+        return self.pop_changes()
+
+
+class Label(Widget):
+    """Текстова мітка"""
+    
+    def __init__(self, text, font_size, color, pos=(0, 0), anchor='topleft'):
+        super().__init__(pos, anchor)
+        self.text = text
+        self.font_size = font_size
+        self.color = color
+    
+    def set_text(self, text):
+        """Змінює текст (рендер лише при реальній зміні)"""
+        if text != self.text:
+            self.text = text
+            self.invalidate()
+    
+    def render(self):
+        return render_text(self.text, self.font_size, self.color)
+
+
+class Button(Widget):
+    """Кнопка меню"""
+    
+    def __init__(self, text, rect, font_size, selected=False):
+        self.button_rect = pygame.Rect(rect)
+        super().__init__(self.button_rect.topleft)
+        self.text = text
+        self.font_size = font_size
+        self.selected = selected
+    
+    def set_selected(self, selected):
+        """Змінює виділення (рендер лише при реальній зміні)"""
+        if selected != self.selected:
+            self.selected = selected
+            self.invalidate()
+    
+    def render(self):
+        surface = create_surface(self.button_rect.size)
+        rect = surface.get_rect()
+        surface.fill(MENU_SELECTED_COLOR if self.selected else BUTTON_BG_COLOR)
+        pygame.draw.rect(surface, BUTTON_BORDER_COLOR, rect, 3)
+        
+        text_color = BLACK if self.selected else WHITE
+        text_surface = render_text(self.text, self.font_size, text_color)
+        surface.blit(text_surface, text_surface.get_rect(center=rect.center))
+        return surface
+
+
+class Table(Widget):
+    """Таблиця з заголовком (наприклад, рекорди)"""
+    
+    def __init__(self, headers, column_x, pos, font_size, header_color=CYAN, color=WHITE,
+                 header_gap=40, row_height=35):
+        """
+        Ініціалізація таблиці
+        
+        Args:
+            headers: Заголовки колонок
+            column_x: Зміщення колонок відносно лівого краю таблиці
+            pos: Лівий верхній кут таблиці
+            font_size: Розмір шрифту
+            header_color: Колір заголовків
+            color: Колір комірок
+            header_gap: Відстань від заголовка до першого рядка
+            row_height: Висота рядка
+        """
+        super().__init__(pos)
+        self.headers = tuple(headers)
+        self.column_x = column_x
+        self.font_size = font_size
+        self.header_color = header_color
+        self.color = color
+        self.header_gap = header_gap
+        self.row_height = row_height
+        self.rows = ()
+    
+    def set_rows(self, rows):
+        """Змінює рядки таблиці (рендер лише при реальній зміні)"""
+        rows = tuple(tuple(row) for row in rows)
+        if rows != self.rows:
+            self.rows = rows
+            self.invalidate()
+    
+    def render(self):
+        cells = [(render_text(text, self.font_size, self.header_color), (x, 0))
+                 for text, x in zip(self.headers, self.column_x)]
+        for i, row in enumerate(self.rows):
+            y = self.header_gap + i * self.row_height
+            cells.extend((render_text(text, self.font_size, self.color), (x, y))
+                         for text, x in zip(row, self.column_x))
+        
+        width = max(x + text.get_width() for text, (x, y) in cells)
+        height = max(y + text.get_height() for text, (x, y) in cells)
+        surface = create_surface((width, height), alpha=True)
+        surface.blits(cells, doreturn=False)
+        return surface
+
+
+class WidgetGroup:
+    """Набір віджетів, що малюються одним викликом blits()"""
+    
+    def __init__(self, widgets=()):
+        self.widgets = list(widgets)
+    
+    def draw(self, surface):
+        """
+        Малює всі віджети
+        
+        Returns:
+            list: Області віджетів, змінених з попереднього малювання
+        """
+        sequence = [(widget.get_surface(), widget.rect) for widget in self.widgets]
+        surface.blits(sequence, doreturn=False)
+        changed = []
+        for widget in self.widgets:
+            changed.extend(widget.pop_changes())
+        return changed
+
+
+class ProgressBar(Widget):
     """Прогрес-бар з градієнтом"""
     
     def __init__(self, x, y, width, height, color_start=CYAN, color_end=MAGENTA):
+        super().__init__((x, y))
+        self.size = (width, height)
         self.rect = pygame.Rect(x, y, width, height)
         self.color_start = color_start
         self.color_end = color_end
         self.progress = 0.0  # 0.0 to 1.0
-        
+    
     def set_progress(self, value):
-        """Встановити прогрес (0.0 - 1.0)"""
+        """Встановити прогрес (0.0 - 1.0); рендер лише при зміні заповнення"""
+        old_width = self._fill_width()
         self.progress = max(0.0, min(1.0, value))
+        if self._fill_width() != old_width:
+            self.invalidate()
+    
+    def _fill_width(self):
+        return int(self.size[0] * self.progress)
+    
+    def render(self):
+        """Рендерить прогрес-бар"""
+        surface = create_surface(self.size, alpha=True)
+        rect = surface.get_rect()
         
-    def draw(self, surface):
-        """Малює прогрес-бар"""
         # Фон
-        pygame.draw.rect(surface, (40, 40, 60), self.rect, border_radius=5)
-        pygame.draw.rect(surface, CYAN, self.rect, 2, border_radius=5)
+        pygame.draw.rect(surface, (40, 40, 60), rect, border_radius=5)
+        pygame.draw.rect(surface, CYAN, rect, 2, border_radius=5)
         
-        # Заповнення
-        if self.progress > 0:
-            fill_width = int(self.rect.width * self.progress)
-            fill_rect = pygame.Rect(self.rect.x, self.rect.y, fill_width, self.rect.height)
-            
-            # Градієнт ефект (простий)
-            for i in range(fill_width):
-                ratio = i / max(1, fill_width)
-                color = (
-                    int(self.color_start[0] * (1 - ratio) + self.color_end[0] * ratio),
-                    int(self.color_start[1] * (1 - ratio) + self.color_end[1] * ratio),
-                    int(self.color_start[2] * (1 - ratio) + self.color_end[2] * ratio)
-                )
-                pygame.draw.line(surface, color, 
-                               (self.rect.x + i, self.rect.y),
-                               (self.rect.x + i, self.rect.y + self.rect.height))
+        # Заповнення - горизонтальний градієнт одним записом масиву
+        fill_width = self._fill_width()
+        if fill_width > 0:
+            ratio = (np.arange(fill_width) / fill_width)[:, None]
+            colors = np.array(self.color_start) * (1 - ratio) + np.array(self.color_end) * ratio
+            pixels = pygame.surfarray.pixels3d(surface)
+            pixels[:fill_width] = colors.astype(np.uint8)[:, None, :]
+            del pixels
+            alpha = pygame.surfarray.pixels_alpha(surface)
+            alpha[:fill_width] = 255
+            del alpha
+        return surface
 
 
 class BonusTimer:
@@ -54,8 +273,7 @@ class BonusTimer:
         self.y = y
         self.width = width
         self.height = height
-        self.font = pygame.font.Font(None, SMALL_FONT_SIZE)
-        
+    
     def draw(self, surface, bonus_type, time_remaining, max_time):
         """Малює таймер бонусу"""
         # Фон
@@ -65,7 +283,7 @@ class BonusTimer:
         
         # Іконка/текст бонусу
         bonus_name = self._get_bonus_name(bonus_type)
-        text = self.font.render(bonus_name, True, YELLOW)
+        text = render_text(bonus_name, SMALL_FONT_SIZE, YELLOW)
         surface.blit(text, (self.x + 10, self.y + 5))
         
         # Прогрес-бар часу
@@ -87,8 +305,8 @@ class BonusTimer:
                            (bar_x, bar_y, fill_width, bar_height), border_radius=3)
         
         # Час
-        time_text = self.font.render(f"{time_remaining:.1f}s", True, WHITE)
-        surface.blit(time_text, (self.x + self.width - 50, self.y + 5))
+        get_digit_atlas(SMALL_FONT_SIZE, WHITE).draw(
+            surface, f"{time_remaining:.1f}s", (self.x + self.width - 50, self.y + 5))
     
     def _get_bonus_name(self, bonus_type):
         """Отримує назву бонусу"""
@@ -113,13 +331,13 @@ class AnimatedCounter:
         self.current_value = 0
         self.target_value = 0
         self.display_value = 0.0
-        self.font = pygame.font.Font(None, font_size)
+        self.font_size = font_size
         self.animation_speed = 50  # points per second
-        
+    
     def set_value(self, value):
         """Встановити цільове значення"""
         self.target_value = value
-        
+    
     def update(self, dt):
         """Оновити анімацію"""
         if self.display_value < self.target_value:
@@ -127,12 +345,13 @@ class AnimatedCounter:
             self.display_value = min(self.display_value + increment, self.target_value)
         elif self.display_value > self.target_value:
             self.display_value = self.target_value
-            
+    
     def draw(self, surface, color=WHITE):
         """Малює лічильник"""
-        text = self.font.render(str(int(self.display_value)), True, color)
-        rect = text.get_rect(center=(self.x, self.y))
-        surface.blit(text, rect)
+        atlas = get_digit_atlas(self.font_size, color)
+        text = str(int(self.display_value))
+        width = atlas.get_width(text)
+        atlas.draw(surface, text, (self.x - width // 2, self.y - atlas.height // 2))
 
 
 class FloatingText:
@@ -144,35 +363,34 @@ class FloatingText:
         self.start_y = y
         self.text = text
         self.color = color
-        self.font = pygame.font.Font(None, font_size)
+        self.font = get_font(font_size)
+        # Растеризуємо один раз у власну поверхню (set_alpha не зачіпає спільний кеш)
+        self.text_surface = self.font.render(text, True, color)
         self.lifetime = 1.5  # seconds
         self.elapsed = 0.0
         self.active = True
-        
+    
     def update(self, dt):
         """Оновити анімацію"""
         self.elapsed += dt
         if self.elapsed >= self.lifetime:
             self.active = False
             return
-            
+        
         # Рух вгору
         self.y = self.start_y - (self.elapsed / self.lifetime) * 60
-        
+    
     def draw(self, surface):
         """Малює текст"""
         if not self.active:
             return
-            
+        
         # Прозорість
         alpha = int(255 * (1 - self.elapsed / self.lifetime))
         
-        # Створюємо surface з прозорістю
-        text_surface = self.font.render(self.text, True, self.color)
-        text_surface.set_alpha(alpha)
-        
-        rect = text_surface.get_rect(center=(int(self.x), int(self.y)))
-        surface.blit(text_surface, rect)
+        self.text_surface.set_alpha(alpha)
+        rect = self.text_surface.get_rect(center=(int(self.x), int(self.y)))
+        return surface.blit(self.text_surface, rect)
 
 
 class ComboMeter:
@@ -184,33 +402,30 @@ class ComboMeter:
         self.combo = 0
         self.display_time = 2.0  # seconds
         self.elapsed = 0.0
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_small = pygame.font.Font(None, 28)
-        
+        self.font_large = get_font(48)
+        self.font_small = get_font(28)
+    
     def add_combo(self):
         """Додати комбо"""
         self.combo += 1
         self.elapsed = 0.0
-        
+    
     def reset(self):
         """Скинути комбо"""
         self.combo = 0
         self.elapsed = 0.0
-        
+    
     def update(self, dt):
         """Оновити таймер"""
         if self.combo > 0:
             self.elapsed += dt
             if self.elapsed >= self.display_time:
                 self.reset()
-                
+    
     def draw(self, surface):
         """Малює комбо-метр"""
         if self.combo <= 1:
             return
-            
-        # Пульсація
-        scale = 1.0 + 0.1 * math.sin(self.elapsed * 10)
         
         # Колір залежить від комбо
         if self.combo >= 10:
@@ -219,46 +434,49 @@ class ComboMeter:
             color = YELLOW
         else:
             color = CYAN
-            
-        # Текст
-        combo_text = self.font_large.render(f"COMBO x{self.combo}!", True, color)
         
-        # Масштабування (простий ефект)
+        # Пульсуючий текст - кадр запеченої стрічки
+        strip = get_strip(('combo', self.combo, color), COMBO_PULSE_PERIOD,
+                          lambda phase: self._render_combo(color, phase))
+        frame = strip.frame_at(self.elapsed)
+        surface.blit(frame, frame.get_rect(center=(self.x, self.y)))
+    
+    def _render_combo(self, color, phase):
+        """Рендерить кадр тексту комбо для фази пульсації"""
+        scale = 1.0 + 0.1 * math.sin(phase * 2 * math.pi)
+        combo_text = self.font_large.render(f"COMBO x{self.combo}!", True, color)
         width = int(combo_text.get_width() * scale)
         height = int(combo_text.get_height() * scale)
-        scaled = pygame.transform.scale(combo_text, (width, height))
-        
-        rect = scaled.get_rect(center=(self.x, self.y))
-        surface.blit(scaled, rect)
+        return pygame.transform.scale(combo_text, (width, height))
 
 
 class Tooltip:
     """Підказки при наведенні"""
     
     def __init__(self):
-        self.font = pygame.font.Font(None, 24)
+        self.font = get_font(24)
         self.visible = False
         self.text = ""
         self.x = 0
         self.y = 0
         self.padding = 10
-        
+    
     def show(self, text, x, y):
         """Показати підказку"""
         self.text = text
         self.x = x
         self.y = y
         self.visible = True
-        
+    
     def hide(self):
         """Сховати підказку"""
         self.visible = False
-        
+    
     def draw(self, surface):
         """Малює підказку"""
         if not self.visible or not self.text:
             return
-            
+        
         # Текст
         text_surface = self.font.render(self.text, True, WHITE)
         text_rect = text_surface.get_rect()
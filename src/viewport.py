@@ -0,0 +1,65 @@
+"""
+Перетворення координат гри (логічні 900x600) у координати екрану
+"""
+import pygame
+
+
+class Viewport:
+    """
+    Трансформація світ -> екран: масштаб та зміщення
+    
+    Ігрова логіка завжди працює в логічних координатах, а функції
+    малювання, що приймають viewport, переводять прямокутники, точки та
+    довжини в пікселі цільової поверхні.
+    """
+    
+    def __init__(self, scale=1.0, offset_x=0, offset_y=0):
+        """
+        Ініціалізація трансформації
+        
+        Args:
+            scale: Масштаб (пікселів екрану на логічний піксель)
+            offset_x, offset_y: Зміщення логічного (0, 0) на екрані
+        """
+        self.scale = scale
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+    
+    @property
+    def is_identity(self):
+        """True, якщо трансформація нічого не змінює"""
+        return self.scale == 1.0 and self.offset_x == 0 and self.offset_y == 0
+    
+    def to_screen_point(self, x, y):
+        """Переводить логічну точку в пікселі екрану"""
+        return (int(self.offset_x + x * self.scale), int(self.offset_y + y * self.scale))
+    
+    def to_screen_rect(self, rect):
+        """
+        Переводить логічний прямокутник у прямокутник екрану
+        
+        Краї округлюються окремо, тож сусідні прямокутники лишаються
+        суміжними без щілин.
+        
+        Args:
+            rect: pygame.Rect або (x, y, w, h) у логічних координатах
+        
+        Returns:
+            pygame.Rect: Прямокутник у пікселях екрану
+        """
+        x, y, width, height = rect
+        if self.is_identity:
+            return pygame.Rect(x, y, width, height)
+        left = round(self.offset_x + x * self.scale)
+        top = round(self.offset_y + y * self.scale)
+        right = round(self.offset_x + (x + width) * self.scale)
+        bottom = round(self.offset_y + (y + height) * self.scale)
+        return pygame.Rect(left, top, right - left, bottom - top)
+    
+    def scale_length(self, length, minimum=1):
+        """Масштабує довжину (товщину лінії, радіус, розмір шрифту)"""
+        return max(minimum, round(length * self.scale))
+
+
+# Тотожна трансформація - значення за замовчуванням для функцій малювання
+IDENTITY = Viewport()